@@ -4,6 +4,8 @@ import axios from 'axios';
 // 🔧 Vite 환경변수 설정 (import.meta.env 사용)
 const API_BASE = import.meta.env.VITE_API_BASE_URL || 'http://127.0.0.1:8000';
 const TIMEOUT = parseInt(import.meta.env.VITE_API_TIMEOUT) || 30000;
+// 종합 검색 응답 기한(ms): 이 시간 안에 끝난 영역만 먼저 받음 (나머지는 search_metadata.sections에 pending)
+const COMPREHENSIVE_BUDGET_MS = parseInt(import.meta.env.VITE_COMPREHENSIVE_BUDGET_MS) || 8000;
 
 // axios 인스턴스 생성
 const apiClient = axios.create({
@@ -144,7 +146,8 @@ export const searchAPI = {
                 console.log('🚀 Comprehensive 요청:', { query, regionCode });
                 const response = await apiClient.post('/api/search/comprehensive', {
                     query,
-                    region_code: regionCode
+                    region_code: regionCode,
+                    latency_budget_ms: COMPREHENSIVE_BUDGET_MS
                 });
                 console.log('📥 Comprehensive 응답 성공');
                 return response.data;
@@ -154,6 +157,42 @@ export const searchAPI = {
         });
     },
 
+    // 🎯 종합 검색 (스트리밍): 영역(jobs/realestate/policies)이 도착하는 대로 onEvent(event, data) 호출,
+    // 마지막 summary 데이터(comprehensive 응답과 동일)를 반환
+    comprehensiveStream: async (query, regionCode = "44790", onEvent = () => {}) => {
+        const response = await fetch(`${API_BASE}/api/search/comprehensive/stream?format=ndjson`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({
+                query,
+                region_code: regionCode,
+                latency_budget_ms: COMPREHENSIVE_BUDGET_MS
+            }),
+        });
+        if (!response.ok || !response.body) {
+            throw new Error(`종합 검색 스트림 오류 (${response.status})`);
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let summary = null;
+        for (;;) {
+            const { value, done } = await reader.read();
+            buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+            const lines = buffer.split('\n');
+            buffer = done ? '' : lines.pop();
+            for (const line of lines) {
+                if (!line.trim()) continue;
+                const { event, data } = JSON.parse(line);
+                onEvent(event, data);
+                if (event === 'summary') summary = data;
+            }
+            if (done) break;
+        }
+        return summary;
+    },
+
     // 💼 일자리 검색
     jobs: async (regionCode, filters = {}) => {
         return await apiCallWithRetry(async () => {
@@ -0,0 +1 @@
+# bench — 오프라인 벤치마크 (가짜 업스트림 서버, 부하 측정)
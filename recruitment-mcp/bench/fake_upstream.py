@@ -0,0 +1,338 @@
+# fake_upstream.py — 벤치마크용 가짜 업스트림 (채용정보 list/detail, 국토부 실거래가 XML, 온통청년 getPlcy)
+"""
+fixtures/ 의 응답 견본을 records개까지 늘려 페이지 단위로 돌려줍니다. 지연·오류 주입 가능.
+
+    python -m bench.fake_upstream --port 8765 --latency 0.2 --jitter 0.05 --error-rate 0.01
+
+앱 쪽 설정:
+    BASE_URL=http://127.0.0.1:8765/1051000/recruitment
+    MOLIT_BASE_URL=http://127.0.0.1:8765/1613000/RTMSDataSvcAptTrade
+    YOUTH_BASE_URL=http://127.0.0.1:8765/go/ythip/getPlcy
+"""
+import argparse
+import copy
+import json
+import os
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+RECRUITMENT_PATH = "/1051000/recruitment"
+MOLIT_PATH = "/1613000/RTMSDataSvcAptTrade"
+YOUTH_PATH = "/go/ythip/getPlcy"
+
+ENDPOINTS = ("recruitment", "realestate", "youth_policy")
+
+
+@dataclass
+class Injection:
+    """응답 지연·오류 주입 설정 (초 단위)"""
+    latency: float = 0.0         # 기본 지연
+    jitter: float = 0.0          # 0~jitter초 균등 분포 추가 지연
+    tail_rate: float = 0.0       # 이 비율의 요청은 tail_latency초 지연 (꼬리 지연 재현)
+    tail_latency: float = 2.0
+    error_rate: float = 0.0      # 이 비율의 요청은 error_status로 응답
+    error_status: int = 503
+    api_error_rate: float = 0.0  # 이 비율의 요청은 HTTP 200 + 공공 API 오류 본문 (캐시되면 안 되는 응답)
+
+    def delay(self, rng: random.Random) -> float:
+        if self.tail_rate and rng.random() < self.tail_rate:
+            return self.tail_latency
+        return self.latency + (rng.uniform(0, self.jitter) if self.jitter else 0.0)
+
+
+@dataclass
+class FakeConfig:
+    default: Injection = field(default_factory=Injection)
+    overrides: Dict[str, Injection] = field(default_factory=dict)  # 업스트림별 설정 (ENDPOINTS 중 하나)
+    records: Dict[str, int] = field(default_factory=lambda: {
+        "recruitment": 500, "realestate": 60, "youth_policy": 80,
+    })
+    seed: Optional[int] = None
+
+    def injection(self, endpoint: str) -> Injection:
+        return self.overrides.get(endpoint, self.default)
+
+
+def _load_fixtures() -> Tuple[List[Dict[str, Any]], List[str], List[Dict[str, Any]]]:
+    with open(os.path.join(FIXTURE_DIR, "recruitment_list.json"), encoding="utf-8") as f:
+        jobs = json.load(f)["result"]
+    with open(os.path.join(FIXTURE_DIR, "apt_trade.xml"), encoding="utf-8") as f:
+        trades = re.findall(r"<item>.*?</item>", f.read(), re.S)
+    with open(os.path.join(FIXTURE_DIR, "youth_policy.json"), encoding="utf-8") as f:
+        policies = json.load(f)["result"]["youthPolicyList"]
+    return jobs, trades, policies
+
+
+class Fixtures:
+    """견본 레코드를 순환 복제해 records개짜리 가상 데이터셋을 만듦 (ID만 바꿈)"""
+
+    def __init__(self, records: Dict[str, int]):
+        jobs, trades, policies = _load_fixtures()
+        self.jobs = [self._job(jobs[i % len(jobs)], i) for i in range(records["recruitment"])]
+        self.trades = [trades[i % len(trades)] for i in range(records["realestate"])]
+        self.policies = [self._policy(policies[i % len(policies)], i) for i in range(records["youth_policy"])]
+        self.jobs_by_id = {job["recrutPblntSn"]: job for job in self.jobs}
+        self.policies_by_id = {policy["plcyNo"]: policy for policy in self.policies}
+
+    @staticmethod
+    def _job(template: Dict[str, Any], i: int) -> Dict[str, Any]:
+        job = copy.deepcopy(template)
+        job["recrutPblntSn"] = str(300000 + i)
+        return job
+
+    @staticmethod
+    def _policy(template: Dict[str, Any], i: int) -> Dict[str, Any]:
+        policy = copy.deepcopy(template)
+        policy["plcyNo"] = f"{template['plcyNo'][:6]}{i:06d}"
+        return policy
+
+    def recruitment_list(self, page: int, rows: int) -> Dict[str, Any]:
+        start = (page - 1) * rows
+        return {
+            "resultCode": 200,
+            "resultMsg": "성공했습니다.",
+            "totalCount": len(self.jobs),
+            "result": self.jobs[start:start + rows],
+        }
+
+    def recruitment_detail(self, sn: str) -> Dict[str, Any]:
+        job = self.jobs_by_id.get(sn)
+        if job is None:
+            return {"resultCode": 404, "resultMsg": "해당 공고가 없습니다."}
+        return {"resultCode": 200, "resultMsg": "성공했습니다.", "result": job}
+
+    def apt_trades(self, page: int, rows: int, lawd_cd: str, deal_ymd: str) -> str:
+        start = (page - 1) * rows
+        items = "".join(
+            re.sub(r"<sggCd>\d*</sggCd>", f"<sggCd>{lawd_cd}</sggCd>", item)
+            .replace("<dealYear>2025</dealYear>", f"<dealYear>{deal_ymd[:4]}</dealYear>")
+            .replace("<dealMonth>6</dealMonth>", f"<dealMonth>{int(deal_ymd[4:6] or 6)}</dealMonth>")
+            for item in self.trades[start:start + rows]
+        )
+        return (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?><response><header>'
+            "<resultCode>000</resultCode><resultMsg>OK</resultMsg></header><body>"
+            f"<items>{items}</items><numOfRows>{rows}</numOfRows><pageNo>{page}</pageNo>"
+            f"<totalCount>{len(self.trades)}</totalCount></body></response>"
+        )
+
+    def youth_policies(self, page: int, size: int, policy_no: Optional[str]) -> Dict[str, Any]:
+        if policy_no:
+            found = self.policies_by_id.get(policy_no)
+            policies, total = ([found] if found else []), (1 if found else 0)
+        else:
+            start = (page - 1) * size
+            policies, total = self.policies[start:start + size], len(self.policies)
+        return {
+            "resultCode": 200,
+            "resultMessage": "성공",
+            "result": {
+                "pagging": {"totCount": total, "pageNum": page, "pageSize": size},
+                "youthPolicyList": policies,
+            },
+        }
+
+
+def _int(query: Dict[str, str], name: str, default: int) -> int:
+    try:
+        return max(1, int(query.get(name) or default))
+    except ValueError:
+        return default
+
+
+class FakeUpstream:
+    """스레드에서 도는 가짜 업스트림 서버. port=0이면 빈 포트 사용"""
+
+    def __init__(self, config: Optional[FakeConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or FakeConfig()
+        self.fixtures = Fixtures(self.config.records)
+        self.hits: Dict[str, int] = {endpoint: 0 for endpoint in ENDPOINTS}
+        self.errors: Dict[str, int] = {endpoint: 0 for endpoint in ENDPOINTS}
+        self._lock = threading.Lock()
+        self._rng = random.Random(self.config.seed)
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self) -> Dict[str, str]:
+        """앱이 이 서버를 보도록 하는 환경 변수"""
+        return {
+            "BASE_URL": self.base_url + RECRUITMENT_PATH,
+            "MOLIT_BASE_URL": self.base_url + MOLIT_PATH,
+            "YOUTH_BASE_URL": self.base_url + YOUTH_PATH,
+        }
+
+    def start(self) -> "FakeUpstream":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-upstream", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def serve_forever(self):
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"hits": dict(self.hits), "errors": dict(self.errors)}
+
+    def _decide(self, endpoint: str) -> Tuple[float, Optional[str]]:
+        """(지연 초, 주입할 오류 종류 "http"/"api"/None)"""
+        injection = self.config.injection(endpoint)
+        with self._lock:
+            self.hits[endpoint] += 1
+            delay = injection.delay(self._rng)
+            roll = self._rng.random()
+            error = None
+            if roll < injection.error_rate:
+                error = "http"
+            elif roll < injection.error_rate + injection.api_error_rate:
+                error = "api"
+            if error:
+                self.errors[endpoint] += 1
+        return delay, error
+
+    def _respond(self, path: str, query: Dict[str, str]) -> Tuple[int, str, bytes]:
+        if path == "/_stats":
+            return 200, "application/json", json.dumps(self.stats()).encode("utf-8")
+
+        if path.startswith(RECRUITMENT_PATH + "/"):
+            endpoint = "recruitment"
+        elif path.startswith(MOLIT_PATH) or "RTMS" in path:
+            endpoint = "realestate"
+        elif path.startswith(YOUTH_PATH):
+            endpoint = "youth_policy"
+        else:
+            return 404, "text/plain", b"not found"
+
+        delay, error = self._decide(endpoint)
+        if delay:
+            time.sleep(delay)
+        if error == "http":
+            status = self.config.injection(endpoint).error_status
+            return status, "text/plain", f"injected error {status}".encode("utf-8")
+
+        if endpoint == "realestate":
+            if error == "api":
+                body = ("<response><header><resultCode>22</resultCode>"
+                        "<resultMsg>LIMITED NUMBER OF SERVICE REQUESTS EXCEEDS ERROR.</resultMsg></header></response>")
+            else:
+                body = self.fixtures.apt_trades(
+                    _int(query, "pageNo", 1), _int(query, "numOfRows", 10),
+                    query.get("LAWD_CD") or "44790", query.get("DEAL_YMD") or "202506",
+                )
+            return 200, "application/xml; charset=utf-8", body.encode("utf-8")
+
+        if error == "api":
+            payload: Dict[str, Any] = {"resultCode": 500, "resultMsg": "injected api error"}
+        elif endpoint == "recruitment":
+            if path.endswith("/list"):
+                payload = self.fixtures.recruitment_list(_int(query, "pageNo", 1), _int(query, "numOfRows", 10))
+            else:
+                payload = self.fixtures.recruitment_detail(query.get("sn") or query.get("recrutPblntSn") or "")
+        else:
+            payload = self.fixtures.youth_policies(
+                _int(query, "pageNum", 1), _int(query, "pageSize", 10), query.get("plcyNo"),
+            )
+        return 200, "application/json; charset=utf-8", json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+    def _handler_class(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive (커넥션 풀 재사용 측정)
+            # 헤더와 본문을 한 번에 보냄 (따로 쓰면 재사용 연결마다 Nagle/지연 ACK로 ~40ms씩 멈춤)
+            wbufsize = -1
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                status, content_type, body = fake._respond(url.path, query)
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+
+def add_injection_arguments(parser: argparse.ArgumentParser):
+    group = parser.add_argument_group("가짜 업스트림 지연·오류 주입")
+    group.add_argument("--latency", type=float, default=0.05, help="기본 응답 지연(초)")
+    group.add_argument("--jitter", type=float, default=0.0, help="0~jitter초 추가 지연")
+    group.add_argument("--tail-rate", type=float, default=0.0, help="꼬리 지연 비율")
+    group.add_argument("--tail-latency", type=float, default=2.0, help="꼬리 지연(초)")
+    group.add_argument("--error-rate", type=float, default=0.0, help="HTTP 오류 응답 비율")
+    group.add_argument("--error-status", type=int, default=503)
+    group.add_argument("--api-error-rate", type=float, default=0.0, help="HTTP 200 + API 오류 본문 비율")
+    group.add_argument(
+        "--endpoint-latency", action="append", default=[], metavar="UPSTREAM=SECONDS",
+        help="업스트림별 기본 지연 (예: youth_policy=0.8). 여러 번 지정 가능",
+    )
+    group.add_argument("--records", action="append", default=[], metavar="UPSTREAM=N",
+                       help="업스트림별 전체 레코드 수 (예: recruitment=5000)")
+    group.add_argument("--seed", type=int, default=None)
+
+
+def config_from_args(args: argparse.Namespace) -> FakeConfig:
+    default = Injection(
+        latency=args.latency, jitter=args.jitter, tail_rate=args.tail_rate, tail_latency=args.tail_latency,
+        error_rate=args.error_rate, error_status=args.error_status, api_error_rate=args.api_error_rate,
+    )
+    config = FakeConfig(default=default, seed=args.seed)
+    for item in args.endpoint_latency:
+        name, _, value = item.partition("=")
+        if name not in ENDPOINTS:
+            raise SystemExit(f"알 수 없는 업스트림: {name} ({', '.join(ENDPOINTS)} 중 하나)")
+        override = copy.copy(default)
+        override.latency = float(value)
+        config.overrides[name] = override
+    for item in args.records:
+        name, _, value = item.partition("=")
+        if name not in ENDPOINTS:
+            raise SystemExit(f"알 수 없는 업스트림: {name} ({', '.join(ENDPOINTS)} 중 하나)")
+        config.records[name] = int(value)
+    return config
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크용 가짜 공공데이터 API 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_injection_arguments(parser)
+    args = parser.parse_args()
+
+    fake = FakeUpstream(config_from_args(args), host=args.host, port=args.port)
+    print(f"가짜 업스트림: {fake.base_url}")
+    for name, value in fake.env().items():
+        print(f"  {name}={value}")
+    fake.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
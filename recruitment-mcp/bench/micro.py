@@ -0,0 +1,500 @@
+# micro.py — CPU 핫패스 마이크로 벤치마크 (합성 데이터 100~100k건, 기준선 JSON 저장·비교로 성능 회귀 확인)
+"""
+recruitment-mcp 디렉터리에서 실행:
+
+    python -m bench.micro run                         # 모든 벤치마크, 데이터 100/1k/10k/100k건
+    python -m bench.micro run --sizes 100,1000 --only intent
+    python -m bench.micro run --save-baseline         # bench/micro_baseline.json 갱신
+    python -m bench.micro run --compare               # 실행 후 기준선과 비교 (회귀가 있으면 종료 코드 1)
+    python -m bench.micro compare results.json --threshold 0.25
+
+각 벤치마크는 함수 호출 한 번에 데이터셋 전체를 처리합니다. repeats번 나눠 재서 반복별 최솟값의 중앙값을
+기준값으로, 그 사분위 범위(IQR)를 측정 흔들림으로 기록하고, 비교 시 허용 폭에 흔들림을 더합니다.
+색인을 쓰는 함수는 cold(새 색인에 처음 적재)와 warm(같은 데이터를 다시 처리)을 따로 잽니다.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+DEFAULT_SIZES = (100, 1_000, 10_000, 100_000)
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "micro_baseline.json")
+SEED = 20250601
+
+# name → (설명, setup(size) → 측정할 함수)
+BENCHMARKS: Dict[str, Tuple[str, Callable[[int], Callable[[], Any]]]] = {}
+
+
+def benchmark(name: str, description: str):
+    def register(setup: Callable[[int], Callable[[], Any]]):
+        BENCHMARKS[name] = (description, setup)
+        return setup
+    return register
+
+
+# === 합성 데이터 ===
+
+SIDO = ["서울", "부산", "대구", "인천", "광주", "대전", "울산", "세종", "경기",
+        "강원", "충북", "충남", "전북", "전남", "경북", "경남", "제주"]
+NCS_NAMES = ["정보통신", "보건.의료", "경영.회계.사무", "건설", "기계", "전기.전자", "연구",
+             "교육.자연.사회과학", "농림어업", "환경.에너지.안전"]
+HIRE_CODES = ["R1010", "R1020", "R1030", "R1040", "R1050", "R1060", "R1070"]
+HIRE_NAMES = ["정규직", "무기계약직", "기간제계약직", "비정규직", "청년인턴(체험형)", "청년인턴(채용형)", "기타"]
+EDU_CODES = ["R7010", "R7020", "R7030", "R7040", "R7050", "R7060", "R7070", "R7080"]
+ZIP_POOL = [11110, 11140, 26110, 27110, 30110, 41110, 41130, 44130, 44131, 44790,
+            45110, 45210, 51110, 51150, 51750, 51770, 52110, 52210, 46110, 48110]
+
+
+def _codes(rng: random.Random, pool: List[str], most: int) -> str:
+    return ",".join(rng.sample(pool, rng.randint(1, most)))
+
+
+def make_jobs(size: int, seed: int = SEED) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(size):
+        # 20%는 전국 공고 (근무지역 10개 이상)
+        regions = rng.sample(SIDO, rng.randint(10, 17)) if rng.random() < 0.2 else rng.sample(SIDO, rng.randint(1, 3))
+        hire = rng.randrange(len(HIRE_CODES))
+        jobs.append({
+            "recrutPblntSn": str(100000 + i),
+            "instNm": f"기관{i % 900}",
+            "recrutPbancTtl": f"2025년 {rng.choice(NCS_NAMES)} 분야 직원 채용 공고 {i}",
+            "workRgnNmLst": ",".join(regions),
+            "hireTypeLst": HIRE_CODES[hire],
+            "hireTypeNmLst": HIRE_NAMES[hire],
+            "acbgCondLst": _codes(rng, EDU_CODES, 4),
+            "ncsCdNmLst": _codes(rng, NCS_NAMES, 2),
+            "pbancEndYmd": f"2025{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}",
+        })
+    return jobs
+
+
+def make_policies(size: int, seed: int = SEED) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    policies = []
+    for i in range(size):
+        scope = rng.random()
+        if scope < 0.1:
+            zips = ""  # 범위 미상
+        elif scope < 0.3:
+            zips = ",".join(str(code) for code in range(11000, 11000 + rng.randint(50, 250)))  # 전국/광역
+        else:
+            zips = ",".join(str(code) for code in rng.sample(ZIP_POOL, rng.randint(1, 4)))
+        end = f"20{rng.randint(24, 27)}{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}"
+        policies.append({
+            "plcyNo": f"2025{i:08d}",
+            "plcyNm": f"청년 지원 정책 {i}",
+            "zipCd": zips,
+            "sprvsnInstCdNm": rng.choice(["충청남도 청양군", "강원특별자치도 강릉시", "전북특별자치도 김제시",
+                                         "고용노동부", "국토교통부", "서울특별시"]),
+            "bizPrdEndYmd": end if rng.random() < 0.7 else "",
+            "aplyYmd": f"20250101 ~ {end}" if rng.random() < 0.5 else "",
+            "lclsfNm": rng.choice(["일자리", "주거", "교육", "복지문화"]),
+        })
+    return policies
+
+
+def make_apartment_xml(size: int, seed: int = SEED) -> str:
+    rng = random.Random(seed)
+    items = "".join(
+        f"<item><aptNm>아파트{i % 500}</aptNm><buildYear>{rng.randint(1985, 2024)}</buildYear>"
+        f"<dealAmount>{rng.randint(5000, 150000):,}</dealAmount><dealDay>{rng.randint(1, 28)}</dealDay>"
+        f"<dealMonth>6</dealMonth><dealYear>2025</dealYear><excluUseAr>{rng.uniform(20, 200):.2f}</excluUseAr>"
+        f"<floor>{rng.randint(1, 40)}</floor><jibun>{rng.randint(1, 999)}</jibun><sggCd>51150</sggCd>"
+        f"<umdNm>동{i % 30}</umdNm></item>"
+        for i in range(size)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?><response><header><resultCode>000</resultCode>'
+        f"<resultMsg>OK</resultMsg></header><body><items>{items}</items><numOfRows>{size}</numOfRows>"
+        f"<pageNo>1</pageNo><totalCount>{size}</totalCount></body></response>"
+    )
+
+
+MESSAGE_PARTS = {
+    "region": ["강릉시", "정선", "영월군", "청양", "김제시", "서울", "부산", "", ""],
+    "field": ["IT", "개발", "의료", "간호", "교육", "회계", "건축", "연구", "정보통신", "보건.의료", ""],
+    "condition": ["정규직", "계약직", "청년 인턴", "학력무관", "대졸", "4년제", ""],
+    "topic": ["일자리", "채용공고", "아파트 실거래가", "살 곳", "집 매물", "청년정책", "지원 혜택", "전체 정보"],
+}
+
+
+def make_messages(size: int, seed: int = SEED) -> List[str]:
+    rng = random.Random(seed)
+    messages = []
+    for _ in range(size):
+        topics = rng.sample(MESSAGE_PARTS["topic"], rng.randint(1, 3))
+        words = [rng.choice(MESSAGE_PARTS["region"]), rng.choice(MESSAGE_PARTS["field"]),
+                 rng.choice(MESSAGE_PARTS["condition"]), *topics]
+        messages.append(" ".join(word for word in words if word) + " 알려줘")
+    return messages
+
+
+# === 벤치마크 대상 ===
+
+_chatbot = None
+_handler = None
+
+
+def _get_chatbot():
+    global _chatbot
+    if _chatbot is None:
+        from src.final_chatbot import PerfectChatbot
+        _chatbot = PerfectChatbot()
+    return _chatbot
+
+
+def _get_handler():
+    global _handler
+    if _handler is None:
+        from src.web_api_handler import WebAPIHandler
+        _handler = WebAPIHandler()
+    return _handler
+
+
+@benchmark("intent.analyze_user_intent", "PerfectChatbot.analyze_user_intent (메시지 size개)")
+def _intent(size: int):
+    bot = _get_chatbot()
+    messages = make_messages(size)
+    return lambda: [bot.analyze_user_intent(message) for message in messages]
+
+
+@benchmark("policies.filter_active_policies[cold]", "filter_active_policies, 새 정책 색인에 적재")
+def _active_cold(size: int):
+    from src.policy_index import PolicyIndex
+    bot = _get_chatbot()
+    policies = make_policies(size)
+
+    def run():
+        bot.policy_index = PolicyIndex()
+        return bot.filter_active_policies(policies)
+    return run
+
+
+@benchmark("policies.filter_active_policies[warm]", "filter_active_policies, 이미 적재된 정책")
+def _active_warm(size: int):
+    from src.policy_index import PolicyIndex
+    bot = _get_chatbot()
+    bot.policy_index = PolicyIndex()
+    policies = make_policies(size)
+    bot.filter_active_policies(policies)
+    return lambda: bot.filter_active_policies(policies)
+
+
+@benchmark("jobs.filter_and_sort_jobs_by_region[cold]", "filter_and_sort_jobs_by_region, 새 근무지역 색인")
+def _jobs_cold(size: int):
+    from src.job_index import JobRegionIndex
+    bot = _get_chatbot()
+    jobs = make_jobs(size)
+
+    def run():
+        bot.job_index = JobRegionIndex()
+        return bot.filter_and_sort_jobs_by_region(jobs, "51150")
+    return run
+
+
+@benchmark("jobs.filter_and_sort_jobs_by_region[warm]", "filter_and_sort_jobs_by_region, 이미 적재된 공고")
+def _jobs_warm(size: int):
+    from src.job_index import JobRegionIndex
+    bot = _get_chatbot()
+    bot.job_index = JobRegionIndex()
+    jobs = make_jobs(size)
+    bot.filter_and_sort_jobs_by_region(jobs, "51150")
+    return lambda: bot.filter_and_sort_jobs_by_region(jobs, "51150")
+
+
+@benchmark("jobs.filter_and_sort_jobs_by_region[mirror]", "filter_and_sort_jobs_by_region, 미러 색인 (적재 없이 후보 ID만)")
+def _jobs_mirror(size: int):
+    from src.job_index import JobRegionIndex
+    bot = _get_chatbot()
+    index = JobRegionIndex()
+    jobs = make_jobs(size)
+    index.ingest(jobs)
+    return lambda: bot.filter_and_sort_jobs_by_region(jobs, "51150", index=index)
+
+
+@benchmark("policies.filter_and_sort_policies_by_region[cold]", "filter_and_sort_policies_by_region, 새 정책 색인")
+def _policies_cold(size: int):
+    from src.policy_index import PolicyIndex
+    bot = _get_chatbot()
+    policies = make_policies(size)
+
+    def run():
+        bot.policy_index = PolicyIndex()
+        return bot.filter_and_sort_policies_by_region(policies, "44790")
+    return run
+
+
+@benchmark("policies.filter_and_sort_policies_by_region[warm]", "filter_and_sort_policies_by_region, 이미 적재된 정책")
+def _policies_warm(size: int):
+    from src.policy_index import PolicyIndex
+    bot = _get_chatbot()
+    bot.policy_index = PolicyIndex()
+    policies = make_policies(size)
+    bot.filter_and_sort_policies_by_region(policies, "44790")
+    return lambda: bot.filter_and_sort_policies_by_region(policies, "44790")
+
+
+@benchmark("realestate.parse_apartment_xml", "PerfectChatbot.parse_apartment_xml (<item> size개)")
+def _parse_xml(size: int):
+    bot = _get_chatbot()
+    xml_text = make_apartment_xml(size)
+    return lambda: bot.parse_apartment_xml(xml_text)
+
+
+@benchmark("handler.calculate_job_stats_detailed", "WebAPIHandler._calculate_job_stats_detailed")
+def _job_stats(size: int):
+    handler = _get_handler()
+    jobs = make_jobs(size)
+    return lambda: handler._calculate_job_stats_detailed(jobs)
+
+
+@benchmark("handler.format_education_requirement", "WebAPIHandler.format_education_requirement (코드 목록 size개)")
+def _format_education(size: int):
+    handler = _get_handler()
+    codes = [job["acbgCondLst"] for job in make_jobs(size)]
+    return lambda: [handler.format_education_requirement(code) for code in codes]
+
+
+@benchmark("handler.format_hire_type", "WebAPIHandler.format_hire_type (코드 목록 size개)")
+def _format_hire_type(size: int):
+    handler = _get_handler()
+    rng = random.Random(SEED)
+    codes = [_codes(rng, HIRE_CODES, 3) for _ in range(size)]
+    return lambda: [handler.format_hire_type(code) for code in codes]
+
+
+# === 측정 ===
+
+def _quartiles(values: List[float]) -> Tuple[float, float, float]:
+    if len(values) < 2:
+        return values[0], values[0], values[0]
+    q1, q2, q3 = statistics.quantiles(values, n=4, method="inclusive")
+    return q1, q2, q3
+
+
+# 머신 속도 보정용 고정 작업 (문자열 파싱·dict·정렬, 약 1ms).
+# 가상머신은 몇 분 단위로 CPU가 통째로 느려지기도 해서, 반복마다 이 작업 대비 비율(relative)로도 기록
+_CALIBRATION_DATA = [f"{i:05d}:{(i * 7919) % 10007}" for i in range(2000)]
+
+
+def _calibration_workload():
+    table = {}
+    for item in _CALIBRATION_DATA:
+        key, value = item.split(":")
+        table[key] = int(value)
+    return sorted(table.items(), key=lambda kv: kv[1])
+
+
+def _calibrate(rounds: int = 5) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        _calibration_workload()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def measure(fn: Callable[[], Any], min_time: float, min_rounds: int, max_rounds: int,
+            repeats: int) -> Dict[str, Any]:
+    """
+    repeats번 나눠서 재고(반복마다 min_time초·min_rounds회 이상, GC는 측정 중 끔) 반복별 최솟값을 모음.
+    기준값(best_ms)은 반복별 최솟값의 중앙값, 흔들림은 그 사분위 범위(iqr_ms).
+    반복마다 보정 작업도 재서 최솟값/보정 시간의 중앙값(relative)과 IQR을 함께 기록합니다 (비교에 사용).
+    """
+    fn()  # 워밍업 (지연 import, 캐시 채우기)
+    times: List[float] = []
+    bests: List[float] = []
+    relatives: List[float] = []
+    gc_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            calibration = _calibrate()
+            rounds: List[float] = []
+            started = time.perf_counter()
+            while len(rounds) < max_rounds and (len(rounds) < min_rounds or time.perf_counter() - started < min_time):
+                t0 = time.perf_counter()
+                fn()
+                rounds.append(time.perf_counter() - t0)
+            times.extend(rounds)
+            bests.append(min(rounds))
+            relatives.append(min(rounds) / min(calibration, _calibrate()))
+    finally:
+        if gc_enabled:
+            gc.enable()
+    q1, best, q3 = _quartiles(bests)
+    r1, relative, r3 = _quartiles(relatives)
+    return {
+        "rounds": len(times),
+        "repeats": repeats,
+        "best_ms": round(best * 1000, 4),
+        "iqr_ms": round((q3 - q1) * 1000, 4),
+        "relative": round(relative, 4),
+        "relative_iqr": round(r3 - r1, 4),
+        "repeat_best_ms": [round(value * 1000, 4) for value in bests],
+        "min_ms": round(min(times) * 1000, 4),
+        "median_ms": round(statistics.median(times) * 1000, 4),
+        "mean_ms": round(statistics.fmean(times) * 1000, 4),
+        "stdev_ms": round(statistics.stdev(times) * 1000, 4) if len(times) > 1 else 0.0,
+        "ops_per_sec": round(1 / best, 2) if best else None,
+    }
+
+
+def run_benchmarks(sizes: List[int], only: List[str], min_time: float, min_rounds: int,
+                   max_rounds: int, repeats: int) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    print(f"{'벤치마크':<52} {'건수':>7} {'회':>5} {'기준 ms':>11} {'IQR ms':>9} {'최소 ms':>10} {'건당 µs':>9}")
+    for name, (description, setup) in BENCHMARKS.items():
+        if only and not any(pattern in name for pattern in only):
+            continue
+        for size in sizes:
+            stats = measure(setup(size), min_time, min_rounds, max_rounds, repeats)
+            stats.update({"benchmark": name, "size": size, "description": description,
+                          "per_record_us": round(stats["best_ms"] * 1000 / size, 3)})
+            results[f"{name}@{size}"] = stats
+            print(f"{name:<52} {size:>7} {stats['rounds']:>5} {stats['best_ms']:>11.3f} {stats['iqr_ms']:>9.3f} "
+                  f"{stats['min_ms']:>10.3f} {stats['per_record_us']:>9.3f}")
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "sizes": sizes,
+            "min_time": min_time,
+            "repeats": repeats,
+        },
+        "results": results,
+    }
+
+
+def _score(stats: Dict[str, Any], normalized: bool) -> Tuple[float, float]:
+    """(비교 값, 흔들림 비율). normalized면 보정 작업 대비 비율, 아니면 ms"""
+    if normalized:
+        value, iqr = stats["relative"], stats["relative_iqr"]
+    else:
+        value, iqr = stats.get("best_ms", stats["median_ms"]), stats.get("iqr_ms", 0.0)
+    return value, (iqr / value if value else 0.0)
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    기준선보다 (threshold + 양쪽 IQR 비율)을 넘게 느려진 항목 목록 (출력 포함).
+    양쪽 다 보정 비율(relative)이 있으면 그것으로, 없으면 best_ms로 비교합니다.
+    흔들림이 큰 항목일수록 허용 폭이 넓어집니다.
+    """
+    regressions = []
+    print(f"\n기준선 비교 (기준선 {baseline['meta'].get('created_at')}, 허용 {threshold:.0%} + 측정 흔들림)")
+    print(f"{'벤치마크@건수':<60} {'기준 ms':>11} {'현재 ms':>11} {'변화':>8} {'허용':>7}")
+    for key, stats in current["results"].items():
+        base = baseline["results"].get(key)
+        current_ms = stats.get("best_ms", stats["median_ms"])
+        if base is None:
+            print(f"{key:<60} {'-':>11} {current_ms:>11.3f}   (신규)")
+            continue
+        base_ms = base.get("best_ms", base["median_ms"])
+        normalized = "relative" in base and "relative" in stats
+        base_value, base_spread = _score(base, normalized)
+        current_value, current_spread = _score(stats, normalized)
+        allowed = threshold + base_spread + current_spread
+        ratio = current_value / base_value - 1 if base_value else 0.0
+        mark = ""
+        if ratio > allowed:
+            mark = "  ✗ 회귀"
+            regressions.append(key)
+        elif ratio < -allowed:
+            mark = "  ✓ 개선"
+        print(f"{key:<60} {base_ms:>11.3f} {current_ms:>11.3f} {ratio:>+7.1%} {allowed:>6.0%}{mark}")
+    missing = sorted(set(baseline["results"]) - set(current["results"]))
+    if missing and len(missing) < len(baseline["results"]):
+        print(f"(이번에 실행하지 않은 기준선 항목 {len(missing)}개)")
+    print(f"\n회귀 {len(regressions)}건" + (f": {', '.join(regressions)}" if regressions else ""))
+    return regressions
+
+
+def _load(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save(path: str, data: Dict[str, Any]):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    print(f"\n결과 저장: {path}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="CPU 핫패스 마이크로 벤치마크")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="벤치마크 실행")
+    run_parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                            help="데이터 건수 목록 (콤마 구분)")
+    run_parser.add_argument("--only", action="append", default=[], metavar="PATTERN",
+                            help="이름에 PATTERN이 들어간 벤치마크만")
+    run_parser.add_argument("--repeats", type=int, default=5, help="항목별 반복 측정 횟수 (반복별 최솟값의 중앙값·IQR로 비교)")
+    run_parser.add_argument("--min-time", type=float, default=0.2, help="반복 1회의 최소 측정 시간(초)")
+    run_parser.add_argument("--min-rounds", type=int, default=1, help="반복 1회의 최소 실행 횟수")
+    run_parser.add_argument("--max-rounds", type=int, default=10_000)
+    run_parser.add_argument("--save", metavar="PATH", help="결과 JSON 저장")
+    run_parser.add_argument("--save-baseline", action="store_true", help=f"결과를 기준선({DEFAULT_BASELINE})으로 저장")
+    run_parser.add_argument("--compare", action="store_true", help="실행 후 기준선과 비교")
+    run_parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    run_parser.add_argument("--threshold", type=float, default=0.25,
+                            help="회귀로 볼 기준값 증가 비율 (여기에 측정 흔들림(IQR 비율)을 더해 판단)")
+
+    compare_parser = sub.add_parser("compare", help="저장된 결과를 기준선과 비교")
+    compare_parser.add_argument("results", help="run --save로 저장한 JSON")
+    compare_parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    compare_parser.add_argument("--threshold", type=float, default=0.25)
+
+    sub.add_parser("list", help="벤치마크 목록")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        for name, (description, _) in BENCHMARKS.items():
+            print(f"{name:<52} {description}")
+        return 0
+
+    if args.command == "compare":
+        return 1 if compare(_load(args.results), _load(args.baseline), args.threshold) else 0
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    current = run_benchmarks(sizes, args.only, args.min_time, args.min_rounds, args.max_rounds, args.repeats)
+    if args.save:
+        _save(args.save, current)
+    status = 0
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"\n기준선 파일이 없습니다: {args.baseline} (run --save-baseline으로 먼저 생성)")
+            return 1
+        status = 1 if compare(current, _load(args.baseline), args.threshold) else 0
+    if args.save_baseline:
+        baseline = current
+        if args.only and os.path.exists(args.baseline):
+            # 일부만 다시 잰 경우 해당 항목만 갱신 (나머지 기준값은 유지)
+            baseline = _load(args.baseline)
+            baseline["results"].update(current["results"])
+            baseline["meta"]["updated_at"] = current["meta"]["created_at"]
+        _save(args.baseline, baseline)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,364 @@
+# run.py — 오프라인 부하 벤치마크 (가짜 업스트림 + 실제 FastAPI 서버, 라우트·MCP 도구별 p50/p95/p99와 초당 처리량)
+"""
+recruitment-mcp 디렉터리에서 실행:
+
+    python -m bench.run                              # 모든 라우트·MCP 도구, 요청 200회, 동시 10
+    python -m bench.run -n 500 -c 50 --latency 0.2 --tail-rate 0.02
+    python -m bench.run --only /api/search --cache on --json bench/results.json
+
+실제 공공 API를 호출하지 않습니다. 업스트림 캐시·미러 파일은 임시 디렉터리에 만들고 끝나면 지웁니다.
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import logging
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from bench.fake_upstream import FakeUpstream, add_injection_arguments, config_from_args  # noqa: E402
+
+# 지원 지역(REGION_KEYWORDS)이어야 공고·정책 색인 정렬 경로까지 측정됨
+QUERY = "청양에서 청년 일자리랑 아파트 전세, 주거 지원 정책 알려줘"
+REGION = "44790"
+
+# 라우트별 요청 (없는 GET 라우트는 본문 없이 호출, 없는 POST 라우트는 건너뜀)
+ROUTE_SCENARIOS: Dict[Tuple[str, str], Dict[str, Any]] = {
+    ("POST", "/api/search/comprehensive"): {"json": {"query": QUERY, "region_code": REGION}},
+    ("POST", "/api/search/comprehensive/stream"): {
+        "json": {"query": QUERY, "region_code": REGION}, "params": {"format": "ndjson"},
+    },
+    ("POST", "/api/search/jobs"): {"json": {"region_code": REGION}},
+    ("POST", "/api/search/realestate"): {"json": {"region_code": REGION, "deal_ymd": "202506"}},
+    ("POST", "/api/search/policies"): {"json": {"region_code": REGION}},
+}
+
+# MCP 서버별 도구 인자 (없는 도구는 인자 없이 호출).
+# **kwargs를 받는 도구는 FastMCP 스키마에서 그 이름(kwargs/params)이 필수 인자가 됨
+MCP_SCENARIOS: Dict[str, Dict[str, Dict[str, Any]]] = {
+    "recruitment": {
+        "listRecruitments": {"numOfRows": 100},
+        "getRecruitmentDetail": {"path": "detail", "params": {}},
+    },
+    "realestate": {
+        "getApartmentTrades": {"lawdcd": REGION, "deal_ymd": "202506", "numOfRows": 100},
+        "getOfficeTrades": {"lawdcd": REGION, "deal_ymd": "202506", "numOfRows": 100},
+        "getHouseTrades": {"lawdcd": REGION, "deal_ymd": "202506", "numOfRows": 100},
+    },
+    "youth_policy": {
+        "searchYouthPolicies": {"pageSize": 100, "kwargs": {}},
+        "getYouthPolicyDetail": {"policyNumber": "202500000000", "kwargs": {}},
+        "searchPoliciesByRegion": {"regionCode": REGION, "pageSize": 100, "kwargs": {}},
+        "searchPoliciesByKeywords": {"keywords": "취업,주거", "pageSize": 100, "kwargs": {}},
+    },
+}
+
+
+@dataclass
+class Result:
+    kind: str  # "route" / "mcp"
+    name: str
+    requests: int = 0
+    errors: int = 0
+    wall_seconds: float = 0.0
+    latencies_ms: List[float] = field(default_factory=list, repr=False)
+    upstream_calls: int = 0
+    error_sample: str = ""
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self.latencies_ms:
+            return None
+        samples = sorted(self.latencies_ms)
+        return round(samples[min(len(samples) - 1, int(len(samples) * pct / 100))], 2)
+
+    @property
+    def rps(self) -> float:
+        return round(self.requests / self.wall_seconds, 1) if self.wall_seconds else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        data = asdict(self)
+        del data["latencies_ms"]
+        data.update({
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "rps": self.rps,
+        })
+        return data
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _prepare_env(fake: FakeUpstream, workdir: str, cache: bool, replay: Optional[str], replay_timing: str):
+    """src 모듈은 import 시점에 설정을 읽으므로 import 전에 호출"""
+    if replay:
+        # 녹화된 카세트 재생: 업스트림 주소는 녹화할 때와 같아야 함 (.env 그대로), 인증키는 아무 값이나
+        os.environ.update({
+            "UPSTREAM_CASSETTE": "replay",
+            "UPSTREAM_CASSETTE_PATH": replay,
+            "UPSTREAM_CASSETTE_TIMING": replay_timing,
+        })
+        for name in ("DATA_GO_KR_KEY", "MOLIT_API_KEY", "YOUTH_API_KEY"):
+            os.environ.setdefault(name, "bench-key")
+    else:
+        os.environ.update(fake.env())
+        os.environ.update({
+            "DATA_GO_KR_KEY": "bench-key",
+            "MOLIT_API_KEY": "bench-key",
+            "YOUTH_API_KEY": "bench-key",
+        })
+    os.environ.update({
+        "UPSTREAM_CACHE": "on" if cache else "off",
+        "UPSTREAM_CACHE_PATH": os.path.join(workdir, "upstream_cache.sqlite3"),
+        "RECRUITMENT_MIRROR_SYNC_INTERVAL": "0",
+        "RECRUITMENT_MIRROR_PATH": os.path.join(workdir, "recruitment_mirror.sqlite3"),
+    })
+    # 벤치마크가 요청 제한에 막히지 않도록 (명시적으로 지정한 값은 유지)
+    os.environ.setdefault("RATE_LIMIT_RPS", "0")
+    os.environ.setdefault("RATE_LIMIT_MAX_IN_FLIGHT", "0")
+
+
+class ApiServer:
+    """uvicorn을 스레드에서 실행 (lifespan 포함, 실제 HTTP 경로 측정)"""
+
+    def __init__(self, app):
+        import uvicorn
+
+        self.port = _free_port()
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning"))
+        self._thread = threading.Thread(target=self.server.run, name="bench-api", daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self) -> "ApiServer":
+        self._thread.start()
+        deadline = time.monotonic() + 30
+        while not self.server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError("벤치마크용 API 서버를 시작하지 못했습니다")
+            time.sleep(0.05)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self._thread.join(timeout=10)
+
+
+async def _measure(result: Result, call: Callable[[], Awaitable[Optional[str]]],
+                   requests: int, concurrency: int, warmup: int):
+    """call()은 성공이면 None, 실패면 오류 설명을 반환"""
+    for _ in range(warmup):
+        try:
+            await call()
+        except Exception:
+            pass  # 오류는 측정 구간에서 집계
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                error = await call()
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            result.latencies_ms.append((time.perf_counter() - started) * 1000)
+            result.requests += 1
+            if error:
+                result.errors += 1
+                result.error_sample = result.error_sample or error[:200]
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    result.wall_seconds = time.perf_counter() - started
+
+
+def _route_targets(app) -> List[Tuple[str, str, Dict[str, Any]]]:
+    from fastapi.routing import APIRoute
+
+    targets = []
+    for route in app.routes:
+        if not isinstance(route, APIRoute):
+            continue
+        for method in sorted(route.methods):
+            scenario = ROUTE_SCENARIOS.get((method, route.path))
+            if scenario is None and method != "GET":
+                print(f"  건너뜀: {method} {route.path} (ROUTE_SCENARIOS에 요청 본문 없음)")
+                continue
+            targets.append((method, route.path, scenario or {}))
+    return targets
+
+
+async def bench_routes(app, base_url: str, fake: FakeUpstream, args) -> List[Result]:
+    import httpx
+
+    results = []
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        for method, path, scenario in _route_targets(app):
+            name = f"{method} {path}"
+            if args.only and not any(pattern in name for pattern in args.only):
+                continue
+
+            async def call(method=method, path=path, scenario=scenario) -> Optional[str]:
+                response = await client.request(method, path, **scenario)
+                await response.aread()  # 스트리밍 응답은 마지막 이벤트까지
+                if response.status_code >= 400:
+                    return f"HTTP {response.status_code}: {response.text[:120]}"
+                return None
+
+            result = Result("route", name)
+            before = sum(fake.stats()["hits"].values())
+            await _measure(result, call, args.requests, args.concurrency, args.warmup)
+            result.upstream_calls = sum(fake.stats()["hits"].values()) - before
+            _print_row(result)
+            results.append(result)
+    return results
+
+
+def _tool_error(output: Any) -> Optional[str]:
+    """MCP 도구 결과에서 {"status": "error"} 찾기"""
+    if isinstance(output, tuple):  # (content, structured) 형태의 mcp 버전
+        output = output[0]
+    if isinstance(output, dict):
+        payloads = [output.get("result", output)]
+    else:
+        payloads = []
+        for block in output or []:
+            try:
+                payloads.append(json.loads(getattr(block, "text", "") or "null"))
+            except ValueError:
+                continue
+    for payload in payloads:
+        if isinstance(payload, dict) and payload.get("status") == "error":
+            return str(payload.get("message") or payload)
+    return None
+
+
+async def bench_mcp_tools(fake: FakeUpstream, args) -> List[Result]:
+    from src import realestate_server, server, youth_policy_server
+
+    modules = {"recruitment": server, "realestate": realestate_server, "youth_policy": youth_policy_server}
+    # 동기 도구는 이벤트 루프를 막으므로 요청마다 작업 스레드에서 실행 (stdio MCP 서버 여러 개를 띄운 것과 비슷)
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=args.concurrency, thread_name_prefix="bench-mcp")
+    loop = asyncio.get_running_loop()
+    results = []
+    try:
+        for server_name, module in modules.items():
+            for tool in await module.mcp.list_tools():
+                name = f"{server_name}.{tool.name}"
+                if args.only and not any(pattern in name for pattern in args.only):
+                    continue
+                arguments = MCP_SCENARIOS.get(server_name, {}).get(tool.name, {})
+
+                async def call(module=module, tool_name=tool.name, arguments=arguments) -> Optional[str]:
+                    output = await loop.run_in_executor(
+                        pool, lambda: asyncio.run(module.mcp.call_tool(tool_name, dict(arguments)))
+                    )
+                    return _tool_error(output)
+
+                result = Result("mcp", name)
+                before = sum(fake.stats()["hits"].values())
+                await _measure(result, call, args.requests, args.concurrency, args.warmup)
+                result.upstream_calls = sum(fake.stats()["hits"].values()) - before
+                _print_row(result)
+                results.append(result)
+    finally:
+        pool.shutdown(wait=False)
+    return results
+
+
+_HEADER = f"{'대상':<46} {'요청':>6} {'오류':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>8} {'업스트림':>8}"
+
+
+def _print_row(result: Result):
+    def ms(value: Optional[float]) -> str:
+        return f"{value:9.1f}" if value is not None else f"{'-':>9}"
+
+    print(
+        f"{result.name:<46} {result.requests:>6} {result.errors:>5} "
+        f"{ms(result.percentile(50))} {ms(result.percentile(95))} {ms(result.percentile(99))} "
+        f"{result.rps:>8.1f} {result.upstream_calls:>8}"
+    )
+    if result.error_sample:
+        print(f"  └ 오류 예: {result.error_sample}")
+
+
+async def _run(args, fake: FakeUpstream) -> List[Result]:
+    import fastapi_server
+
+    results: List[Result] = []
+    if args.target in ("all", "routes"):
+        with ApiServer(fastapi_server.app) as api:
+            print("\n[FastAPI 라우트]")
+            print(_HEADER)
+            results += await bench_routes(fastapi_server.app, api.base_url, fake, args)
+    if args.target in ("all", "mcp"):
+        print("\n[MCP 도구]")
+        print(_HEADER)
+        results += await bench_mcp_tools(fake, args)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 업스트림을 상대로 한 라우트·MCP 도구 부하 벤치마크")
+    parser.add_argument("-n", "--requests", type=int, default=200, help="대상별 측정 요청 수")
+    parser.add_argument("-c", "--concurrency", type=int, default=10, help="동시 요청 수")
+    parser.add_argument("--warmup", type=int, default=3, help="대상별 측정 전 요청 수 (집계 제외)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="요청 타임아웃(초)")
+    parser.add_argument("--target", choices=("all", "routes", "mcp"), default="all")
+    parser.add_argument("--only", action="append", default=[], metavar="PATTERN",
+                        help="이름에 PATTERN이 들어간 대상만 (예: /api/search, youth_policy.)")
+    parser.add_argument("--cache", choices=("on", "off"), default="off",
+                        help="업스트림 캐시 (off: 매 요청 업스트림 경로 측정, on: 캐시 적중 경로 측정)")
+    parser.add_argument("--json", metavar="PATH", help="결과를 JSON으로 저장")
+    parser.add_argument("--replay", metavar="CASSETTE",
+                        help="가짜 업스트림 대신 녹화된 카세트(UPSTREAM_CASSETTE=record로 만든 파일)로 응답")
+    parser.add_argument("--replay-timing", choices=("original", "zero"), default="original",
+                        help="카세트 재생 시 응답 시간 (original: 녹화 당시 소요 시간, zero: 즉시)")
+    add_injection_arguments(parser)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)  # 요청마다 찍히는 INFO 로그 끄기
+
+    fake = FakeUpstream(config_from_args(args)).start()
+    with tempfile.TemporaryDirectory(prefix="ieum-bench-") as workdir:
+        _prepare_env(fake, workdir, args.cache == "on", args.replay, args.replay_timing)
+        if args.replay:
+            source = f"카세트 {args.replay} (응답 시간 {args.replay_timing})"
+        else:
+            source = f"가짜 업스트림 {fake.base_url} (지연 {args.latency}s, 오류율 {args.error_rate})"
+        print(f"{source}, 요청 {args.requests}회 × 동시 {args.concurrency}, 캐시 {args.cache}")
+        try:
+            results = asyncio.run(_run(args, fake))
+        finally:
+            fake.stop()
+
+    if args.json:
+        report = {
+            "settings": {k: v for k, v in vars(args).items() if k != "json"},
+            "upstream": fake.stats(),
+            "results": [result.summary() for result in results],
+        }
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,16 @@
 # fastapi_server.py
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Header, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
 import uvicorn
+import json
 import sys
 import os
+import time
 
 # 프로젝트 루트를 Python 경로에 추가
 project_root = os.path.dirname(os.path.abspath(__file__))
@@ -14,12 +19,22 @@ if project_root not in sys.path:
 
 # 패키지 방식으로 import
 from src.web_api_handler import WebAPIHandler
+from src import metrics, tracing, upstream
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 전국 채용공고 미러 백그라운드 동기화 (RECRUITMENT_MIRROR_SYNC_INTERVAL=0 이면 비활성)
+    handler.orchestrator.recruitment_mirror.start()
+    yield
+    # 종료 시 업스트림 커넥션 풀 정리
+    await handler.aclose()
 
 # FastAPI 앱 생성
 app = FastAPI(
     title="이음(IEUM) 통합 정보 조회 API",
     description="채용정보 + 부동산 + 청소년정책 통합 검색 API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS 설정
@@ -31,13 +46,82 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 요청 지표 (/metrics)
+HTTP_DURATION = metrics.histogram(
+    "http_request_duration_seconds", "API 응답 시간 (스트리밍 응답은 헤더 전송까지)", ("route", "method", "status")
+)
+HTTP_IN_FLIGHT = metrics.gauge("http_requests_in_flight", "처리 중인 API 요청 수")
+HTTP_RESPONSE_BYTES = metrics.counter(
+    "http_response_bytes_total", "API 응답 본문 바이트 (Content-Length가 있는 응답만)", ("route",)
+)
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    HTTP_IN_FLIGHT.inc()
+    started = time.monotonic()
+    status = 500
+    response = None
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        HTTP_IN_FLIGHT.dec()
+        # 경로 템플릿 기준 (매칭 안 된 경로는 하나로 묶어 레이블 수 제한)
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        HTTP_DURATION.observe(time.monotonic() - started, route=route, method=request.method, status=str(status))
+        length = response.headers.get("content-length") if response is not None else None
+        if length:
+            HTTP_RESPONSE_BYTES.inc(int(length), route=route)
+
+# 요청 추적: X-Debug-Timing: 1 이면 응답에 구간별 시간(debug_timing)과 Server-Timing 헤더를 붙임.
+# TRACE_EXPORT_FILE / TRACE_EXPORT_OTLP_URL 이 있으면 표본 요청을 OTLP/JSON으로 내보냄
+@app.middleware("http")
+async def trace_request(request: Request, call_next):
+    debug = (request.headers.get("x-debug-timing") or "").lower() in ("1", "true")
+    if not tracing.should_trace(debug):
+        return await call_next(request)
+
+    with tracing.trace(f"{request.method} {request.url.path}", method=request.method) as root:
+        response = await call_next(request)
+        route = getattr(request.scope.get("route"), "path", None)
+        if route:
+            root.name = f"{request.method} {route}"
+        root.set_attribute("http.status_code", response.status_code)
+    if not debug:
+        return response
+
+    breakdown = root.trace.breakdown()
+    headers = {k: v for k, v in response.headers.items() if k.lower() != "content-length"}
+    headers["Server-Timing"] = tracing.server_timing(breakdown)
+    if not response.headers.get("content-type", "").startswith("application/json"):
+        response.headers["Server-Timing"] = headers["Server-Timing"]  # 스트리밍 응답은 본문을 건드리지 않음
+        return response
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return Response(body, status_code=response.status_code, headers=headers)
+    if isinstance(payload, dict):
+        payload["debug_timing"] = breakdown
+    return Response(
+        json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+        status_code=response.status_code,
+        headers=headers,
+    )
+
 # API 핸들러 초기화
 handler = WebAPIHandler()
 
+# 통합 검색 응답 기한 기본값(ms). 0이면 모든 영역이 끝날 때까지 대기
+COMPREHENSIVE_LATENCY_BUDGET_MS = int(os.getenv("COMPREHENSIVE_LATENCY_BUDGET_MS") or 0)
+
 # === Request/Response 모델들 ===
 class SearchRequest(BaseModel):
     query: str
     region_code: str = "44790"
+    latency_budget_ms: Optional[int] = None  # 없으면 X-Latency-Budget-Ms 헤더 → 서버 기본값
 
 class JobSearchRequest(BaseModel):
     region_code: str
@@ -54,17 +138,57 @@ class PolicySearchRequest(BaseModel):
     keywords: Optional[str] = None
 
 # === API 엔드포인트들 ===
+def _latency_budget(request: SearchRequest, header_ms: Optional[int]) -> Optional[float]:
+    """본문 → 헤더 → 서버 기본값 순서로 응답 기한(초). 0 이하면 None(기한 없음)"""
+    budget_ms = request.latency_budget_ms or header_ms or COMPREHENSIVE_LATENCY_BUDGET_MS
+    return budget_ms / 1000 if budget_ms and budget_ms > 0 else None
+
 @app.post("/api/search/comprehensive")
-async def search_comprehensive(request: SearchRequest):
+async def search_comprehensive(
+    request: SearchRequest,
+    x_latency_budget_ms: Optional[int] = Header(None)
+):
     try:
         result = await handler.search_comprehensive(
             query=request.query,
-            region_code=request.region_code
+            region_code=request.region_code,
+            latency_budget=_latency_budget(request, x_latency_budget_ms)
         )
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"서버 오류: {str(e)}")
 
+@app.post("/api/search/comprehensive/stream")
+async def search_comprehensive_stream(
+    request: SearchRequest,
+    format: str = Query("sse", pattern="^(sse|ndjson)$"),
+    x_latency_budget_ms: Optional[int] = Header(None)
+):
+    """
+    종합 검색 스트리밍: 채용/부동산/정책 영역을 끝나는 순서대로 보내고 마지막에 summary
+    (summary 데이터는 /api/search/comprehensive 응답과 동일).
+    format=sse: "event: <이름>\ndata: <JSON>" / format=ndjson: {"event": <이름>, "data": <JSON>} 한 줄씩
+    """
+    events = handler.stream_comprehensive(
+        query=request.query,
+        region_code=request.region_code,
+        latency_budget=_latency_budget(request, x_latency_budget_ms)
+    )
+
+    async def body():
+        async for event, data in events:
+            data = jsonable_encoder(data)
+            if format == "ndjson":
+                yield json.dumps({"event": event, "data": data}, ensure_ascii=False) + "\n"
+            else:
+                yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+    media_type = "application/x-ndjson" if format == "ndjson" else "text/event-stream"
+    return StreamingResponse(
+        body(), media_type=media_type,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/api/search/jobs")
 async def search_jobs(request: JobSearchRequest):
     # 필터 구성
@@ -124,6 +248,16 @@ async def health_check():
         }
     }
 
+@app.get("/api/upstream/stats")
+async def get_upstream_stats():
+    return handler.orchestrator.get_upstream_stats()
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus 스크레이프용 지표 (텍스트 노출 형식)"""
+    upstream.refresh_gauges()
+    return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
 @app.get("/api/regions")
 async def get_supported_regions():
     return {
@@ -0,0 +1,182 @@
+# cassette.py — 업스트림 요청/응답 녹화·재생 (인증키를 가린 SQLite 카세트, 성능 회귀 측정·오프라인 프로파일링용)
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlencode
+
+import httpx
+
+try:
+    from .response_cache import cache_key
+    from .singleflight import SECRET_PARAMS, request_key
+except ImportError:  # 스크립트로 직접 실행한 경우
+    from response_cache import cache_key
+    from singleflight import SECRET_PARAMS, request_key
+
+OFF = "off"
+RECORD = "record"
+REPLAY = "replay"
+
+# UPSTREAM_CASSETTE=record: 실제 응답을 저장 / replay: 저장된 응답만 사용 (없으면 CassetteMiss)
+CASSETTE_MODE = (os.getenv("UPSTREAM_CASSETTE") or OFF).strip().lower()
+CASSETTE_PATH = os.getenv("UPSTREAM_CASSETTE_PATH") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "cassettes", "upstream.sqlite3"
+)
+# 재생 시 응답 시간: original(녹화 당시 소요 시간만큼 대기) / zero(즉시)
+CASSETTE_TIMING = (os.getenv("UPSTREAM_CASSETTE_TIMING") or "original").strip().lower()
+
+# 응답 헤더 중 저장하는 것 (본문은 압축 해제된 상태로 저장하므로 content-encoding 등은 제외)
+_KEPT_HEADERS = ("content-type",)
+
+
+class CassetteMiss(LookupError):
+    """재생 모드에서 녹화되지 않은 요청"""
+
+
+def _scrubbed_url(url: str, params: Dict[str, Any]) -> str:
+    query = [(k, "***" if k in SECRET_PARAMS else v) for k, v in params.items() if v is not None]
+    return f"{url}?{urlencode(query, safe='*')}" if query else url
+
+
+class Cassette:
+    """
+    요청 키(인증키를 뺀 URL+파라미터)당 마지막 응답 하나를 저장.
+    본문은 zlib로 압축하고, URL의 serviceKey/apiKeyNm 값은 ***로 바꿔 저장합니다.
+    """
+
+    def __init__(self, path: str, mode: str, timing: str = "original"):
+        self.path = path
+        self.mode = mode
+        self.timing = timing
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == RECORD
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == REPLAY
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                """CREATE TABLE IF NOT EXISTS interactions (
+                       key TEXT PRIMARY KEY,
+                       url TEXT NOT NULL,
+                       status INTEGER NOT NULL,
+                       headers TEXT NOT NULL,
+                       body BLOB NOT NULL,
+                       size INTEGER NOT NULL,
+                       elapsed REAL NOT NULL,
+                       tls_mode TEXT NOT NULL,
+                       recorded_at REAL NOT NULL
+                   )"""
+            )
+            self._db = db
+        return self._db
+
+    def record(self, url: str, params: Dict[str, Any], mode: str, resp: httpx.Response, elapsed: float):
+        """본문을 다 읽은 응답을 저장 (같은 요청은 덮어씀)"""
+        body = resp.content
+        headers = {k: v for k, v in resp.headers.items() if k.lower() in _KEPT_HEADERS}
+        row = (
+            cache_key(request_key(url, params)),
+            _scrubbed_url(url, params),
+            resp.status_code,
+            json.dumps(headers),
+            zlib.compress(body, 6),
+            len(body),
+            elapsed,
+            mode,
+            time.time(),
+        )
+        with self._lock:
+            try:
+                self._conn().execute("INSERT OR REPLACE INTO interactions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", row)
+                self.recorded += 1
+            except sqlite3.Error:
+                pass  # 녹화 실패는 요청 처리에 영향을 주지 않음
+
+    def lookup(self, url: str, params: Dict[str, Any]) -> Tuple[str, httpx.Response, float]:
+        """(TLS 모드, 응답, 재생 시 대기할 초). 녹화된 응답이 없으면 CassetteMiss"""
+        key = cache_key(request_key(url, params))
+        with self._lock:
+            row = self._conn().execute(
+                "SELECT status, headers, body, elapsed, tls_mode FROM interactions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+            else:
+                self.replayed += 1
+        if row is None:
+            raise CassetteMiss(f"카세트에 녹화되지 않은 요청: {_scrubbed_url(url, params)}")
+        status, headers, body, elapsed, tls_mode = row
+        resp = httpx.Response(
+            status,
+            headers=json.loads(headers),
+            content=zlib.decompress(body),
+            request=httpx.Request("GET", url, params=params),
+        )
+        return tls_mode, resp, (elapsed if self.timing == "original" else 0.0)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = {
+                "mode": self.mode,
+                "path": self.path,
+                "timing": self.timing,
+                "recorded": self.recorded,
+                "replayed": self.replayed,
+                "misses": self.misses,
+            }
+            try:
+                entries, raw, stored = self._conn().execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(body)), 0) FROM interactions"
+                ).fetchone()
+                counts.update({"entries": entries, "body_bytes": raw, "stored_bytes": stored})
+            except sqlite3.Error:
+                pass
+        return counts
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+def from_env() -> Optional[Cassette]:
+    """UPSTREAM_CASSETTE 설정에 맞는 카세트 (off면 None)"""
+    if CASSETTE_MODE not in (RECORD, REPLAY):
+        return None
+    return Cassette(CASSETTE_PATH, CASSETTE_MODE, CASSETTE_TIMING)
+
+
+def main():
+    """저장된 카세트 요약: python -m src.cassette [경로]"""
+    cassette = Cassette(sys.argv[1] if len(sys.argv) > 1 else CASSETTE_PATH, OFF)
+    rows = cassette._conn().execute(
+        "SELECT url, status, size, LENGTH(body), elapsed FROM interactions ORDER BY url"
+    ).fetchall()
+    for url, status, size, stored, elapsed in rows:
+        print(f"{status} {elapsed * 1000:8.1f}ms {size:>9,}B → {stored:>8,}B  {url}")
+    print(json.dumps(cassette.stats(), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
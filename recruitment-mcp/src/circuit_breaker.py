@@ -0,0 +1,196 @@
+# circuit_breaker.py — 업스트림별 회로 차단기 (오류율·응답 지연 기준 closed → open → half-open)
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, Tuple
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpen(RuntimeError):
+    """회로가 열려 있어 요청을 보내지 않음"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name}: 업스트림 장애로 요청을 차단 중입니다 ({retry_after:.0f}초 후 재시도)")
+        self.name = name
+        self.retry_after = retry_after
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name) or default)
+    except ValueError:
+        return default
+
+
+def _setting(source: str, name: str, default: float) -> float:
+    """CIRCUIT_<SOURCE>_<NAME> → CIRCUIT_<NAME> → 기본값"""
+    return _env_float(f"CIRCUIT_{source.upper()}_{name}", _env_float(f"CIRCUIT_{name}", default))
+
+
+class CircuitBreaker:
+    """
+    최근 window초 동안의 호출 중 실패(예외·5xx·slow_call초 초과) 비율이
+    failure_rate 이상이면(최소 min_calls회) 회로를 열고 open_seconds초 동안 즉시 실패시킵니다.
+    그 뒤 half_open_calls개의 시험 요청만 보내 성공하면 닫고, 실패하면 다시 엽니다.
+    """
+
+    def __init__(self, name: str, failure_rate: float, min_calls: int, window: float,
+                 slow_call: float, open_seconds: float, half_open_calls: int):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = max(1, min_calls)
+        self.window = window
+        self.slow_call = slow_call
+        self.open_seconds = open_seconds
+        self.half_open_calls = max(1, half_open_calls)
+        self._lock = threading.Lock()
+        self._calls: Deque[Tuple[float, bool]] = deque()  # (끝난 시각, 실패 여부)
+        self._failures = 0
+        self.state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self.opened = 0
+        self.rejected = 0
+        self.slow_calls = 0
+        self.last_error = ""
+
+    def _prune(self, now: float):
+        while self._calls and now - self._calls[0][0] > self.window:
+            _, failed = self._calls.popleft()
+            self._failures -= failed
+
+    def _trip(self, now: float):
+        self.state = OPEN
+        self._opened_at = now
+        self._probes = 0
+        self._calls.clear()
+        self._failures = 0
+        self.opened += 1
+
+    def _retry_after(self, now: float) -> float:
+        return max(0.0, self._opened_at + self.open_seconds - now)
+
+    def check(self):
+        """열려 있으면 CircuitOpen (상태는 바꾸지 않음 — 대기열에 줄 서기 전에 확인용)"""
+        with self._lock:
+            now = time.monotonic()
+            if self.state == OPEN and self._retry_after(now) > 0:
+                self.rejected += 1
+                raise CircuitOpen(self.name, self._retry_after(now))
+
+    def _enter(self):
+        with self._lock:
+            now = time.monotonic()
+            if self.state == OPEN:
+                if self._retry_after(now) > 0:
+                    self.rejected += 1
+                    raise CircuitOpen(self.name, self._retry_after(now))
+                self.state = HALF_OPEN
+                self._probes = 0
+            if self.state == HALF_OPEN:
+                if self._probes >= self.half_open_calls:
+                    self.rejected += 1
+                    raise CircuitOpen(self.name, 0)
+                self._probes += 1
+
+    def _record(self, failed: bool, elapsed: float, error: str = ""):
+        slow = elapsed > self.slow_call
+        if slow:
+            failed = True
+            error = error or f"응답 지연 {elapsed:.1f}초"
+        with self._lock:
+            now = time.monotonic()
+            self.slow_calls += slow
+            if failed:
+                self.last_error = error
+            if self.state == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+                if failed:
+                    self._trip(now)
+                else:
+                    self.state = CLOSED
+                return
+            if self.state == OPEN:
+                return  # 회로가 열리기 전에 출발한 요청의 뒤늦은 결과
+            self._calls.append((now, failed))
+            self._failures += failed
+            self._prune(now)
+            if len(self._calls) >= self.min_calls and self._failures / len(self._calls) >= self.failure_rate:
+                self._trip(now)
+
+    def _abandon(self):
+        """취소된 호출은 성공/실패로 치지 않음"""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+
+    @contextmanager
+    def call(self) -> Iterator[None]:
+        """블록 안의 예외를 실패로, 소요 시간이 slow_call초를 넘으면 지연으로 기록"""
+        self._enter()
+        started = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            self._record(True, time.monotonic() - started, f"{type(e).__name__}: {e}")
+            raise
+        except BaseException:
+            self._abandon()
+            raise
+        self._record(False, time.monotonic() - started)
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            self._prune(now)
+            state = self.state
+            if state == OPEN and self._retry_after(now) <= 0:
+                state = HALF_OPEN  # 다음 요청이 시험 요청이 됨
+            return {
+                "state": state,
+                "recent_calls": len(self._calls),
+                "recent_failures": self._failures,
+                "retry_after": round(self._retry_after(now), 1) if self.state == OPEN else 0,
+                "opened": self.opened,
+                "rejected": self.rejected,
+                "slow_calls": self.slow_calls,
+                "last_error": self.last_error,
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(source: str) -> CircuitBreaker:
+    """
+    업스트림별 CircuitBreaker. 설정은 .env에서 읽음:
+    CIRCUIT_<SOURCE>_FAILURE_RATE / _MIN_CALLS / _WINDOW / _SLOW_CALL / _OPEN_SECONDS / _HALF_OPEN_CALLS
+    (SOURCE 없이 CIRCUIT_FAILURE_RATE 등으로 전체 기본값 지정 가능)
+    """
+    breaker = _breakers.get(source)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(source)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    name=source,
+                    failure_rate=_setting(source, "FAILURE_RATE", 0.5),
+                    min_calls=int(_setting(source, "MIN_CALLS", 5)),
+                    window=_setting(source, "WINDOW", 60),
+                    slow_call=_setting(source, "SLOW_CALL", 10),
+                    open_seconds=_setting(source, "OPEN_SECONDS", 30),
+                    half_open_calls=int(_setting(source, "HALF_OPEN_CALLS", 1)),
+                )
+                _breakers[source] = breaker
+    return breaker
+
+
+def status() -> Dict[str, Any]:
+    """업스트림별 회로 상태"""
+    return {name: breaker.status() for name, breaker in list(_breakers.items())}
@@ -1,12 +1,17 @@
 # enhanced_orchestrator.py — 청소년정책 포함 확장 오케스트레이터
 import asyncio
 import json
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
 
 # 상대 import로 변경
 from . import server
 from . import realestate_server
 from . import youth_policy_server
+from . import tracing
+from . import upstream
+from .recruitment_mirror import get_mirror
+from .realestate_store import RealEstateStore
 
 class EnhancedOrchestrator:
     """채용정보 + 부동산 + 청소년정책을 통합하는 확장된 오케스트레이터"""
@@ -15,6 +20,29 @@ class EnhancedOrchestrator:
         self.recruitment_server = server
         self.realestate_server = realestate_server
         self.youth_policy_server = youth_policy_server
+        # 세 서버 모두 upstream 모듈의 호스트별 커넥션 풀을 공유
+        self.upstream = upstream
+        # 전국 채용공고 로컬 미러 (지역 조회를 업스트림 대신 로컬에서 처리)
+        self.recruitment_mirror = get_mirror()
+        # (지역, 월)별 아파트 실거래 컬럼 (여러 달 가격 분석용)
+        self.realestate_store = RealEstateStore()
+    
+    def get_upstream_stats(self) -> Dict[str, Any]:
+        """커넥션 풀 / TLS 모드 / 요청 합치기 현황"""
+        return {
+            **self.upstream.pool_info(),
+            **self.upstream.stats(),
+            "recruitment_mirror": self.recruitment_mirror.status()
+        }
+    
+    def search_local_recruitments(self, filters: Optional[Dict[str, Any]] = None):
+        """미러에서 채용공고 조회 (미러 미준비/지원하지 않는 필터면 None)"""
+        return self.recruitment_mirror.query(filters)
+    
+    def close(self):
+        """공유 커넥션 풀 종료 (앱 종료 시 호출)"""
+        self.recruitment_mirror.stop()
+        self.upstream.close_all()
     
     def get_available_tools(self) -> Dict[str, list]:
         """사용 가능한 모든 도구 목록"""
@@ -39,6 +67,7 @@ class EnhancedOrchestrator:
             ]
         }
     
+    @tracing.traced("orchestrator.call_recruitment_tool")
     def call_recruitment_tool(self, tool_name: str, arguments: Dict[str, Any]):
         """채용정보 서버 도구 호출"""
         try:
@@ -78,6 +107,7 @@ class EnhancedOrchestrator:
                 "message": str(e)
             }
     
+    @tracing.traced("orchestrator.call_realestate_tool")
     def call_realestate_tool(self, tool_name: str, arguments: Dict[str, Any]):
         """부동산 서버 도구 호출"""
         try:
@@ -124,6 +154,7 @@ class EnhancedOrchestrator:
                 "message": str(e)
             }
     
+    @tracing.traced("orchestrator.call_youth_policy_tool")
     def call_youth_policy_tool(self, tool_name: str, arguments: Dict[str, Any]):
         """청소년정책 서버 도구 호출"""
         try:
@@ -177,6 +208,150 @@ class EnhancedOrchestrator:
                 "message": str(e)
             }
     
+    # === 비동기 도구 호출 (FastAPI 경로용, httpx.AsyncClient 기반) ===
+    
+    async def _call_tool_async(self, server_name: str, server_module, tool_name: str, arguments: Dict[str, Any]):
+        """서버 모듈의 ASYNC_TOOLS에서 도구를 찾아 호출 (응답 형식은 동기 버전과 동일)"""
+        tracing.current_span().set_attribute("tool", tool_name)
+        try:
+            if tool_name == 'ping':
+                result = server_module.ping()
+            else:
+                tool = server_module.ASYNC_TOOLS.get(tool_name)
+                if tool is None:
+                    return {
+                        "status": "error",
+                        "server": server_name,
+                        "tool": tool_name,
+                        "message": f"알 수 없는 도구: {tool_name}"
+                    }
+                result = await tool(**arguments)
+            return {
+                "status": "success",
+                "server": server_name,
+                "tool": tool_name,
+                "result": result
+            }
+        except Exception as e:
+            return {
+                "status": "error",
+                "server": server_name,
+                "tool": tool_name,
+                "message": str(e)
+            }
+    
+    @tracing.traced("orchestrator.call_recruitment_tool")
+    async def call_recruitment_tool_async(self, tool_name: str, arguments: Dict[str, Any]):
+        """채용정보 서버 도구 비동기 호출"""
+        return await self._call_tool_async("recruitment", self.recruitment_server, tool_name, arguments)
+    
+    @tracing.traced("orchestrator.call_realestate_tool")
+    async def call_realestate_tool_async(self, tool_name: str, arguments: Dict[str, Any]):
+        """부동산 서버 도구 비동기 호출"""
+        return await self._call_tool_async("realestate", self.realestate_server, tool_name, arguments)
+    
+    @tracing.traced("orchestrator.call_youth_policy_tool")
+    async def call_youth_policy_tool_async(self, tool_name: str, arguments: Dict[str, Any]):
+        """청소년정책 서버 도구 비동기 호출"""
+        return await self._call_tool_async("youth_policy", self.youth_policy_server, tool_name, arguments)
+    
+    async def aclose(self):
+        """비동기/동기 커넥션 풀 모두 종료"""
+        self.recruitment_mirror.stop()
+        await self.upstream.aclose_all()
+    
+    # === 아파트 실거래가 기간 조회 ===
+
+    def _trade_months(self, from_ymd: Optional[str], to_ymd: Optional[str], months: int) -> List[str]:
+        """조회할 계약년월 목록. 형식이 잘못되었거나 기간이 뒤집혔으면 ValueError"""
+        for name, value in (("from_ymd", from_ymd), ("to_ymd", to_ymd)):
+            if value and not self.realestate_server.is_deal_ymd(str(value)):
+                raise ValueError(f"{name}는 YYYYMM 형식이어야 합니다 (예: 202506): {value}")
+        if from_ymd and to_ymd:
+            if from_ymd > to_ymd:
+                raise ValueError(f"from_ymd({from_ymd})가 to_ymd({to_ymd})보다 늦습니다")
+            return self.realestate_server.month_range(from_ymd, to_ymd)
+        if from_ymd:
+            return self.realestate_server.months_from(from_ymd, months)
+        return self.realestate_server.recent_months(months, to_ymd)
+
+    def _trade_range_error(self, region_code: str, message: str) -> Dict[str, Any]:
+        return {"status": "error", "region_code": region_code, "message": message}
+
+    def _trade_args(self, region_code: str, month: str, num_rows: int) -> Dict[str, Any]:
+        return {'lawdcd': region_code, 'deal_ymd': month, 'pageNo': 1, 'numOfRows': num_rows}
+
+    def _merge_trade_range(self, region_code: str, months: List[str], results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """월별 응답을 컬럼 저장소에 반영하고 하나의 시계열로 합침"""
+        errors = {}
+        for month, apt_result in zip(months, results):
+            result = apt_result.get("result") or {}
+            if apt_result["status"] != "success" or result.get("status") != "ok" or "text" not in result:
+                errors[month] = apt_result.get("message") or result.get("message") or "응답 없음"
+                continue
+            if self.realestate_store.put_xml(region_code, month, result["text"]) is None:
+                errors[month] = "XML 파싱 오류"
+        analysis = self.realestate_store.analyze(region_code, months)
+        return {
+            "status": "success",
+            "region_code": region_code,
+            "from_ymd": months[0] if months else None,
+            "to_ymd": months[-1] if months else None,
+            "months": months,
+            "series": analysis["months"],
+            "trend": analysis["trend"],
+            "change_pct": analysis["change_pct"],
+            "sample_count": analysis["sample_count"],
+            "errors": errors,
+            "results": dict(zip(months, results))
+        }
+
+    def fetch_apartment_trade_range(
+        self,
+        region_code: str,
+        from_ymd: Optional[str] = None,
+        to_ymd: Optional[str] = None,
+        months: int = 12,
+        num_rows: int = 100,
+    ) -> Dict[str, Any]:
+        """
+        from_ymd ~ to_ymd (from_ymd만 있으면 거기서부터, 없으면 to_ymd 또는 이번 달까지 months개월)
+        아파트 거래를 동시에 조회해 월별 시계열로 반환. 기간이 잘못되면 status "error".
+        지난 달 이전은 만료 없는 캐시에서 바로 나오므로 기간이 길어도 새로 요청하는 달은 최근 한두 달뿐입니다.
+        """
+        try:
+            month_list = self._trade_months(from_ymd, to_ymd, months)
+        except ValueError as e:
+            return self._trade_range_error(region_code, str(e))
+        if not month_list:
+            return self._merge_trade_range(region_code, [], [])
+        workers = max(1, min(len(month_list), self.upstream.POOL_MAX_CONNECTIONS))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="trade-range") as pool:
+            results = list(pool.map(
+                lambda month: self.call_realestate_tool('getApartmentTrades', self._trade_args(region_code, month, num_rows)),
+                month_list
+            ))
+        return self._merge_trade_range(region_code, month_list, results)
+
+    async def fetch_apartment_trade_range_async(
+        self,
+        region_code: str,
+        from_ymd: Optional[str] = None,
+        to_ymd: Optional[str] = None,
+        months: int = 12,
+        num_rows: int = 100,
+    ) -> Dict[str, Any]:
+        """fetch_apartment_trade_range의 비동기 버전"""
+        try:
+            month_list = self._trade_months(from_ymd, to_ymd, months)
+        except ValueError as e:
+            return self._trade_range_error(region_code, str(e))
+        results = await asyncio.gather(*(
+            self.call_realestate_tool_async('getApartmentTrades', self._trade_args(region_code, month, num_rows))
+            for month in month_list
+        ))
+        return self._merge_trade_range(region_code, month_list, list(results))
+    
     def comprehensive_region_analysis(self, region_code: str, deal_ymd: str = "202506"):
         """지역 종합 분석 - 채용정보 + 부동산 + 청소년정책"""
         print(f"🔍 지역 종합 분석 시작: {region_code}")
@@ -233,55 +408,56 @@ class EnhancedOrchestrator:
         print("✅ 지역 종합 분석 완료")
         return results
 
-    def analyze_living_feasibility(self, region_code: str, age_group: str = "청년"):
-        """거주 타당성 분석 - 일자리, 주거비, 정책 지원 종합"""
+    def analyze_living_feasibility(
+        self,
+        region_code: str,
+        age_group: str = "청년",
+        from_ymd: Optional[str] = None,
+        to_ymd: Optional[str] = None,
+        months: int = 3,
+    ):
+        """거주 타당성 분석 - 일자리, 주거비, 정책 지원 종합 (세 항목과 월별 실거래를 동시에 조회)"""
         print(f"📊 {age_group} 거주 타당성 분석: {region_code}")
+        try:
+            self._trade_months(from_ymd, to_ymd, months)  # 잘못된 기간이면 다른 조회를 시작하기 전에 거절
+        except ValueError as e:
+            return self._trade_range_error(region_code, str(e))
         
-        results = {}
-        
-        # 1. 일자리 현황
-        recruitment_result = self.call_recruitment_tool(
-            'listRecruitments',
-            {'pageNo': 1, 'numOfRows': 20}
-        )
-        results['job_market'] = recruitment_result
-        
-        # 2. 주거비 현황 (최근 6개월)
-        months = ["202501", "202502", "202503", "202504", "202505", "202506"]
-        housing_costs = []
+        # 정책 지원 키워드
+        if age_group == "청년":
+            policy_keywords = "청년,취업지원,주거지원,창업지원,생활비지원"
+        else:
+            policy_keywords = "일자리,주거,복지,교육"
         
-        for month in months[-3:]:  # 최근 3개월만
-            apt_result = self.call_realestate_tool(
-                'getApartmentTrades',
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="feasibility") as pool:
+            # 1. 일자리 현황
+            recruitment_future = pool.submit(
+                self.call_recruitment_tool,
+                'listRecruitments',
+                {'pageNo': 1, 'numOfRows': 20}
+            )
+            # 3. 정책 지원 현황
+            policy_future = pool.submit(
+                self.call_youth_policy_tool,
+                'searchPoliciesByKeywords',
                 {
-                    'lawdcd': region_code,
-                    'deal_ymd': month,
+                    'keywords': policy_keywords,
+                    'regionCode': region_code,
                     'pageNum': 1,
-                    'numOfRows': 10
+                    'pageSize': 15
                 }
             )
-            housing_costs.append({month: apt_result})
-        
-        results['housing_trends'] = housing_costs
-        
-        # 3. 정책 지원 현황
-        if age_group == "청년":
-            policy_keywords = "청년,취업지원,주거지원,창업지원,생활비지원"
-        else:
-            policy_keywords = "일자리,주거,복지,교육"
+            # 2. 주거비 현황 (기간 내 월별 실거래, 기본 최근 3개월)
+            housing_trends = self.fetch_apartment_trade_range(
+                region_code, from_ymd=from_ymd, to_ymd=to_ymd, months=months, num_rows=100
+            )
+            housing_trends.pop("results", None)
         
-        policy_result = self.call_youth_policy_tool(
-            'searchPoliciesByKeywords',
-            {
-                'keywords': policy_keywords,
-                'regionCode': region_code,
-                'pageNum': 1,
-                'pageSize': 15
+            return {
+                'job_market': recruitment_future.result(),
+                'housing_trends': housing_trends,
+                'policy_support': policy_future.result()
             }
-        )
-        results['policy_support'] = policy_result
-        
-        return results
 
 
 def test_all_servers():
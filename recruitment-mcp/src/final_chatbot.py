@@ -3,14 +3,29 @@ import asyncio
 import json
 import re
 from typing import Dict, Any, List, Optional
-from datetime import datetime
 
 # 확장된 오케스트레이터 import
 from .enhanced_orchestrator import EnhancedOrchestrator
+from .job_index import JobRegionIndex, REGION_KEYWORDS, posting_id
+from .keyword_automaton import KeywordAutomaton
+from .molit_parser import iter_items
+from .policy_index import PolicyIndex
+
+# 검색 유형·조건 감지 키워드 (그룹 안에서는 앞쪽이 우선)
+INTENT_KEYWORDS: Dict[str, List[str]] = {
+    "job": ["채용", "구인", "일자리", "취업", "인턴", "공채", "모집", "구직", "직장"],
+    "realestate": ["아파트", "부동산", "실거래가", "매매", "집", "주택", "오피스텔", "매물"],
+    "policy": ["정책", "지원", "혜택", "복지", "청년정책"],
+    "living": ["살곳", "살", "거주", "이사", "정착", "생활"],
+    "all": ["통합", "전체", "모든", "다"],
+    "filter": ["청년", "인턴", "정규직", "계약직", "비정규", "학력무관", "대졸", "4년제"],
+}
 
 class PerfectChatbot:
     def __init__(self):
         self.orchestrator = EnhancedOrchestrator()
+        self.job_index = JobRegionIndex()  # 조회한 공고의 근무지역 역색인 (공고 ID 기준, 지역이 바뀐 공고만 다시 파싱)
+        self.policy_index = PolicyIndex()  # 조회한 정책의 zipCd/종료일 색인 (정책 ID 기준)
 
         # ✅ 이 챗봇은 아래 5개 지역만 지원합니다.
         # 정선군(51770), 영월군(51750), 청양군(44790), 강릉시(51150), 김제시(52210)
@@ -76,6 +91,22 @@ class PerfectChatbot:
             "연구": "연구"
         }
 
+        # 의도 분석 어휘(지역명·검색 유형·채용 조건·직무 분야)를 한 오토마톤으로 컴파일 → 입력당 한 번만 훑음
+        self.intent_automaton = self._build_intent_automaton()
+
+    def _build_intent_automaton(self) -> KeywordAutomaton:
+        automaton = KeywordAutomaton()
+        automaton.add_all("region", self.allowed_regions_name_to_code)
+        for group, keywords in INTENT_KEYWORDS.items():
+            automaton.add_all(group, keywords)
+        automaton.add_all("job_field", self.job_fields)
+        automaton.add_all("job_keyword", {
+            keyword: self.job_fields[field_name]
+            for keyword, field_name in self.job_keywords.items()
+            if field_name in self.job_fields
+        })
+        return automaton.build()
+
     def print_help(self):
         print("""
 🤖 통합 챗봇 명령어 가이드  (지원 지역: 정선·영월·청양·강릉·김제)
@@ -113,28 +144,15 @@ class PerfectChatbot:
             "region_mentioned": None
         }
 
-        # ✅ 지역 감지: 5개 지역만
-        region_mapping = {
-            "정선": "51770", "정선군": "51770",
-            "영월": "51750", "영월군": "51750",
-            "청양": "44790", "청양군": "44790",
-            "강릉": "51150", "강릉시": "51150",
-            "김제": "52210", "김제시": "52210",
-        }
-        for region_name, code in region_mapping.items():
-            if region_name in text:
-                intent["region_mentioned"] = code
-                break
+        hits = self.intent_automaton.scan(text)
 
-        # 검색 유형 감지
-        job_keywords = ["채용", "구인", "일자리", "취업", "인턴", "공채", "모집", "구직", "직장"]
-        realestate_keywords = ["아파트", "부동산", "실거래가", "매매", "집", "주택", "오피스텔", "매물"]
-        policy_keywords = ["정책", "지원", "혜택", "복지", "청년정책"]
-        living_keywords = ["살곳", "살", "거주", "이사", "정착", "생활"]
+        # ✅ 지역 감지: 5개 지역만 (여러 개면 먼저 등록된 지역)
+        intent["region_mentioned"] = hits.first("region")
 
-        has_job = any(keyword in text for keyword in job_keywords)
-        has_realestate = any(keyword in text for keyword in realestate_keywords + living_keywords)
-        has_policy = any(keyword in text for keyword in policy_keywords)
+        # 검색 유형 감지
+        has_job = hits.has("job")
+        has_realestate = hits.has("realestate") or hits.has("living")
+        has_policy = hits.has("policy")
 
         # 검색 유형 결정
         search_count = sum([has_job, has_realestate, has_policy])
@@ -152,36 +170,28 @@ class PerfectChatbot:
         elif has_policy:
             intent["type"] = "policies_only"
             intent["search_policies"] = True
-        elif any(keyword in text for keyword in ["통합", "전체", "모든", "다"]):
+        elif hits.has("all"):
             intent["type"] = "comprehensive"
             intent["search_jobs"] = True
             intent["search_realestate"] = True
             intent["search_policies"] = True
 
-        # 채용 필터 감지 (기존과 동일)
-        if "청년" in text and "인턴" in text:
-            intent["filters"]["hireTypeLst"] = "R1050,R1060,R1070"
-        elif "정규직" in text:
-            intent["filters"]["hireTypeLst"] = "R1010"
-        elif "계약직" in text or "비정규" in text:
-            intent["filters"]["hireTypeLst"] = "R1040"
-
-        if "학력무관" in text:
-            intent["filters"]["acbgCondLst"] = "R7010"
-        elif "대졸" in text or "4년제" in text:
-            intent["filters"]["acbgCondLst"] = "R7050"
-
-        # 직무 분야 필터 감지 (키워드 매핑 추가)
-        detected_field = None
-        for field_name, code in self.job_fields.items():
-            if field_name in text:
-                detected_field = code
-                break
-        if not detected_field:
-            for keyword, field_name in self.job_keywords.items():
-                if keyword in text and field_name in self.job_fields:
-                    detected_field = self.job_fields[field_name]
-                    break
+        # 채용 필터 감지 (기존과 동일, 조건 키워드가 하나도 없으면 건너뜀)
+        if hits.has("filter"):
+            if "청년" in hits and "인턴" in hits:
+                intent["filters"]["hireTypeLst"] = "R1050,R1060,R1070"
+            elif "정규직" in hits:
+                intent["filters"]["hireTypeLst"] = "R1010"
+            elif "계약직" in hits or "비정규" in hits:
+                intent["filters"]["hireTypeLst"] = "R1040"
+
+            if "학력무관" in hits:
+                intent["filters"]["acbgCondLst"] = "R7010"
+            elif "대졸" in hits or "4년제" in hits:
+                intent["filters"]["acbgCondLst"] = "R7050"
+
+        # 직무 분야 필터 감지 (정식 분야명이 키워드 매핑보다 우선)
+        detected_field = hits.first("job_field") or hits.first("job_keyword")
         if detected_field:
             intent["filters"]["ncsCdLst"] = detected_field
 
@@ -193,39 +203,8 @@ class PerfectChatbot:
 
     def filter_active_policies(self, policies: List[Dict]) -> List[Dict]:
         """현재 날짜 기준으로 유효한 정책만 필터링"""
-        today = datetime.now().strftime("%Y%m%d")
-        active_policies = []
-
-        for policy in policies:
-            is_active = True
-
-            # 1. 사업 종료일 체크
-            biz_end_date = policy.get("bizPrdEndYmd", "")
-            if biz_end_date and len(biz_end_date) == 8 and biz_end_date.isdigit():
-                if biz_end_date < today:
-                    is_active = False
-                    continue
-
-            # 2. 신청 마감일 체크 (aplyYmd에서 종료일 추출)
-            apply_period = policy.get("aplyYmd", "")
-            if apply_period and " ~ " in apply_period:
-                dates = apply_period.split(" ~ ")
-                if len(dates) == 2:
-                    end_date = dates[1].strip()
-                    if len(end_date) == 8 and end_date.isdigit():
-                        if end_date < today:
-                            is_active = False
-                            continue
-            elif apply_period and len(apply_period) == 8 and apply_period.isdigit():
-                if apply_period < today:
-                    is_active = False
-                    continue
-
-            # 3. 상시 신청이거나 날짜 정보가 없으면 활성으로 간주
-            if is_active:
-                active_policies.append(policy)
-
-        return active_policies
+        # 사업 종료일/신청 마감일은 정책 색인 적재 시 한 번만 파싱 (상시 신청이거나 날짜 정보가 없으면 활성)
+        return self.policy_index.filter_active(policies)
 
     def format_job_results(self, results: List[Dict], limit: int = 5, region_name: str = "") -> str:
         """채용정보 결과를 보기 좋게 포맷"""
@@ -327,19 +306,7 @@ class PerfectChatbot:
             if policy_no:
                 detail_url = f"https://www.youthcenter.go.kr/youthPolicy/ythPlcyTotalSearch/ythPlcyDetail/{policy_no}"
 
-            zip_codes = policy.get('zipCd', '')
-            if zip_codes:
-                region_count = len(zip_codes.split(',')) if ',' in zip_codes else 1
-                if region_count >= 50:
-                    scope_display = f"전국 ({region_count}개 지역)"
-                elif region_count > 10:
-                    scope_display = f"광역 ({region_count}개 지역)"
-                elif region_count > 1:
-                    scope_display = f"다지역 ({region_count}개 지역)"
-                else:
-                    scope_display = "지역특화"
-            else:
-                scope_display = "범위미상"
+            scope_display = self.policy_index.scope_display(policy)
 
             support_content = policy.get("plcySprtCn", "")
             business_start = policy.get("bizPrdBgngYmd", "")
@@ -415,71 +382,42 @@ class PerfectChatbot:
 
         return "\n".join(output)
 
-    def filter_and_sort_jobs_by_region(self, jobs: List[Dict], target_region_code: str) -> List[Dict]:
+    def filter_and_sort_jobs_by_region(
+        self, jobs: List[Dict], target_region_code: str, index: Optional[JobRegionIndex] = None
+    ) -> List[Dict]:
         """채용정보를 지역 관련성에 따라 정렬 (5개 지역 전용)"""
-        region_mapping = {
-            "51770": ["정선", "강원"],
-            "51750": ["영월", "강원"],
-            "44790": ["청양", "충남", "충청"],
-            "51150": ["강릉", "강원"],
-            "52210": ["김제", "전북", "전라"],
-        }
-
-        if target_region_code not in region_mapping:
+        if target_region_code not in REGION_KEYWORDS:
             return jobs[:10]
 
-        target_keywords = region_mapping[target_region_code]
-
-        def calculate_job_score(job):
-            work_region = job.get("workRgnNmLst", "").replace(" ", "")
-            if not work_region:
-                return (999, 0)
-            region_count = work_region.count(',') + 1 if work_region else 0
-            relevance_score = 999
-            for i, keyword in enumerate(target_keywords):
-                if keyword in work_region:
-                    relevance_score = i
-                    break
-            return (relevance_score, region_count)
-
-        scored_jobs = [(job, calculate_job_score(job)) for job in jobs]
-        sorted_jobs = sorted(scored_jobs, key=lambda x: x[1])
-        result_jobs = [job for job, score in sorted_jobs[:15]]
-        return result_jobs
+        # 근무지역 역색인으로 정렬 (관련성 점수 → 근무지역 수 → 원래 순서)
+        # 미러에서 온 공고는 미러가 동기화 때 이미 색인했으므로 ID만 후보로 넘김
+        # (다시 적재하면 요청마다 전국 목록을 파싱하고, 동기화가 방금 지운 공고를 되살릴 수 있음)
+        if index is None:
+            index = self.job_index
+            pids = index.ingest(jobs)
+        else:
+            pids = [posting_id(job) for job in jobs]
+        by_id = {}
+        ids = []
+        for pid, job in zip(pids, jobs):
+            if pid not in by_id:
+                by_id[pid] = job
+                ids.append(pid)
+        return [by_id[pid] for pid in index.rank(REGION_KEYWORDS[target_region_code], ids, limit=15)]
 
     def filter_and_sort_policies_by_region(self, policies: List[Dict], target_region_code: str) -> List[Dict]:
         """청년정책 지역 관련성 정렬 (5개 지역 전용)"""
-        region_mapping = {
-            "51770": ["정선", "강원"],
-            "51750": ["영월", "강원"],
-            "44790": ["청양", "충남", "충청"],
-            "51150": ["강릉", "강원"],
-            "52210": ["김제", "전북", "전라"],
-        }
-
-        if target_region_code not in region_mapping:
+        if target_region_code not in REGION_KEYWORDS:
             return policies[:10]
 
-        target_keywords = region_mapping[target_region_code]
-
-        def calculate_policy_score(policy):
-            institution = policy.get("sprvsnInstCdNm", "").replace(" ", "")
-            zip_codes = policy.get('zipCd', '')
-            region_count = len(zip_codes.split(',')) if zip_codes and ',' in zip_codes else 1
-            relevance_score = 999
-            for i, keyword in enumerate(target_keywords):
-                if keyword in institution:
-                    relevance_score = i
-                    break
-            if relevance_score == 999 and zip_codes:
-                if target_region_code in zip_codes:
-                    relevance_score = len(target_keywords)
-            return (relevance_score, region_count)
-
-        scored_policies = [(policy, calculate_policy_score(policy)) for policy in policies]
-        sorted_policies = sorted(scored_policies, key=lambda x: x[1])
-        result_policies = [policy for policy, score in sorted_policies[:15]]
-        return result_policies
+        # 정책 색인으로 정렬 (주관기관 키워드 → zipCd 포함 여부 → 지역 수 → 원래 순서)
+        by_id = {}
+        ids = []
+        for pid, policy in zip(self.policy_index.ingest(policies), policies):
+            if pid not in by_id:
+                by_id[pid] = policy
+                ids.append(pid)
+        return [by_id[pid] for pid in self.policy_index.rank(target_region_code, ids, limit=15)]
 
     async def handle_search(self, intent: Dict[str, Any]) -> str:
         """검색 의도에 따라 적절한 검색 수행 (정책 검색 + 날짜 필터링)"""
@@ -497,18 +435,27 @@ class PerfectChatbot:
             # 1) 채용정보
             if intent["search_jobs"]:
                 print("📋 채용정보 검색 중...")
-                job_result = self.orchestrator.call_recruitment_tool(
-                    'listRecruitments',
-                    {
-                        'pageNo': 1,
-                        'numOfRows': 100,
-                        'filters': {**intent.get("filters", {}),
-                                    **({} if self.state["job_field"] is None else {"ncsCdLst": self.state["job_field"]})}
-                    }
-                )
+                job_filters = {**intent.get("filters", {}),
+                               **({} if self.state["job_field"] is None else {"ncsCdLst": self.state["job_field"]})}
+                # 로컬 미러가 준비되어 있으면 전국 전체 공고에서 지역 검색
+                local_jobs = self.orchestrator.search_local_recruitments(job_filters)
+                job_index = None
+                if local_jobs is not None:
+                    job_result = {"status": "success", "result": {"data": {"result": local_jobs}}}
+                    # 미러 공고는 미러가 유지하는 지역 인덱스로 필터 (매 검색마다 전국 공고를 다시 색인하지 않음)
+                    job_index = self.orchestrator.recruitment_mirror.region_index
+                else:
+                    job_result = self.orchestrator.call_recruitment_tool(
+                        'listRecruitments',
+                        {
+                            'pageNo': 1,
+                            'numOfRows': 100,
+                            'filters': job_filters
+                        }
+                    )
                 if job_result["status"] == "success":
                     job_data = job_result["result"].get("data", {}).get("result", [])
-                    job_data = self.filter_and_sort_jobs_by_region(job_data, region_code)
+                    job_data = self.filter_and_sort_jobs_by_region(job_data, region_code, index=job_index)
                     results.append(self.format_job_results(job_data, limit=5, region_name=region_name))
                 else:
                     results.append(f"📋 채용정보 검색 실패: {job_result.get('message', '알 수 없는 오류')}")
@@ -563,18 +510,9 @@ class PerfectChatbot:
             return "❌ 검색 결과를 찾을 수 없습니다."
 
     def parse_apartment_xml(self, xml_text: str) -> List[Dict]:
-        """XML 형태의 아파트 데이터를 파싱"""
-        import xml.etree.ElementTree as ET
+        """XML 형태의 아파트 데이터를 파싱 (<item> 단위 스트리밍, 값은 문자열 그대로)"""
         try:
-            root = ET.fromstring(xml_text)
-            items = root.findall('.//item')
-            apt_list = []
-            for item in items:
-                apt_data = {}
-                for child in item:
-                    apt_data[child.tag] = child.text.strip() if child.text else ""
-                apt_list.append(apt_data)
-            return apt_list
+            return list(iter_items(xml_text))
         except Exception as e:
             print(f"XML 파싱 오류: {e}")
             return []
@@ -0,0 +1,274 @@
+# hedging.py — 꼬리 지연 대응 요청 헤징 (엔드포인트별 관측 p95가 지나도 응답이 없으면 같은 요청을 한 번 더 보내 먼저 온 응답 사용)
+import asyncio
+import concurrent.futures
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name) or default)
+    except ValueError:
+        return default
+
+
+# 기본은 꺼져 있음 (UPSTREAM_HEDGE=on 으로 사용)
+HEDGE_ENABLED = (os.getenv("UPSTREAM_HEDGE") or "off").strip().lower() in ("on", "1", "true", "yes")
+HEDGE_PERCENTILE = _env_float("UPSTREAM_HEDGE_PERCENTILE", 95)
+HEDGE_BUDGET_RATIO = _env_float("UPSTREAM_HEDGE_BUDGET", 0.05)      # 일반 요청 대비 헤지 요청 비율 상한
+HEDGE_BUDGET_BURST = _env_float("UPSTREAM_HEDGE_BUDGET_BURST", 10)  # 한 번에 몰아 쓸 수 있는 헤지 수
+HEDGE_MIN_SAMPLES = int(_env_float("UPSTREAM_HEDGE_MIN_SAMPLES", 20))  # 이만큼 관측하기 전에는 헤징 안 함
+HEDGE_MIN_DELAY = _env_float("UPSTREAM_HEDGE_MIN_DELAY", 0.05)
+HEDGE_WINDOW = int(_env_float("UPSTREAM_HEDGE_WINDOW", 200))        # 분위수 계산에 쓰는 최근 관측 수
+
+
+class LatencyWindow:
+    """최근 window개 응답 시간(초)의 분위수"""
+
+    def __init__(self, window: int):
+        self._samples: Deque[float] = deque(maxlen=max(1, window))
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+
+class HedgeBudget:
+    """일반 요청마다 ratio개씩 쌓이고 헤지 1회에 1개씩 쓰는 토큰 (최대 burst개)"""
+
+    def __init__(self, ratio: float, burst: float):
+        self.ratio = ratio
+        self.burst = max(1.0, burst)
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+
+class Hedger:
+    """
+    엔드포인트(호스트+경로)별 응답 시간을 관측해 percentile 분위수만큼 기다린 뒤에도
+    끝나지 않은 요청을 한 번 더 보냄. 먼저 성공한 응답을 쓰고 나머지는 취소(동기 경로는 버림).
+    - budget: 헤지 요청 총량 제한 (업스트림 호출 한도 보호)
+    - reserve: 헤지 직전에 호출. False면 헤지하지 않음 (요청 제한기의 여유 슬롯 확인용)
+    """
+
+    def __init__(self, enabled: bool = HEDGE_ENABLED, percentile: float = HEDGE_PERCENTILE,
+                 ratio: float = HEDGE_BUDGET_RATIO, burst: float = HEDGE_BUDGET_BURST,
+                 min_samples: int = HEDGE_MIN_SAMPLES, min_delay: float = HEDGE_MIN_DELAY,
+                 window: int = HEDGE_WINDOW):
+        self.enabled = enabled
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.window = window
+        self.budget = HedgeBudget(ratio, burst)
+        self._windows: Dict[str, LatencyWindow] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.budget_denied = 0
+
+    def _window(self, endpoint: str) -> LatencyWindow:
+        window = self._windows.get(endpoint)
+        if window is None:
+            with self._lock:
+                window = self._windows.setdefault(endpoint, LatencyWindow(self.window))
+        return window
+
+    def delay(self, endpoint: str) -> Optional[float]:
+        """헤지 요청을 보낼 대기 시간(초). 꺼져 있거나 관측이 부족하면 None"""
+        if not self.enabled:
+            return None
+        window = self._window(endpoint)
+        if len(window) < self.min_samples:
+            return None
+        return max(self.min_delay, window.percentile(self.percentile) or 0.0)
+
+    def _start(self, endpoint: str) -> Optional[float]:
+        with self._lock:
+            self.requests += 1
+        self.budget.deposit()
+        return self.delay(endpoint)
+
+    def _may_hedge(self, reserve: Optional[Callable[[], bool]]) -> bool:
+        if not self.budget.try_spend():
+            with self._lock:
+                self.budget_denied += 1
+            return False
+        if reserve is not None and not reserve():
+            return False
+        with self._lock:
+            self.hedged += 1
+        return True
+
+    def _won(self, endpoint: str, hedge: bool, started: float, hedge_started: float):
+        """
+        요청당 관측값 하나를 기록. 헤지가 이기면 첫 요청은 헤지 시점까지의 대기 시간(하한값)으로 기록
+        (헤지 요청 시간까지 더하면 분위수가 헤지할 때마다 조금씩 커짐)
+        """
+        self._window(endpoint).add((hedge_started if hedge else time.monotonic()) - started)
+        if hedge:
+            with self._lock:
+                self.hedge_wins += 1
+
+    def run(self, attempt: Callable[[], T], endpoint: str,
+            reserve: Optional[Callable[[], bool]] = None,
+            release: Optional[Callable[[], None]] = None) -> T:
+        """attempt()를 실행 (동기). 헤지가 필요하면 스레드에서 두 번째 attempt()를 실행"""
+        started = time.monotonic()
+        delay = self._start(endpoint)
+        if delay is None:
+            result = attempt()
+            self._window(endpoint).add(time.monotonic() - started)
+            return result
+
+        executor = self._pool()
+        # 워커 스레드에서도 추적 구간·요청 컨텍스트가 이어지도록 호출 측 contextvars를 복사해 실행
+        primary = executor.submit(contextvars.copy_context().run, attempt)
+        try:
+            result = primary.result(timeout=delay)
+        except concurrent.futures.TimeoutError:
+            pass
+        else:
+            self._window(endpoint).add(time.monotonic() - started)
+            return result
+
+        if not self._may_hedge(reserve):
+            result = primary.result()
+            self._window(endpoint).add(time.monotonic() - started)
+            return result
+
+        def hedge_attempt():
+            try:
+                return attempt()
+            finally:
+                if release is not None:
+                    release()
+
+        hedge_started = time.monotonic()
+        futures = {primary: False, executor.submit(contextvars.copy_context().run, hedge_attempt): True}
+        pending = set(futures)
+        first_error: Optional[BaseException] = None
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    self._won(endpoint, futures[future], started, hedge_started)
+                    return future.result()
+                if first_error is None or not futures[future]:
+                    first_error = future.exception()
+        raise first_error
+
+    async def arun(self, attempt: Callable[[], Awaitable[T]], endpoint: str,
+                   reserve: Optional[Callable[[], bool]] = None,
+                   release: Optional[Callable[[], None]] = None) -> T:
+        """run의 비동기 버전. 늦게 끝난 쪽 요청은 취소"""
+        started = time.monotonic()
+        delay = self._start(endpoint)
+        if delay is None:
+            result = await attempt()
+            self._window(endpoint).add(time.monotonic() - started)
+            return result
+
+        primary = asyncio.ensure_future(attempt())
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+        except BaseException:
+            primary.cancel()
+            raise
+        if done or not self._may_hedge(reserve):
+            result = await primary
+            self._window(endpoint).add(time.monotonic() - started)
+            return result
+
+        async def hedge_attempt():
+            try:
+                return await attempt()
+            finally:
+                if release is not None:
+                    release()
+
+        hedge_started = time.monotonic()
+        tasks = {primary: False, asyncio.ensure_future(hedge_attempt()): True}
+        pending = set(tasks)
+        first_error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self._won(endpoint, tasks[task], started, hedge_started)
+                        return task.result()
+                    if first_error is None or not tasks[task]:
+                        first_error = task.exception()
+            raise first_error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _pool(self) -> concurrent.futures.ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=32, thread_name_prefix="upstream-hedge"
+                    )
+        return self._executor
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            windows = dict(self._windows)
+            counts = {
+                "enabled": self.enabled,
+                "requests": self.requests,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+                "budget_denied": self.budget_denied,
+                "budget_tokens": round(self.budget.tokens, 2),
+            }
+        counts["endpoints"] = {
+            endpoint: {
+                "samples": len(window),
+                f"p{self.percentile:g}": window.percentile(self.percentile),
+            }
+            for endpoint, window in windows.items()
+        }
+        return counts
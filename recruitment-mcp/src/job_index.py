@@ -0,0 +1,164 @@
+# job_index.py — 채용공고 근무지역 역색인 (지역 토큰 → 공고 ID, 공고별 지역 수)
+import hashlib
+import heapq
+import json
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+# 지역 관련성 점수에 쓰는 키워드 (앞쪽일수록 관련성이 높음)
+REGION_KEYWORDS: Dict[str, List[str]] = {
+    "51770": ["정선", "강원"],
+    "51750": ["영월", "강원"],
+    "44790": ["청양", "충남", "충청"],
+    "51150": ["강릉", "강원"],
+    "52210": ["김제", "전북", "전라"],
+}
+
+
+def posting_id(job: Dict[str, Any]) -> str:
+    """공고 일련번호 (없으면 내용 해시)"""
+    sn = job.get("recrutPblntSn")
+    if sn not in (None, ""):
+        return str(sn)
+    return "h:" + content_digest(job)
+
+
+def content_digest(job: Dict[str, Any]) -> str:
+    encoded = json.dumps(job, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.sha1(encoded).hexdigest()
+
+
+class JobRegionIndex:
+    """
+    workRgnNmLst("서울,경기,강원")를 적재 시 한 번만 파싱해
+    토큰 → 공고 ID 집합(posting list)과 공고별 지역 수를 보관.
+    지역 관련성 정렬은 키워드에 걸리는 토큰들의 posting list를 합치는 것으로 끝납니다.
+    """
+
+    def __init__(self, max_postings: int = 200_000):
+        self.max_postings = max_postings
+        self._lock = threading.RLock()
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._raw: Dict[str, str] = {}
+        self._region_count: Dict[str, int] = {}
+        self._job_tokens: Dict[str, Set[str]] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        self._keyword_tokens: Dict[str, List[str]] = {}  # 키워드 → 매칭 토큰 (어휘가 바뀌면 초기화)
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    # === 적재 ===
+
+    def add(self, job: Dict[str, Any], pid: Optional[str] = None) -> str:
+        pid = pid or posting_id(job)
+        with self._lock:
+            return self._add(pid, job)
+
+    def _add(self, pid: str, job: Dict[str, Any], evict: bool = True) -> str:
+        raw = job.get("workRgnNmLst") or ""
+        if self._raw.get(pid) == raw and pid in self._jobs:
+            self._jobs[pid] = job
+            return pid
+
+        self._remove(pid)
+        if evict and len(self._jobs) >= self.max_postings:
+            self._clear()
+
+        compact = raw.replace(" ", "")
+        tokens = {token for token in compact.split(",") if token}
+        self._jobs[pid] = job
+        self._raw[pid] = raw
+        self._region_count[pid] = compact.count(",") + 1 if compact else 0
+        self._job_tokens[pid] = tokens
+        for token in tokens:
+            posting = self._postings.get(token)
+            if posting is None:
+                self._postings[token] = posting = set()
+                self._keyword_tokens.clear()
+            posting.add(pid)
+        return pid
+
+    def ingest(self, jobs: Iterable[Dict[str, Any]]) -> List[str]:
+        """
+        공고들을 적재하고 입력 순서대로 ID 목록 반환 (변경 없는 공고는 다시 파싱하지 않음).
+        용량 초과 여부는 배치 전에 한 번만 확인 (배치 도중에 비우면 같은 배치의 앞쪽 공고가 색인에서 사라짐)
+        """
+        jobs = list(jobs)
+        ids = [posting_id(job) for job in jobs]
+        with self._lock:
+            incoming = sum(1 for pid in set(ids) if pid not in self._jobs)
+            if self._jobs and len(self._jobs) + incoming > self.max_postings:
+                self._clear()
+            return [self._add(pid, job, evict=False) for pid, job in zip(ids, jobs)]
+
+    def remove(self, pid: str):
+        with self._lock:
+            self._remove(pid)
+
+    def _remove(self, pid: str):
+        if pid not in self._jobs:
+            return
+        for token in self._job_tokens.pop(pid, ()):
+            posting = self._postings.get(token)
+            if posting is not None:
+                posting.discard(pid)
+                if not posting:
+                    del self._postings[token]
+                    self._keyword_tokens.clear()
+        del self._jobs[pid]
+        self._raw.pop(pid, None)
+        self._region_count.pop(pid, None)
+
+    def clear(self):
+        with self._lock:
+            self._clear()
+
+    def _clear(self):
+        self._jobs.clear()
+        self._raw.clear()
+        self._region_count.clear()
+        self._job_tokens.clear()
+        self._postings.clear()
+        self._keyword_tokens.clear()
+
+    # === 조회 ===
+
+    def region_count(self, pid: str) -> int:
+        return self._region_count.get(pid, 0)
+
+    def _tokens_for(self, keyword: str) -> List[str]:
+        tokens = self._keyword_tokens.get(keyword)
+        if tokens is None:
+            # 어휘(시·도 이름 수십 개)만 훑으면 되므로 공고 수와 무관
+            tokens = [token for token in self._postings if keyword in token]
+            self._keyword_tokens[keyword] = tokens
+        return tokens
+
+    def rank(self, keywords: List[str], candidates: Optional[List[str]] = None, limit: int = 15) -> List[str]:
+        """
+        (관련성 점수, 지역 수, 입력 순서) 오름차순 상위 limit개 공고 ID.
+        관련성 점수 = 근무지역에 처음 걸리는 키워드의 순번 (없으면 999)
+        candidates가 주어지면 그 안에서만, 순서도 그 목록 기준으로 정렬합니다.
+        """
+        with self._lock:
+            if candidates is None:
+                candidates = list(self._jobs)
+            order = {pid: i for i, pid in enumerate(candidates)}
+
+            scores: Dict[str, int] = {}
+            for i, keyword in enumerate(keywords):
+                for token in self._tokens_for(keyword):
+                    for pid in self._postings.get(token, ()):
+                        if pid in order and pid not in scores:
+                            scores[pid] = i
+
+            count = self._region_count
+            ranked = heapq.nsmallest(limit, scores, key=lambda p: (scores[p], count.get(p, 0), order[p]))
+            if len(ranked) < limit:
+                rest = (pid for pid in order if pid not in scores)
+                ranked += heapq.nsmallest(limit - len(ranked), rest, key=lambda p: (count.get(p, 0), order[p]))
+            return ranked
+
+    def get(self, pid: str) -> Optional[Dict[str, Any]]:
+        return self._jobs.get(pid)
@@ -0,0 +1,166 @@
+# keyword_automaton.py — 다중 키워드 Aho-Corasick 오토마톤 (의도 분석 어휘를 한 번에 매칭)
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+
+class KeywordHits:
+    """scan() 결과: 입력에 등장한 키워드들 (그룹별 충돌은 등록 순서 또는 최장 일치로 해소)"""
+
+    __slots__ = ("_automaton", "mask")
+
+    def __init__(self, automaton: "KeywordAutomaton", mask: int):
+        self._automaton = automaton
+        self.mask = mask  # 비트 i = 키워드 i(등록 순서)가 등장
+
+    def __contains__(self, keyword: str) -> bool:
+        """그룹과 무관하게 키워드가 입력에 있었는지 (`keyword in text`와 같은 의미)"""
+        return bool(self.mask & self._automaton._keyword_masks.get(keyword, 0))
+
+    def __bool__(self) -> bool:
+        return bool(self.mask)
+
+    def has(self, group: str) -> bool:
+        return bool(self.mask & self._automaton._group_masks.get(group, 0))
+
+    def first(self, group: str, default: Any = None) -> Any:
+        """그룹에서 먼저 등록된(우선순위가 높은) 매칭 키워드의 값"""
+        mask = self.mask & self._automaton._group_masks.get(group, 0)
+        return self._automaton._values[(mask & -mask).bit_length() - 1] if mask else default
+
+    def longest(self, group: str, default: Any = None) -> Any:
+        """그룹에서 가장 긴 매칭 키워드의 값 (길이가 같으면 먼저 등록된 쪽)"""
+        ids = self._ids(group)
+        if not ids:
+            return default
+        keywords = self._automaton._keywords
+        return self._automaton._values[max(ids, key=lambda term_id: (len(keywords[term_id]), -term_id))]
+
+    def values(self, group: str) -> List[Any]:
+        """그룹의 매칭 키워드 값들 (등록 순서)"""
+        return [self._automaton._values[term_id] for term_id in self._ids(group)]
+
+    def keywords(self, group: Optional[str] = None) -> List[str]:
+        return [self._automaton._keywords[term_id] for term_id in self._ids(group)]
+
+    def _ids(self, group: Optional[str]) -> List[int]:
+        mask = self.mask if group is None else self.mask & self._automaton._group_masks.get(group, 0)
+        ids = []
+        while mask:
+            low = mask & -mask
+            ids.append(low.bit_length() - 1)
+            mask ^= low
+        return ids
+
+
+class KeywordAutomaton:
+    """
+    여러 어휘(그룹)의 키워드를 하나의 Aho-Corasick 오토마톤으로 컴파일.
+    scan()은 입력을 한 글자씩 한 번만 훑어 겹치는 것까지 모든 매칭을 찾으므로
+    비용이 키워드 수와 무관하게 입력 길이에 비례합니다.
+    같은 키워드를 여러 그룹에 등록할 수 있고, 그룹 안의 우선순위는 등록 순서입니다.
+
+    실패 링크를 미리 펼친 전이표로 글자당 dict 조회 한두 번이면 되고,
+    매칭 결과는 키워드 ID 비트마스크라 그룹/키워드 조회가 정수 AND 한 번입니다.
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[int] = [0]  # 노드 → 여기서 끝나는 키워드 마스크 (실패 링크 쪽 접미사 포함)
+        self._delta: List[Dict[str, int]] = [{}]  # 노드 → {글자: 깊이 2 이상인 다음 노드} (나머지는 루트에서 전이)
+        self._keywords: List[str] = []
+        self._groups: List[str] = []
+        self._values: List[Any] = []
+        self._group_masks: Dict[str, int] = {}
+        self._keyword_masks: Dict[str, int] = {}
+        self._built = True
+
+    def __len__(self) -> int:
+        return len(self._keywords)
+
+    # === 등록 ===
+
+    def add(self, keyword: str, group: str, value: Any = None) -> None:
+        """키워드 등록 (value를 생략하면 키워드 자체가 값)"""
+        if not keyword:
+            raise ValueError("빈 키워드는 등록할 수 없습니다")
+        node = 0
+        for ch in keyword:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(0)
+            node = nxt
+        term_id = len(self._keywords)
+        bit = 1 << term_id
+        self._keywords.append(keyword)
+        self._groups.append(group)
+        self._values.append(keyword if value is None else value)
+        self._group_masks[group] = self._group_masks.get(group, 0) | bit
+        self._keyword_masks[keyword] = self._keyword_masks.get(keyword, 0) | bit
+        self._out[node] |= bit
+        self._built = False
+
+    def add_all(self, group: str, keywords: Union[Mapping[str, Any], Iterable[str]]) -> None:
+        """dict면 키워드 → 값, 그 외 iterable이면 키워드 자체가 값 (순서가 곧 우선순위)"""
+        if isinstance(keywords, Mapping):
+            for keyword, value in keywords.items():
+                self.add(keyword, group, value)
+        else:
+            for keyword in keywords:
+                self.add(keyword, group)
+
+    def build(self) -> "KeywordAutomaton":
+        """실패 링크·전이표 계산 (BFS) 및 실패 링크를 따라 도달하는 출력 병합. 등록 후 첫 scan 때 자동 호출"""
+        goto, fail, out = self._goto, self._fail, self._out
+        delta: List[Dict[str, int]] = [{} for _ in goto]
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                queue.append(child)
+                state = fail[node]
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                fail[child] = goto[state].get(ch, 0)
+                # 접미사로 끝나는 키워드도 이 노드에서 출력 (BFS라 실패 노드의 출력은 이미 병합됨)
+                out[child] |= out[fail[child]]
+            # 실패 노드의 전이 위에 자기 자식을 덮어씀 (실패 노드가 더 얕으므로 이미 계산됨)
+            delta[node] = {**delta[fail[node]], **goto[node]}
+        self._delta = delta
+        self._built = True
+        return self
+
+    # === 매칭 ===
+
+    def scan(self, text: str) -> KeywordHits:
+        """입력 전체를 한 번 훑어 등장한 모든 키워드를 수집"""
+        if not self._built:
+            self.build()
+        delta, root, out = self._delta, self._goto[0], self._out
+        mask = 0
+        node = 0
+        for ch in text:
+            # 전이표에 없으면 한 글자짜리 접두사(루트 자식) 또는 루트
+            node = delta[node].get(ch) or root.get(ch, 0)
+            mask |= out[node]
+        return KeywordHits(self, mask)
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, str, str, Any]]:
+        """(시작, 끝, 키워드, 그룹, 값)을 끝 위치 순으로 (겹치는 매칭 포함)"""
+        if not self._built:
+            self.build()
+        delta, root = self._delta, self._goto[0]
+        node = 0
+        for end, ch in enumerate(text, 1):
+            node = delta[node].get(ch) or root.get(ch, 0)
+            mask = self._out[node]
+            while mask:
+                low = mask & -mask
+                term_id = low.bit_length() - 1
+                mask ^= low
+                keyword = self._keywords[term_id]
+                yield end - len(keyword), end, keyword, self._groups[term_id], self._values[term_id]
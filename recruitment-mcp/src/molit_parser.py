@@ -0,0 +1,119 @@
+# molit_parser.py — 국토교통부 실거래가 XML 스트리밍 파서 (XMLPullParser로 <item> 단위 처리, 전체 DOM을 만들지 않음)
+import xml.etree.ElementTree as ET
+from typing import AsyncIterable, AsyncIterator, Dict, Iterable, Iterator, List, NamedTuple, Optional, Union
+
+Chunk = Union[bytes, str]
+
+# 문자열 본문을 나눠 넣을 크기 (한 번에 넣어도 DOM은 만들지 않지만, 이벤트를 조금씩 처리하도록)
+TEXT_CHUNK_SIZE = 64 * 1024
+
+
+class TradeRecord(NamedTuple):
+    """아파트 매매 1건 (가격: 만원, 면적: ㎡)"""
+    apt_nm: str
+    umd_nm: str
+    deal_amount: int
+    exclu_use_ar: float
+    floor: int
+    build_year: int
+    deal_year: int
+    deal_month: int
+    deal_day: int
+    sgg_cd: str
+    jibun: str
+
+
+def _int(value: Optional[str], default: int = 0) -> int:
+    try:
+        return int((value or "").replace(",", "").strip())
+    except ValueError:
+        return default
+
+
+def _float(value: Optional[str]) -> float:
+    try:
+        return float((value or "").replace(",", "").strip())
+    except ValueError:
+        return float("nan")
+
+
+def to_record(item: Dict[str, str]) -> TradeRecord:
+    return TradeRecord(
+        apt_nm=item.get("aptNm", ""),
+        umd_nm=item.get("umdNm", ""),
+        deal_amount=_int(item.get("dealAmount"), -1),
+        exclu_use_ar=_float(item.get("excluUseAr")),
+        floor=_int(item.get("floor")),
+        build_year=_int(item.get("buildYear")),
+        deal_year=_int(item.get("dealYear")),
+        deal_month=_int(item.get("dealMonth")),
+        deal_day=_int(item.get("dealDay")),
+        sgg_cd=item.get("sggCd", ""),
+        jibun=item.get("jibun", ""),
+    )
+
+
+class ItemParser:
+    """
+    청크를 받는 대로 feed하고 끝난 <item>만 {태그: 문자열} dict로 꺼냄.
+    꺼낸 <item>은 부모에서 떼어내므로 메모리에는 처리 중인 항목 하나만 남습니다.
+    """
+
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._parent: Optional[ET.Element] = None
+        self._stack: List[ET.Element] = []
+
+    def feed(self, chunk: Chunk) -> Iterator[Dict[str, str]]:
+        self._parser.feed(chunk)
+        return self._drain()
+
+    def close(self) -> Iterator[Dict[str, str]]:
+        self._parser.close()
+        return self._drain()
+
+    def _drain(self) -> Iterator[Dict[str, str]]:
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                self._stack.append(elem)
+                continue
+            self._stack.pop()
+            if elem.tag != "item":
+                continue
+            yield {child.tag: child.text.strip() if child.text else "" for child in elem}
+            elem.clear()
+            if self._stack:
+                self._stack[-1].remove(elem)
+
+
+def _text_chunks(text: str) -> Iterator[str]:
+    for start in range(0, len(text), TEXT_CHUNK_SIZE):
+        yield text[start:start + TEXT_CHUNK_SIZE]
+
+
+def iter_items(source: Union[str, Iterable[Chunk]]) -> Iterator[Dict[str, str]]:
+    """
+    응답 본문(문자열) 또는 바이트 청크 스트림(resp.iter_bytes())에서 <item>을 하나씩.
+    잘못된 XML이면 ET.ParseError
+    """
+    chunks = _text_chunks(source) if isinstance(source, str) else source
+    parser = ItemParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+def iter_trades(source: Union[str, Iterable[Chunk]]) -> Iterator[TradeRecord]:
+    """iter_items를 타입 변환된 TradeRecord로"""
+    for item in iter_items(source):
+        yield to_record(item)
+
+
+async def aiter_trades(chunks: AsyncIterable[Chunk]) -> AsyncIterator[TradeRecord]:
+    """비동기 바이트 스트림(resp.aiter_bytes())용 iter_trades"""
+    parser = ItemParser()
+    async for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield to_record(item)
+    for item in parser.close():
+        yield to_record(item)
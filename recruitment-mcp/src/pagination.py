@@ -0,0 +1,51 @@
+# pagination.py — 전체 페이지 자동 수집 (1페이지에서 총 건수 확인 → 나머지 페이지를 동시에 요청, 도착 순서대로 반환)
+import asyncio
+import math
+import os
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Optional
+
+# 한 번에 동시에 요청할 페이지 수 (업스트림 부하 제한)
+PAGE_CONCURRENCY = int(os.getenv("UPSTREAM_PAGE_CONCURRENCY") or 4)
+
+
+async def iter_pages(
+    fetch_page: Callable[[int], Awaitable[Dict[str, Any]]],
+    items_of: Callable[[Dict[str, Any]], Iterable[Any]],
+    total_of: Callable[[Dict[str, Any]], int],
+    page_size: int,
+    concurrency: int = PAGE_CONCURRENCY,
+    max_pages: Optional[int] = None,
+) -> AsyncIterator[Any]:
+    """
+    fetch_page(page_no) 결과에서 항목을 하나씩 반환.
+    - items_of: 페이지 결과 → 항목들 (오류 응답이면 예외)
+    - total_of: 1페이지 결과 → 전체 건수
+    - max_pages: 최대 페이지 수 (None이면 전체)
+    2페이지부터는 concurrency개씩 동시에 요청하고, 먼저 끝난 페이지부터 내보냅니다.
+    순회를 중간에 멈추면 남은 요청은 취소됩니다.
+    """
+    first = await fetch_page(1)
+    for item in items_of(first):
+        yield item
+
+    pages = math.ceil(total_of(first) / page_size) if page_size > 0 else 1
+    if max_pages is not None:
+        pages = min(pages, max_pages)
+    if pages <= 1:
+        return
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def fetch(page_no: int) -> Dict[str, Any]:
+        async with semaphore:
+            return await fetch_page(page_no)
+
+    tasks = [asyncio.ensure_future(fetch(page_no)) for page_no in range(2, pages + 1)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            for item in items_of(await next_done):
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,291 @@
+# policy_index.py — 청년정책 색인 (적재 시 한 번만 파싱: zipCd 지역코드 집합/역색인 + 사업·신청 종료일 구간 색인)
+import heapq
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, timedelta
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from .job_index import REGION_KEYWORDS, content_digest
+
+
+def policy_id(policy: Dict[str, Any]) -> str:
+    """정책번호 (없으면 내용 해시)"""
+    no = policy.get("plcyNo")
+    if no not in (None, ""):
+        return str(no)
+    return "h:" + content_digest(policy)
+
+
+def _zip_codes(raw: str) -> FrozenSet[int]:
+    return frozenset(int(code) for code in (part.strip() for part in raw.split(",")) if code.isdigit())
+
+
+def today_ymd() -> int:
+    """오늘 날짜를 YYYYMMDD 정수로"""
+    now = time.localtime()
+    return now.tm_year * 10000 + now.tm_mon * 100 + now.tm_mday
+
+
+def _ymd(value: str) -> Optional[int]:
+    return int(value) if len(value) == 8 and value.isdigit() else None
+
+
+def _end_date(biz_end: str, apply_period: str) -> Optional[int]:
+    """
+    정책이 유효한 마지막 날 (사업 종료일과 신청 마감일 중 이른 날).
+    상시 신청이거나 날짜 정보가 없으면 None
+    """
+    ends = []
+    biz = _ymd(biz_end)
+    if biz is not None:
+        ends.append(biz)
+    if " ~ " in apply_period:
+        dates = apply_period.split(" ~ ")
+        if len(dates) == 2:
+            apply_end = _ymd(dates[1].strip())
+            if apply_end is not None:
+                ends.append(apply_end)
+    else:
+        apply_end = _ymd(apply_period)
+        if apply_end is not None:
+            ends.append(apply_end)
+    return min(ends) if ends else None
+
+
+def _add_days(ymd: int, days: int) -> int:
+    d = date(ymd // 10000, ymd // 100 % 100, ymd % 100) + timedelta(days=days)
+    return d.year * 10000 + d.month * 100 + d.day
+
+
+def _scope(raw: str, region_count: int) -> str:
+    if not raw:
+        return "범위미상"
+    if region_count >= 50:
+        return f"전국 ({region_count}개 지역)"
+    if region_count > 10:
+        return f"광역 ({region_count}개 지역)"
+    if region_count > 1:
+        return f"다지역 ({region_count}개 지역)"
+    return "지역특화"
+
+
+class _Entry:
+    __slots__ = (
+        "policy", "raw_zip", "raw_inst", "raw_biz_end", "raw_apply",
+        "codes", "region_count", "scope", "inst_scores", "end",
+    )
+
+    def __init__(self, policy: Dict[str, Any]):
+        self.policy = policy
+        self.raw_zip = policy.get("zipCd") or ""
+        self.raw_inst = policy.get("sprvsnInstCdNm") or ""
+        self.raw_biz_end = policy.get("bizPrdEndYmd") or ""
+        self.raw_apply = policy.get("aplyYmd") or ""
+        self.end = _end_date(self.raw_biz_end, self.raw_apply)
+        self.codes = _zip_codes(self.raw_zip)
+        self.region_count = self.raw_zip.count(",") + 1
+        self.scope = _scope(self.raw_zip, self.region_count)
+        # 지원 지역별 주관기관 키워드 점수 (처음 걸리는 키워드의 순번)
+        institution = self.raw_inst.replace(" ", "")
+        self.inst_scores: Dict[str, int] = {}
+        for code, keywords in REGION_KEYWORDS.items():
+            for i, keyword in enumerate(keywords):
+                if keyword in institution:
+                    self.inst_scores[code] = i
+                    break
+
+    def same_source(self, policy: Dict[str, Any]) -> bool:
+        return (
+            (policy.get("zipCd") or "") == self.raw_zip
+            and (policy.get("sprvsnInstCdNm") or "") == self.raw_inst
+            and (policy.get("bizPrdEndYmd") or "") == self.raw_biz_end
+            and (policy.get("aplyYmd") or "") == self.raw_apply
+        )
+
+
+class PolicyIndex:
+    """
+    정책 ID → 파싱된 지역 정보(지역코드 집합, 지역 수, 적용범위 분류)와
+    지역코드 → 정책 ID 집합, 지원 지역 → 주관기관 키워드 점수 역색인을 유지.
+    지역 관련성 정렬과 적용범위 표시는 모두 미리 계산된 값을 사용합니다.
+
+    종료일이 있는 정책은 (종료일, 정책 ID) 정렬 목록에 두어 "D일 기준 진행 중"과
+    "N일 안에 마감"을 구간 조회로 처리하고, 날짜가 지나면 목록 앞쪽에서 잘라냅니다.
+    """
+
+    def __init__(self, max_policies: int = 50_000):
+        self.max_policies = max_policies
+        self._lock = threading.RLock()
+        self._entries: Dict[str, _Entry] = {}
+        self._by_region: Dict[int, Set[str]] = {}
+        self._by_institution: Dict[str, Dict[str, int]] = {code: {} for code in REGION_KEYWORDS}
+        self._ends: List[Tuple[int, str]] = []  # 진행 중 정책 (종료일, 정책 ID) 정렬 목록
+        self._open: Set[str] = set()  # 종료일 없는 정책 (상시)
+        self._evicted_through = 0  # 이 날짜 이전에 끝난 정책은 _ends에서 제거됨
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # === 적재 ===
+
+    def add(self, policy: Dict[str, Any], pid: Optional[str] = None) -> str:
+        pid = pid or policy_id(policy)
+        with self._lock:
+            return self._add(pid, policy)
+
+    def _add(self, pid: str, policy: Dict[str, Any], evict: bool = True) -> str:
+        entry = self._entries.get(pid)
+        if entry is not None and entry.same_source(policy):
+            entry.policy = policy
+            return pid
+
+        self._remove(pid)
+        if evict and len(self._entries) >= self.max_policies:
+            self._clear()
+
+        entry = _Entry(policy)
+        self._entries[pid] = entry
+        for code in entry.codes:
+            self._by_region.setdefault(code, set()).add(pid)
+        for code, score in entry.inst_scores.items():
+            self._by_institution[code][pid] = score
+        if entry.end is None:
+            self._open.add(pid)
+        elif entry.end >= self._evicted_through:
+            insort(self._ends, (entry.end, pid))
+        return pid
+
+    def _add_batch(self, policies: List[Dict[str, Any]]) -> List[str]:
+        """
+        한 번에 적재. 용량 초과 여부는 배치 전에 한 번만 확인
+        (배치 도중에 비우면 같은 배치의 앞쪽 정책이 색인에서 사라져 조회가 실패함)
+        """
+        ids = [policy_id(policy) for policy in policies]
+        incoming = sum(1 for pid in set(ids) if pid not in self._entries)
+        if self._entries and len(self._entries) + incoming > self.max_policies:
+            self._clear()
+        return [self._add(pid, policy, evict=False) for pid, policy in zip(ids, policies)]
+
+    def ingest(self, policies: Iterable[Dict[str, Any]]) -> List[str]:
+        """정책들을 적재하고 입력 순서대로 ID 목록 반환 (지역 정보가 그대로인 정책은 다시 파싱하지 않음)"""
+        with self._lock:
+            return self._add_batch(list(policies))
+
+    def remove(self, pid: str):
+        with self._lock:
+            self._remove(pid)
+
+    def _remove(self, pid: str):
+        entry = self._entries.pop(pid, None)
+        if entry is None:
+            return
+        for code in entry.codes:
+            ids = self._by_region.get(code)
+            if ids is not None:
+                ids.discard(pid)
+                if not ids:
+                    del self._by_region[code]
+        for code in entry.inst_scores:
+            self._by_institution[code].pop(pid, None)
+        if entry.end is None:
+            self._open.discard(pid)
+        else:
+            i = bisect_left(self._ends, (entry.end, pid))
+            if i < len(self._ends) and self._ends[i] == (entry.end, pid):
+                del self._ends[i]
+
+    def clear(self):
+        with self._lock:
+            self._clear()
+
+    def _clear(self):
+        self._entries.clear()
+        self._by_region.clear()
+        for scores in self._by_institution.values():
+            scores.clear()
+        self._ends.clear()
+        self._open.clear()
+
+    # === 조회 ===
+
+    def policies_in(self, region_code: str) -> Set[str]:
+        """해당 지역코드가 zipCd에 포함된 정책 ID"""
+        if not str(region_code).isdigit():
+            return set()
+        with self._lock:
+            return set(self._by_region.get(int(region_code), ()))
+
+    def scope_display(self, policy: Dict[str, Any]) -> str:
+        """적용범위 표시 (전국/광역/다지역/지역특화/범위미상)"""
+        with self._lock:
+            return self._entries[self._add(policy_id(policy), policy)].scope
+
+    def _evict_expired(self, today: int):
+        """today 이전에 끝난 정책을 진행 중 목록에서 제거 (날짜가 바뀐 뒤 첫 조회 때 한 번)"""
+        today = min(today, today_ymd())  # 미래 날짜 조회로 아직 진행 중인 정책을 잘라내지 않도록
+        if today <= self._evicted_through:
+            return
+        del self._ends[:bisect_left(self._ends, (today, ""))]
+        self._evicted_through = today
+
+    def filter_active(self, policies: List[Dict[str, Any]], today: Optional[int] = None) -> List[Dict[str, Any]]:
+        """today(YYYYMMDD, 기본 오늘) 기준 사업·신청 기간이 끝나지 않은 정책만 (입력 순서 유지)"""
+        today = today or today_ymd()
+        with self._lock:
+            ids = self._add_batch(policies)
+            self._evict_expired(today)
+            entries = self._entries
+            return [
+                policy for pid, policy in zip(ids, policies)
+                if entries[pid].end is None or entries[pid].end >= today
+            ]
+
+    def active_ids(self, today: Optional[int] = None) -> Set[str]:
+        """today 기준 진행 중인 색인 내 모든 정책 ID (구간 조회)"""
+        today = today or today_ymd()
+        with self._lock:
+            self._evict_expired(today)
+            start = bisect_left(self._ends, (today, ""))
+            return self._open | {pid for _, pid in self._ends[start:]}
+
+    def closing_soon(self, days: int, today: Optional[int] = None) -> List[Tuple[int, str]]:
+        """today부터 days일 안에 끝나는 정책 (종료일, 정책 ID) — 마감이 빠른 순"""
+        today = today or today_ymd()
+        until = _add_days(today, days)
+        with self._lock:
+            self._evict_expired(today)
+            start = bisect_left(self._ends, (today, ""))
+            stop = bisect_right(self._ends, (until, "\uffff"))
+            return self._ends[start:stop]
+
+    def closes_within(self, policy: Dict[str, Any], days: int, today: Optional[int] = None) -> bool:
+        """정책이 today부터 days일 안에 끝나는지"""
+        today = today or today_ymd()
+        with self._lock:
+            end = self._entries[self._add(policy_id(policy), policy)].end
+        return end is not None and today <= end <= _add_days(today, days)
+
+    def rank(self, region_code: str, candidates: List[str], limit: int = 15) -> List[str]:
+        """
+        (관련성 점수, 지역 수, 입력 순서) 오름차순 상위 limit개 정책 ID.
+        관련성 점수 = 주관기관에 처음 걸리는 키워드 순번, 없으면 zipCd에 지역이 포함될 때 키워드 수, 그 외 999
+        """
+        keywords = REGION_KEYWORDS[region_code]
+        with self._lock:
+            order = {pid: i for i, pid in enumerate(candidates)}
+            scores = {pid: score for pid, score in self._by_institution[region_code].items() if pid in order}
+            for pid in self._by_region.get(int(region_code), ()):
+                if pid in order and pid not in scores:
+                    scores[pid] = len(keywords)
+
+            entries = self._entries
+            ranked = heapq.nsmallest(
+                limit, scores, key=lambda p: (scores[p], entries[p].region_count, order[p])
+            )
+            if len(ranked) < limit:
+                rest = (pid for pid in order if pid not in scores)
+                ranked += heapq.nsmallest(
+                    limit - len(ranked), rest, key=lambda p: (entries[p].region_count, order[p])
+                )
+            return ranked
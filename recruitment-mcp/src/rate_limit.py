@@ -0,0 +1,215 @@
+# rate_limit.py — 업스트림·API 키별 요청 제한 (토큰 버킷 + 동시 요청 수 제한 + 일일 호출량 집계)
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from datetime import date
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Tuple
+
+# 동시 요청 슬롯이 빌 때까지 비동기 경로에서 다시 확인하는 간격(초)
+_POLL_INTERVAL = 0.05
+
+
+class RateLimitTimeout(TimeoutError):
+    """대기 기한 안에 요청 슬롯을 얻지 못함"""
+
+
+class QuotaExceeded(RuntimeError):
+    """오늘 호출 한도를 모두 사용함"""
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name) or default)
+    except ValueError:
+        return default
+
+
+def _setting(source: str, name: str, default: float) -> float:
+    """RATE_LIMIT_<SOURCE>_<NAME> → RATE_LIMIT_<NAME> → 기본값"""
+    return _env_float(f"RATE_LIMIT_{source.upper()}_{name}", _env_float(f"RATE_LIMIT_{name}", default))
+
+
+class Governor:
+    """
+    한 업스트림(+API 키)의 요청 제한.
+    - rps/burst: 초당 허용 요청 수와 순간 허용량 (토큰 버킷, 0이면 제한 없음)
+    - max_in_flight: 동시에 보낼 수 있는 요청 수 (0이면 제한 없음)
+    - daily_quota: 하루 호출 한도 (0이면 집계만)
+    한도에 걸리면 실패하지 않고 queue_timeout초까지 줄을 서서 기다립니다.
+    """
+
+    def __init__(self, name: str, rps: float, burst: float, max_in_flight: int, daily_quota: int,
+                 queue_timeout: float = 10.0):
+        self.name = name
+        self.queue_timeout = queue_timeout
+        self.rps = rps
+        self.burst = max(1.0, burst)
+        self.max_in_flight = max_in_flight
+        self.daily_quota = daily_quota
+        self._cond = threading.Condition()
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._day = date.today()
+        self.in_flight = 0
+        self.waiting = 0
+        self.used_today = 0
+        self.granted = 0
+        self.queued = 0
+        self.timeouts = 0
+        self.quota_rejections = 0
+
+    def _try_enter(self) -> float:
+        """슬롯을 얻으면 0, 아니면 다시 시도할 때까지 기다릴 시간(초). 호출 측에서 _cond 보유"""
+        today = date.today()
+        if today != self._day:
+            self._day, self.used_today = today, 0
+        if self.daily_quota and self.used_today >= self.daily_quota:
+            self.quota_rejections += 1
+            raise QuotaExceeded(f"{self.name}: 일일 호출 한도 {self.daily_quota}회를 모두 사용했습니다")
+        if self.max_in_flight and self.in_flight >= self.max_in_flight:
+            return _POLL_INTERVAL  # 동기 경로는 release()의 notify로 더 일찍 깸
+
+        if self.rps > 0:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rps)
+            self._updated = now
+            if self._tokens < 1:
+                return (1 - self._tokens) / self.rps
+            self._tokens -= 1
+
+        self.in_flight += 1
+        self.used_today += 1
+        self.granted += 1
+        return 0.0
+
+    def try_acquire(self) -> bool:
+        """기다리지 않고 슬롯을 얻을 수 있을 때만 획득 (헤지 요청처럼 생략해도 되는 요청용)"""
+        with self._cond:
+            try:
+                return not self._try_enter()
+            except QuotaExceeded:
+                return False
+
+    def acquire(self, timeout: float):
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            wait = self._try_enter()
+            if not wait:
+                return
+            self.queued += 1
+            self.waiting += 1
+            try:
+                while wait:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.timeouts += 1
+                        raise RateLimitTimeout(f"{self.name}: {timeout:g}초 안에 요청 슬롯을 얻지 못했습니다")
+                    self._cond.wait(min(wait, remaining))
+                    wait = self._try_enter()
+            finally:
+                self.waiting -= 1
+
+    async def aacquire(self, timeout: float):
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            wait = self._try_enter()
+            if not wait:
+                return
+            self.queued += 1
+            self.waiting += 1
+        try:
+            while wait:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    with self._cond:
+                        self.timeouts += 1
+                    raise RateLimitTimeout(f"{self.name}: {timeout:g}초 안에 요청 슬롯을 얻지 못했습니다")
+                await asyncio.sleep(min(wait, remaining))
+                with self._cond:
+                    wait = self._try_enter()
+        finally:
+            with self._cond:
+                self.waiting -= 1
+
+    def release(self):
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify()
+
+    @contextmanager
+    def slot(self, timeout: Optional[float] = None) -> Iterator[None]:
+        self.acquire(self.queue_timeout if timeout is None else timeout)
+        try:
+            yield
+        finally:
+            self.release()
+
+    @asynccontextmanager
+    async def aslot(self, timeout: Optional[float] = None) -> AsyncIterator[None]:
+        await self.aacquire(self.queue_timeout if timeout is None else timeout)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def remaining_today(self) -> Optional[int]:
+        if not self.daily_quota:
+            return None
+        with self._cond:
+            used = self.used_today if self._day == date.today() else 0
+        return max(0, self.daily_quota - used)
+
+    def status(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "rps": self.rps,
+                "burst": self.burst,
+                "max_in_flight": self.max_in_flight,
+                "in_flight": self.in_flight,
+                "waiting": self.waiting,
+                "granted": self.granted,
+                "queued": self.queued,
+                "timeouts": self.timeouts,
+                "queue_timeout": self.queue_timeout,
+                "daily_quota": self.daily_quota or None,
+                "used_today": self.used_today if self._day == date.today() else 0,
+                "remaining_today": self.remaining_today(),  # _cond는 RLock이라 다시 잡아도 됨
+                "quota_rejections": self.quota_rejections,
+            }
+
+
+_governors: Dict[Tuple[str, str], Governor] = {}
+_governors_lock = threading.Lock()
+
+
+def get_governor(source: str, api_key: Optional[str] = None) -> Governor:
+    """
+    업스트림(source)과 API 키 조합별 Governor. 설정은 .env에서 읽음:
+    RATE_LIMIT_<SOURCE>_RPS / _BURST / _MAX_IN_FLIGHT / _DAILY_QUOTA / _QUEUE_TIMEOUT
+    (SOURCE 없이 RATE_LIMIT_RPS 등으로 전체 기본값 지정 가능)
+    """
+    key_id = hashlib.sha1(api_key.encode("utf-8")).hexdigest()[:8] if api_key else "-"
+    key = (source, key_id)
+    governor = _governors.get(key)
+    if governor is None:
+        with _governors_lock:
+            governor = _governors.get(key)
+            if governor is None:
+                governor = Governor(
+                    name=f"{source}[{key_id}]",
+                    rps=_setting(source, "RPS", 10),
+                    burst=_setting(source, "BURST", 20),
+                    max_in_flight=int(_setting(source, "MAX_IN_FLIGHT", 8)),
+                    daily_quota=int(_setting(source, "DAILY_QUOTA", 0)),
+                    queue_timeout=_setting(source, "QUEUE_TIMEOUT", 10),
+                )
+                _governors[key] = governor
+    return governor
+
+
+def status() -> Dict[str, Any]:
+    """Governor별 현황 (키는 '업스트림[API 키 해시]')"""
+    return {governor.name: governor.status() for governor in list(_governors.values())}
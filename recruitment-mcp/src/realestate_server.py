@@ -1,12 +1,23 @@
 # realestate_server.py — 부동산 실거래가 MCP 서버
+import json
 import os
-import ssl
-from typing import Any, Dict, Optional, Tuple, Iterable
+import re
+from datetime import date
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
 
-import httpx
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
+try:
+    from . import tracing, upstream
+    from .molit_parser import TradeRecord, iter_trades
+    from .pagination import PAGE_CONCURRENCY, iter_pages
+except ImportError:  # 스크립트로 직접 실행한 경우 (python src/realestate_server.py)
+    import tracing
+    import upstream
+    from molit_parser import TradeRecord, iter_trades
+    from pagination import PAGE_CONCURRENCY, iter_pages
+
 load_dotenv()
 
 mcp = FastMCP("realestate-mcp")
@@ -15,45 +26,119 @@ mcp = FastMCP("realestate-mcp")
 BASE_URL = (os.getenv("MOLIT_BASE_URL") or "https://apis.data.go.kr/1613000/RTMSDataSvcAptTrade").rstrip("/")
 API_KEY = (os.getenv("MOLIT_API_KEY") or "").strip()
 
-def _client_candidates() -> Iterable[Tuple[str, httpx.Client]]:
-    """
-    TLS/SSL 환경에 따라 순차적으로 시도할 httpx.Client 후보들.
-    """
-    # 1) 기본값
-    yield "default", httpx.Client(http2=False, timeout=20, trust_env=True)
+APT_TRADE_ENDPOINT = "getRTMSDataSvcAptTrade"
+OFFICE_TRADE_ENDPOINT = "OpenAPI_ToolInstallPackage/service/rest/RTMSOBJSvc/getRTMSDataSvcOffiTrade"
+HOUSE_TRADE_ENDPOINT = "OpenAPI_ToolInstallPackage/service/rest/RTMSOBJSvc/getRTMSDataSvcSHRent"
+
+
+def _build_request(
+    endpoint: str,
+    lawdcd: str,
+    deal_ymd: str,
+    page_no: int,
+    num_rows: int,
+    filters: Optional[Dict[str, Any]],
+) -> Tuple[str, Dict[str, Any]]:
+    url = f"{BASE_URL}/{endpoint}" if endpoint else BASE_URL
+    params: Dict[str, Any] = {
+        "serviceKey": API_KEY,
+        "pageNo": page_no,
+        "numOfRows": num_rows,
+        "LAWD_CD": lawdcd,
+        "DEAL_YMD": deal_ymd,
+    }
+    if filters:
+        params.update(filters)
+    return url, params
+
 
-    # 2) TLS 1.2 이상 + 낮은 보안 레벨
+@tracing.traced("realestate.decode")
+def _build_result(payload: Dict[str, Any]) -> Dict[str, Any]:
     try:
-        tls = ssl.create_default_context()
-        tls.minimum_version = ssl.TLSVersion.TLSv1_2
-        try:
-            tls.set_ciphers("DEFAULT:@SECLEVEL=1")
-        except Exception:
-            pass
-        yield "tls12_seclevel1", httpx.Client(verify=tls, http2=False, timeout=20, trust_env=True)
+        return {
+            "status": "ok",
+            "ssl_mode": payload["ssl_mode"],
+            "request_url": payload["request_url"],
+            "status_code": payload["status_code"],
+            "cache": payload.get("cache"),
+            "cached_at": payload.get("cached_at"),
+            "degraded": payload.get("degraded"),
+            "data": json.loads(payload["text"]),
+        }
     except Exception:
-        pass
+        return {
+            "status": "ok",
+            "ssl_mode": payload["ssl_mode"],
+            "request_url": payload["request_url"],
+            "status_code": payload["status_code"],
+            "cache": payload.get("cache"),
+            "cached_at": payload.get("cached_at"),
+            "degraded": payload.get("degraded"),
+            "text": payload["text"],
+        }
+
+
+_RESULT_CODE_RE = re.compile(r"<resultCode>\s*(\d+)\s*</resultCode>")
+_TOTAL_COUNT_RE = re.compile(r"<totalCount>\s*(\d+)\s*</totalCount>")
 
-    # 3) 최후 수단: 인증서 검증 비활성화
-    yield "insecure", httpx.Client(verify=False, http2=False, timeout=20, trust_env=True)
 
+def _is_ok_response(text: str) -> bool:
+    """정상 응답(resultCode 00/000)만 캐시에 저장"""
+    match = _RESULT_CODE_RE.search(text[:512])
+    return bool(match) and int(match.group(1)) == 0
 
-def _try_get(url: str, params: Dict[str, Any]):
+
+def _is_settled_month(deal_ymd: str) -> bool:
     """
-    위의 후보 클라이언트들을 순서대로 시도. 성공하면 (mode, response) 반환.
+    더 이상 바뀌지 않는 계약년월인지 판단.
+    실거래 신고기한(계약 후 30일) 때문에 지난 달 자료도 아직 늘어날 수 있어,
+    지지난 달 이전만 불변으로 취급합니다.
     """
-    last_err: Optional[Exception] = None
-    for mode, client in _client_candidates():
-        try:
-            with client as c:
-                resp = c.get(url, params=params)
-                return mode, resp
-        except Exception as e:
-            last_err = e
-            continue
-    if last_err:
-        raise last_err
-    raise RuntimeError("No HTTP client candidates available")
+    if not (deal_ymd and len(deal_ymd) == 6 and deal_ymd.isdigit()):
+        return False
+    today = date.today()
+    year, month = (today.year, today.month - 1) if today.month > 1 else (today.year - 1, 12)
+    return deal_ymd < f"{year:04d}{month:02d}"
+
+
+def _shift_month(deal_ymd: str, months: int) -> str:
+    index = int(deal_ymd[:4]) * 12 + int(deal_ymd[4:6]) - 1 + months
+    return f"{index // 12:04d}{index % 12 + 1:02d}"
+
+
+def is_deal_ymd(value: str) -> bool:
+    """계약년월(YYYYMM, 01~12월) 형식인지"""
+    return bool(value) and len(value) == 6 and value.isdigit() and 1 <= int(value[4:]) <= 12
+
+
+def month_range(from_ymd: str, to_ymd: str) -> List[str]:
+    """from_ymd ~ to_ymd (YYYYMM, 양끝 포함) 계약년월 목록"""
+    months = []
+    current = from_ymd
+    while current <= to_ymd:
+        months.append(current)
+        current = _shift_month(current, 1)
+    return months
+
+
+def recent_months(count: int, end_ymd: Optional[str] = None) -> List[str]:
+    """end_ymd(기본: 이번 달)까지 최근 count개월 (오래된 달부터)"""
+    end_ymd = end_ymd or date.today().strftime("%Y%m")
+    return month_range(_shift_month(end_ymd, 1 - max(1, count)), end_ymd)
+
+
+def months_from(start_ymd: str, count: int) -> List[str]:
+    """start_ymd부터 count개월 (이번 달 이후는 제외)"""
+    end_ymd = min(_shift_month(start_ymd, max(1, count) - 1), date.today().strftime("%Y%m"))
+    return month_range(start_ymd, end_ymd)
+
+
+def _missing_key_error(endpoint: str) -> Dict[str, Any]:
+    return {
+        "status": "error",
+        "message": "MOLIT_API_KEY is missing in .env",
+        "request_url": f"{BASE_URL}/{endpoint}",
+    }
 
 
 def call_molit_api(
@@ -65,44 +150,42 @@ def call_molit_api(
     filters: Optional[Dict[str, Any]] = None,
 ):
     if not API_KEY:
+        return _missing_key_error(endpoint)
+
+    url, params = _build_request(endpoint, lawdcd, deal_ymd, page_no, num_rows, filters)
+    try:
+        payload = upstream.fetch(
+            url, params, source="realestate",
+            immutable=_is_settled_month(deal_ymd), cacheable=_is_ok_response
+        )
+        return _build_result(payload)
+    except Exception as e:
         return {
             "status": "error",
-            "message": "MOLIT_API_KEY is missing in .env",
-            "request_url": f"{BASE_URL}/{endpoint}",
+            "message": str(e),
+            "request_url": url,
         }
 
-    url = f"{BASE_URL}/{endpoint}" if endpoint else BASE_URL
-    params: Dict[str, Any] = {
-        "serviceKey": API_KEY,
-        "pageNo": page_no,
-        "numOfRows": num_rows,
-        "LAWD_CD": lawdcd,
-        "DEAL_YMD": deal_ymd,
-    }
-    if filters:
-        params.update(filters)
 
+async def call_molit_api_async(
+    endpoint: str = "getRTMSDataSvcAptTrade",
+    lawdcd: str = "",
+    deal_ymd: str = "",
+    page_no: int = 1,
+    num_rows: int = 10,
+    filters: Optional[Dict[str, Any]] = None,
+):
+    """call_molit_api의 비동기 버전 (httpx.AsyncClient 사용)"""
+    if not API_KEY:
+        return _missing_key_error(endpoint)
+
+    url, params = _build_request(endpoint, lawdcd, deal_ymd, page_no, num_rows, filters)
     try:
-        mode, resp = _try_get(url, params)
-        req_url = str(resp.request.url)
-        status_code = resp.status_code
-        resp.raise_for_status()
-        try:
-            return {
-                "status": "ok",
-                "ssl_mode": mode,
-                "request_url": req_url,
-                "status_code": status_code,
-                "data": resp.json(),
-            }
-        except Exception:
-            return {
-                "status": "ok",
-                "ssl_mode": mode,
-                "request_url": req_url,
-                "status_code": status_code,
-                "text": resp.text,
-            }
+        payload = await upstream.afetch(
+            url, params, source="realestate",
+            immutable=_is_settled_month(deal_ymd), cacheable=_is_ok_response
+        )
+        return _build_result(payload)
     except Exception as e:
         return {
             "status": "error",
@@ -111,6 +194,42 @@ def call_molit_api(
         }
 
 
+def _page_trades(result: Dict[str, Any]) -> Iterator[TradeRecord]:
+    """페이지 결과 → TradeRecord (오류 응답이면 예외)"""
+    if result.get("status") != "ok" or "text" not in result:
+        raise RuntimeError(result.get("message") or "실거래가 조회 실패")
+    if not _is_ok_response(result["text"]):
+        raise RuntimeError(f"MOLIT API error: {result['text'][:200]}")
+    return iter_trades(result["text"])
+
+
+def _total_count(result: Dict[str, Any]) -> int:
+    match = _TOTAL_COUNT_RE.search(result.get("text", ""))
+    return int(match.group(1)) if match else 0
+
+
+async def iter_apartment_trades(
+    lawdcd: str,
+    deal_ymd: str,
+    page_size: int = 1000,
+    concurrency: int = PAGE_CONCURRENCY,
+    endpoint: str = APT_TRADE_ENDPOINT,
+    filters: Optional[Dict[str, Any]] = None,
+) -> AsyncIterator[TradeRecord]:
+    """
+    한 지역·한 달의 거래 전체를 TradeRecord로 하나씩 반환.
+    페이지는 캐시 경로(call_molit_api_async)로 받아 지난 달 자료는 다시 요청하지 않습니다.
+    """
+    async def fetch_page(page_no: int) -> Dict[str, Any]:
+        return await call_molit_api_async(
+            endpoint=endpoint, lawdcd=lawdcd, deal_ymd=deal_ymd,
+            page_no=page_no, num_rows=page_size, filters=filters
+        )
+
+    async for record in iter_pages(fetch_page, _page_trades, _total_count, page_size, concurrency):
+        yield record
+
+
 @mcp.tool()
 def getApartmentTrades(
     lawdcd: str,
@@ -127,7 +246,7 @@ def getApartmentTrades(
     - filters: 추가 필터 파라미터
     """
     return call_molit_api(
-        endpoint="getRTMSDataSvcAptTrade",
+        endpoint=APT_TRADE_ENDPOINT,
         lawdcd=lawdcd,
         deal_ymd=deal_ymd,
         page_no=pageNo,
@@ -150,7 +269,7 @@ def getOfficeTrades(
     - deal_ymd: 계약년월 YYYYMM
     """
     return call_molit_api(
-        endpoint="OpenAPI_ToolInstallPackage/service/rest/RTMSOBJSvc/getRTMSDataSvcOffiTrade",
+        endpoint=OFFICE_TRADE_ENDPOINT,
         lawdcd=lawdcd,
         deal_ymd=deal_ymd,
         page_no=pageNo,
@@ -173,7 +292,7 @@ def getHouseTrades(
     - deal_ymd: 계약년월 YYYYMM
     """
     return call_molit_api(
-        endpoint="OpenAPI_ToolInstallPackage/service/rest/RTMSOBJSvc/getRTMSDataSvcSHRent",
+        endpoint=HOUSE_TRADE_ENDPOINT,
         lawdcd=lawdcd,
         deal_ymd=deal_ymd,
         page_no=pageNo,
@@ -182,6 +301,34 @@ def getHouseTrades(
     )
 
 
+def _trades_async(endpoint: str):
+    """실거래가 도구(getApartmentTrades 등)의 비동기 버전 생성"""
+    async def tool(
+        lawdcd: str,
+        deal_ymd: str,
+        pageNo: int = 1,
+        numOfRows: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+    ):
+        return await call_molit_api_async(
+            endpoint=endpoint,
+            lawdcd=lawdcd,
+            deal_ymd=deal_ymd,
+            page_no=pageNo,
+            num_rows=numOfRows,
+            filters=filters
+        )
+    return tool
+
+
+# 오케스트레이터가 사용하는 비동기 도구 목록 (도구명 → 코루틴 함수)
+ASYNC_TOOLS = {
+    "getApartmentTrades": _trades_async(APT_TRADE_ENDPOINT),
+    "getOfficeTrades": _trades_async(OFFICE_TRADE_ENDPOINT),
+    "getHouseTrades": _trades_async(HOUSE_TRADE_ENDPOINT),
+}
+
+
 @mcp.tool()
 def ping():
     """헬스체크"""
@@ -0,0 +1,175 @@
+# realestate_store.py — 아파트 실거래 컬럼 저장소 ((법정동코드 5자리, 계약년월)별 NumPy 배열) + 벡터화 가격 분석
+import threading
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .molit_parser import TradeRecord, iter_trades
+
+# 전월 대비 ㎡당 중위가격 변동률(%)이 이 값을 넘으면 상승세/하락세
+TREND_THRESHOLD_PCT = 3.0
+
+
+class TradeColumns:
+    """한 (지역, 월)의 거래를 컬럼별 배열로 보관 (가격: 만원, 면적: ㎡)"""
+
+    __slots__ = ("price", "area", "floor", "build_year", "dong", "dongs")
+
+    def __init__(self, price, area, floor, build_year, dong, dongs: List[str]):
+        self.price = price
+        self.area = area
+        self.floor = floor
+        self.build_year = build_year
+        self.dong = dong  # dongs 목록의 인덱스
+        self.dongs = dongs
+
+    def __len__(self) -> int:
+        return len(self.price)
+
+    @classmethod
+    def from_records(cls, records: Iterable[TradeRecord]) -> "TradeColumns":
+        """molit_parser.TradeRecord 스트림에서 생성. 거래금액이 없는 행은 제외"""
+        rows = [r for r in records if r.deal_amount >= 0]
+        dongs: List[str] = []
+        dong_ids: Dict[str, int] = {}
+        for r in rows:
+            if r.umd_nm not in dong_ids:
+                dong_ids[r.umd_nm] = len(dongs)
+                dongs.append(r.umd_nm)
+        n = len(rows)
+        return cls(
+            price=np.fromiter((r.deal_amount for r in rows), dtype=np.int64, count=n),
+            area=np.fromiter((r.exclu_use_ar for r in rows), dtype=np.float64, count=n),
+            floor=np.fromiter((r.floor for r in rows), dtype=np.int16, count=n),
+            build_year=np.fromiter((r.build_year for r in rows), dtype=np.int16, count=n),
+            dong=np.fromiter((dong_ids[r.umd_nm] for r in rows), dtype=np.int32, count=n),
+            dongs=dongs,
+        )
+
+    def price_per_m2(self):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ppm2 = self.price / self.area
+        return np.where(self.area > 0, ppm2, np.nan)
+
+
+def _grouped_quantiles(values, groups, n_groups: int, qs: Tuple[float, ...]):
+    """
+    그룹별 분위수를 한 번의 정렬로 계산 (선형 보간, np.percentile 기본값과 동일).
+    반환: (len(qs), n_groups) 배열과 그룹별 개수. 빈 그룹은 NaN
+    """
+    keep = ~np.isnan(values)
+    values, groups = values[keep], groups[keep]
+    order = np.lexsort((values, groups))
+    values, groups = values[order], groups[order]
+    bounds = np.searchsorted(groups, np.arange(n_groups + 1))
+    starts, counts = bounds[:-1], np.diff(bounds)
+
+    result = np.full((len(qs), n_groups), np.nan)
+    has = counts > 0
+    if not has.any():
+        return result, counts
+    for row, q in enumerate(qs):
+        pos = starts[has] + q * (counts[has] - 1)
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.ceil(pos).astype(np.int64)
+        result[row, has] = values[lo] + (values[hi] - values[lo]) * (pos - lo)
+    return result, counts
+
+
+def _round(value) -> Optional[float]:
+    return None if value is None or np.isnan(value) else round(float(value), 1)
+
+
+class RealEstateStore:
+    """
+    (LAWD_CD, DEAL_YMD) → TradeColumns. 같은 응답이 다시 들어오면 변환을 건너뜀.
+    최근에 쓴 max_frames개만 유지합니다.
+    """
+
+    def __init__(self, max_frames: int = 1024):
+        self.max_frames = max_frames
+        self._frames: "OrderedDict[Tuple[str, str], Tuple[int, TradeColumns]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put_xml(self, lawd_cd: str, deal_ymd: str, xml_text: str) -> Optional[TradeColumns]:
+        """실거래가 응답 XML을 컬럼으로 변환해 저장 (같은 응답이면 변환 생략, XML 오류면 None)"""
+        key = (str(lawd_cd), str(deal_ymd))
+        token = hash(xml_text)
+        with self._lock:
+            current = self._frames.get(key)
+            if current is not None and current[0] == token:
+                self._frames.move_to_end(key)
+                return current[1]
+        try:
+            columns = TradeColumns.from_records(iter_trades(xml_text))
+        except ET.ParseError:
+            return None
+        with self._lock:
+            self._frames[key] = (token, columns)
+            self._frames.move_to_end(key)
+            while len(self._frames) > self.max_frames:
+                self._frames.popitem(last=False)
+        return columns
+
+    def get(self, lawd_cd: str, deal_ymd: str) -> Optional[TradeColumns]:
+        with self._lock:
+            entry = self._frames.get((str(lawd_cd), str(deal_ymd)))
+        return entry[1] if entry else None
+
+    def analyze(self, lawd_cd: str, months: List[str]) -> Dict[str, Any]:
+        """
+        여러 달의 거래를 한 번에 모아 월별 중위가격·사분위·㎡당 가격과
+        마지막 두 달(거래가 있는 달) 사이의 ㎡당 중위가격 변동으로 추세를 계산.
+        """
+        months = sorted(months)
+        frames = [(i, self.get(lawd_cd, ym)) for i, ym in enumerate(months)]
+        frames = [(i, cols) for i, cols in frames if cols is not None and len(cols)]
+        if not frames:
+            return {"months": [], "sample_count": 0, "trend": "데이터 부족", "change_pct": None}
+
+        group = np.concatenate([np.full(len(cols), i, dtype=np.int64) for i, cols in frames])
+        price = np.concatenate([cols.price for _, cols in frames]).astype(np.float64)
+        ppm2 = np.concatenate([cols.price_per_m2() for _, cols in frames])
+
+        n = len(months)
+        price_q, counts = _grouped_quantiles(price, group, n, (0.25, 0.5, 0.75))
+        ppm2_q, _ = _grouped_quantiles(ppm2, group, n, (0.5,))
+        price_min = np.full(n, np.nan)
+        price_max = np.full(n, np.nan)
+        np.fmin.at(price_min, group, price)
+        np.fmax.at(price_max, group, price)
+
+        series = []
+        for i, ym in enumerate(months):
+            if not counts[i]:
+                continue
+            series.append({
+                "deal_ymd": ym,
+                "sample_count": int(counts[i]),
+                "median_price": _round(price_q[1, i]),
+                "p25_price": _round(price_q[0, i]),
+                "p75_price": _round(price_q[2, i]),
+                "min_price": _round(price_min[i]),
+                "max_price": _round(price_max[i]),
+                "median_price_per_m2": _round(ppm2_q[0, i]),
+            })
+
+        trend, change = "비교 데이터 없음", None
+        valid = [s for s in series if s["median_price_per_m2"]]
+        if len(valid) >= 2:
+            change = round((valid[-1]["median_price_per_m2"] / valid[-2]["median_price_per_m2"] - 1) * 100, 1)
+            if change > TREND_THRESHOLD_PCT:
+                trend = "상승세"
+            elif change < -TREND_THRESHOLD_PCT:
+                trend = "하락세"
+            else:
+                trend = "안정세"
+
+        return {
+            "months": series,
+            "sample_count": int(counts.sum()),
+            "trend": trend,
+            "change_pct": change,
+        }
@@ -0,0 +1,302 @@
+# recruitment_mirror.py — 전국 채용공고 로컬 미러 (전체 목록을 주기적으로 받아 변경분만 반영)
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+try:
+    from . import server
+    from .job_index import JobRegionIndex, content_digest, posting_id
+except ImportError:  # 스크립트로 직접 실행한 경우
+    import server
+    from job_index import JobRegionIndex, content_digest, posting_id
+
+load_dotenv()
+
+MIRROR_PATH = os.getenv("RECRUITMENT_MIRROR_PATH") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "recruitment_mirror.sqlite3"
+)
+MIRROR_PAGE_SIZE = int(os.getenv("RECRUITMENT_MIRROR_PAGE_SIZE") or 100)
+# 동기화 주기(초). 0이면 백그라운드 동기화를 하지 않음
+MIRROR_SYNC_INTERVAL = float(os.getenv("RECRUITMENT_MIRROR_SYNC_INTERVAL") or 3600)
+
+# 로컬에서 바로 적용할 수 있는 필터 (API 파라미터명 = 공고 필드명, 콤마 구분 코드 목록)
+LOCAL_FILTER_FIELDS = ("ncsCdLst", "hireTypeLst", "acbgCondLst", "recrutSe", "workRgnLst")
+
+
+def _codes(value: Any) -> set:
+    return {code.strip() for code in str(value or "").split(",") if code.strip()}
+
+
+class RecruitmentMirror:
+    """
+    listRecruitments 전체 페이지를 SQLite에 공고 ID 기준으로 저장.
+    동기화할 때마다 추가/변경/마감(목록에서 사라진) 공고만 반영합니다.
+    """
+
+    def __init__(self, path: str = MIRROR_PATH, page_size: int = MIRROR_PAGE_SIZE):
+        self.path = path
+        self.page_size = page_size
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._postings: Dict[str, Dict[str, Any]] = {}
+        self.region_index = JobRegionIndex()  # 근무지역 역색인 (동기화 때 변경분만 갱신)
+        self._loaded = False
+        self.last_sync: Optional[float] = None
+        self.last_result: Dict[str, Any] = {}
+        self._worker: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    # === 저장소 ===
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                """CREATE TABLE IF NOT EXISTS postings (
+                       id TEXT PRIMARY KEY,
+                       digest TEXT NOT NULL,
+                       data TEXT NOT NULL,
+                       first_seen REAL NOT NULL,
+                       updated_at REAL NOT NULL
+                   )"""
+            )
+            db.execute("CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT)")
+            self._db = db
+        return self._db
+
+    def _load(self):
+        """프로세스 시작 후 처음 조회 시 디스크에서 적재 (재시작해도 바로 사용 가능)"""
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            db = self._conn()
+            self._postings = {row[0]: json.loads(row[1]) for row in db.execute("SELECT id, data FROM postings")}
+            for pid, job in self._postings.items():
+                self.region_index.add(job, pid)
+            row = db.execute("SELECT value FROM sync_state WHERE key = 'last_sync'").fetchone()
+            self.last_sync = float(row[0]) if row else None
+            self._loaded = True
+
+    # === 동기화 ===
+
+    def _fetch_page(self, page_no: int) -> Dict[str, Any]:
+        return server.call_api(path="list", page_no=page_no, num_rows=self.page_size)
+
+    def sync(self, fetch_page: Optional[Callable[[int], Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        전체 목록을 페이지 단위로 받아 변경분만 반영.
+        중간에 실패하면 받은 페이지까지만 반영하고 삭제(마감) 처리는 하지 않습니다.
+        """
+        self._load()
+        fetch_page = fetch_page or self._fetch_page
+        started = time.time()
+        seen: Dict[str, Dict[str, Any]] = {}
+        complete = False
+        error = None
+
+        page_no = 1
+        total_count = None
+        while True:
+            result = fetch_page(page_no)
+            if result.get("status") != "ok" or "data" not in result:
+                error = result.get("message") or "목록 조회 실패"
+                break
+            data = result["data"]
+            if data.get("resultCode") not in (None, 200):
+                error = data.get("resultMsg") or f"resultCode {data.get('resultCode')}"
+                break
+            rows = data.get("result") or []
+            for job in rows:
+                seen[posting_id(job)] = job
+            if total_count is None:
+                total_count = int(data.get("totalCount") or 0)
+            if not total_count:
+                # 전체 건수를 모르면 끝까지 받았는지 알 수 없으므로 받은 것만 반영 (삭제 안 함)
+                error = "totalCount가 없거나 0인 응답"
+                break
+            if not rows:
+                # 빈 페이지는 마지막 페이지를 지났을 때만 끝으로 봄 (일시적인 빈 응답으로 미러가 비지 않게)
+                if (page_no - 1) * self.page_size >= total_count or len(seen) >= total_count:
+                    complete = True
+                else:
+                    error = f"{page_no}페이지가 비어 있음 (받은 공고 {len(seen)}/{total_count}건)"
+                break
+            if page_no * self.page_size >= total_count:
+                complete = True
+                break
+            page_no += 1
+
+        counts = self._apply(seen, complete, started)
+        self.last_result = {
+            **counts,
+            "pages": page_no,
+            "complete": complete,
+            "error": error,
+            "elapsed": round(time.time() - started, 3),
+        }
+        return self.last_result
+
+    def _apply(self, seen: Dict[str, Dict[str, Any]], complete: bool, started: float) -> Dict[str, int]:
+        added = updated = unchanged = removed = 0
+        changed: List[str] = []
+        gone: List[str] = []
+        with self._lock:
+            db = self._conn()
+            digests = dict(db.execute("SELECT id, digest FROM postings"))
+            postings = dict(self._postings)
+            now = time.time()
+            db.execute("BEGIN")
+            try:
+                for pid, job in seen.items():
+                    digest = content_digest(job)
+                    old = digests.get(pid)
+                    if old == digest:
+                        unchanged += 1
+                        continue
+                    data = json.dumps(job, ensure_ascii=False)
+                    if old is None:
+                        db.execute(
+                            "INSERT INTO postings (id, digest, data, first_seen, updated_at) VALUES (?, ?, ?, ?, ?)",
+                            (pid, digest, data, now, now),
+                        )
+                        added += 1
+                    else:
+                        db.execute(
+                            "UPDATE postings SET digest = ?, data = ?, updated_at = ? WHERE id = ?",
+                            (digest, data, now, pid),
+                        )
+                        updated += 1
+                    postings[pid] = job
+                    changed.append(pid)
+                if complete:
+                    gone = [pid for pid in digests if pid not in seen]
+                    db.executemany("DELETE FROM postings WHERE id = ?", [(pid,) for pid in gone])
+                    for pid in gone:
+                        postings.pop(pid, None)
+                    removed = len(gone)
+                    db.execute(
+                        "INSERT OR REPLACE INTO sync_state (key, value) VALUES ('last_sync', ?)", (str(started),)
+                    )
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+            # 조회 쪽은 참조만 바꿔 끼우므로 잠금 없이 읽어도 안전
+            self._postings = postings
+            for pid in changed:
+                self.region_index.add(postings[pid], pid)
+            for pid in gone:
+                self.region_index.remove(pid)
+            if complete:
+                self.last_sync = started
+        return {"added": added, "updated": updated, "unchanged": unchanged, "removed": removed,
+                "total": len(postings)}
+
+    # === 조회 ===
+
+    def is_ready(self) -> bool:
+        """한 번 이상 전체 동기화가 끝난 상태인지"""
+        self._load()
+        return self.last_sync is not None
+
+    def supports(self, filters: Optional[Dict[str, Any]]) -> bool:
+        return all(key in LOCAL_FILTER_FIELDS for key, value in (filters or {}).items() if value)
+
+    def query(self, filters: Optional[Dict[str, Any]] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        필터에 맞는 진행 중 공고 목록. 미러가 준비되지 않았거나
+        로컬에서 처리할 수 없는 필터가 있으면 None (업스트림 조회로 대체).
+        """
+        if not self.is_ready() or not self.supports(filters):
+            return None
+        wanted = {key: _codes(value) for key, value in (filters or {}).items() if value}
+        today = datetime.now().strftime("%Y%m%d")
+        jobs = []
+        for job in self._postings.values():
+            deadline = job.get("pbancEndYmd") or ""
+            if len(deadline) == 8 and deadline < today:
+                continue
+            if all(codes & _codes(job.get(key)) for key, codes in wanted.items()):
+                jobs.append(job)
+        return jobs
+
+    def status(self) -> Dict[str, Any]:
+        self._load()
+        return {
+            "ready": self.last_sync is not None,
+            "postings": len(self._postings),
+            "last_sync": datetime.fromtimestamp(self.last_sync).isoformat() if self.last_sync else None,
+            "last_result": self.last_result,
+            "sync_interval": MIRROR_SYNC_INTERVAL,
+        }
+
+    # === 백그라운드 동기화 ===
+
+    def start(self, interval: float = MIRROR_SYNC_INTERVAL):
+        """interval초마다 동기화하는 데몬 스레드 시작 (이미 최근에 동기화했으면 그만큼 대기)"""
+        if interval <= 0 or (self._worker and self._worker.is_alive()):
+            return
+        self._stop.clear()
+
+        def loop():
+            self._load()
+            wait = 0.0
+            if self.last_sync is not None:
+                wait = max(0.0, self.last_sync + interval - time.time())
+            while not self._stop.wait(wait):
+                try:
+                    result = self.sync()
+                    print(f"[MIRROR] 채용공고 동기화: {result}", flush=True)
+                except Exception as e:
+                    print(f"[MIRROR] 동기화 오류: {e}", flush=True)
+                wait = interval
+
+        self._worker = threading.Thread(target=loop, name="recruitment-mirror", daemon=True)
+        self._worker.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def close(self):
+        self.stop()
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+_mirror: Optional[RecruitmentMirror] = None
+_mirror_lock = threading.Lock()
+
+
+def get_mirror() -> RecruitmentMirror:
+    """프로세스 전체에서 공유하는 미러 인스턴스"""
+    global _mirror
+    if _mirror is None:
+        with _mirror_lock:
+            if _mirror is None:
+                _mirror = RecruitmentMirror()
+    return _mirror
+
+
+def main():
+    mirror = get_mirror()
+    print("🔄 채용공고 전체 목록 동기화 중...")
+    print(json.dumps(mirror.sync(), ensure_ascii=False, indent=2))
+    print(json.dumps(mirror.status(), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+# response_cache.py — 업스트림 응답 2단 캐시 (메모리 LRU + SQLite 디스크 저장소)
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+
+class CacheEntry:
+    __slots__ = ("value", "stored_at", "expires_at")
+
+    def __init__(self, value: Dict[str, Any], stored_at: float, expires_at: Optional[float]):
+        self.value = value
+        self.stored_at = stored_at
+        self.expires_at = expires_at  # None이면 만료 없음 (불변 데이터)
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return self.expires_at is None or (now or time.time()) < self.expires_at
+
+
+class ResponseCache:
+    """
+    앞단: 프로세스 내 LRU (최근 항목 memory_items개)
+    뒷단: SQLite 파일 (재시작 후에도 유지, max_bytes 초과 시 오래 안 쓴 항목부터 삭제)
+    메모리와 SQLite는 잠금이 따로라, 디스크 I/O 중에도 메모리 조회는 기다리지 않습니다.
+    비동기 경로(aget/set(wait=False))는 디스크 읽기를 스레드에서, 쓰기를 전용 쓰기 스레드에서 처리합니다.
+    """
+
+    def __init__(self, path: str, memory_items: int = 512, max_bytes: int = 200 * 1024 * 1024):
+        self.path = path
+        self.memory_items = memory_items
+        self.max_bytes = max_bytes
+        self._memory: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()  # 메모리 LRU·통계
+        self._db_lock = threading.Lock()  # SQLite
+        self._db: Optional[sqlite3.Connection] = None
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._disk_bytes: Optional[int] = None  # 디스크 사용량 (처음 한 번만 SUM으로 계산)
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # === SQLite ===
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                """CREATE TABLE IF NOT EXISTS entries (
+                       key TEXT PRIMARY KEY,
+                       source TEXT,
+                       value TEXT NOT NULL,
+                       size INTEGER NOT NULL,
+                       stored_at REAL NOT NULL,
+                       expires_at REAL,
+                       accessed_at REAL NOT NULL
+                   )"""
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed_at)")
+            self._db = db
+        return self._db
+
+    def _disk_usage(self, db: sqlite3.Connection) -> int:
+        if self._disk_bytes is None:
+            self._disk_bytes = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        return self._disk_bytes
+
+    def _evict_disk(self, db: sqlite3.Connection):
+        total = self._disk_usage(db)
+        if total <= self.max_bytes:
+            return
+        # 만료된 항목부터, 그 다음은 오래 안 쓴 순서로 정리 (목표: 상한의 90%)
+        target = int(self.max_bytes * 0.9)
+        rows = db.execute(
+            "SELECT key, size FROM entries "
+            "ORDER BY (expires_at IS NOT NULL AND expires_at < ?) DESC, accessed_at ASC",
+            (time.time(),),
+        ).fetchall()
+        doomed = []
+        for key, size in rows:
+            if total <= target:
+                break
+            doomed.append((key,))
+            total -= size
+        db.executemany("DELETE FROM entries WHERE key = ?", doomed)
+        self._disk_bytes = total
+        with self._lock:
+            self.evictions += len(doomed)
+
+    # === 메모리 LRU ===
+
+    def _remember(self, key: str, entry: CacheEntry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    # === 공개 API ===
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """만료 여부와 관계없이 저장된 항목 반환 (신선도 판단은 호출 측)"""
+        entry = self.get_memory(key)
+        if entry is not None:
+            return entry
+        return self.load_disk(key)
+
+    async def aget(self, key: str) -> Optional[CacheEntry]:
+        """get의 비동기 버전. 메모리에 없을 때만 디스크 조회를 스레드에서 실행 (이벤트 루프를 막지 않음)"""
+        entry = self.get_memory(key)
+        if entry is not None:
+            return entry
+        return await asyncio.to_thread(self.load_disk, key)
+
+    def get_memory(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.hits_memory += 1
+            return entry
+
+    def load_disk(self, key: str) -> Optional[CacheEntry]:
+        """디스크에서 읽어 메모리에 올림 (블로킹 I/O)"""
+        with self._db_lock:
+            try:
+                db = self._conn()
+                row = db.execute(
+                    "SELECT value, stored_at, expires_at FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    db.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            except sqlite3.Error:
+                row = None
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            entry = CacheEntry(json.loads(row[0]), row[1], row[2])
+            self._remember(key, entry)
+            self.hits_disk += 1
+            return entry
+
+    def set(self, key: str, value: Dict[str, Any], ttl: Optional[float], source: str = "", wait: bool = True):
+        """
+        ttl=None이면 만료 없이 저장.
+        wait=False면 메모리에만 바로 넣고 디스크 저장은 쓰기 스레드에 맡김 (비동기 경로용)
+        """
+        now = time.time()
+        entry = CacheEntry(value, now, None if ttl is None else now + ttl)
+        with self._lock:
+            self._remember(key, entry)
+        if wait:
+            self._store_disk(key, entry, source)
+            return
+        with self._db_lock:
+            if self._writer is None:
+                self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="response-cache-writer")
+            writer = self._writer
+        writer.submit(self._store_disk, key, entry, source)
+
+    def _store_disk(self, key: str, entry: CacheEntry, source: str):
+        encoded = json.dumps(entry.value, ensure_ascii=False)
+        with self._db_lock:
+            try:
+                db = self._conn()
+                size = len(encoded.encode("utf-8"))
+                old = db.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+                self._disk_bytes = self._disk_usage(db) + size - (old[0] if old else 0)
+                db.execute(
+                    "INSERT OR REPLACE INTO entries (key, source, value, size, stored_at, expires_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, source, encoded, size, entry.stored_at, entry.expires_at, entry.stored_at),
+                )
+                self._evict_disk(db)
+            except sqlite3.Error:
+                pass
+
+    def purge_expired(self, older_than: float = 0.0) -> int:
+        """만료 후 older_than초 이상 지난 항목 삭제"""
+        cutoff = time.time() - older_than
+        with self._lock:
+            for key in [k for k, e in self._memory.items() if e.expires_at is not None and e.expires_at < cutoff]:
+                del self._memory[key]
+        with self._db_lock:
+            try:
+                cur = self._conn().execute(
+                    "DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at < ?", (cutoff,)
+                )
+                self._disk_bytes = None
+                return cur.rowcount
+            except sqlite3.Error:
+                return 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._db_lock:
+            try:
+                count, size = self._conn().execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+                ).fetchone()
+            except sqlite3.Error:
+                count, size = 0, 0
+        with self._lock:
+            return {
+                "path": self.path,
+                "memory_items": len(self._memory),
+                "disk_items": count,
+                "disk_bytes": size,
+                "hits_memory": self.hits_memory,
+                "hits_disk": self.hits_disk,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def close(self):
+        with self._db_lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.shutdown(wait=True)  # 대기 중인 디스크 쓰기를 마친 뒤 닫음
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+def cache_key(key: Tuple[str, Tuple[Tuple[str, str], ...]]) -> str:
+    """singleflight.request_key 결과를 저장용 문자열로 변환"""
+    return json.dumps(key, ensure_ascii=False, separators=(",", ":"))
@@ -1,12 +1,19 @@
 # server.py — MCP 서버 (자동 TLS 폴백: default → TLS1.2+SECLEVEL1 → verify=False)
+import json
 import os
-import ssl
-from typing import Any, Dict, Optional, Tuple, Iterable
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
 
-import httpx
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
+try:
+    from . import tracing, upstream
+    from .pagination import PAGE_CONCURRENCY, iter_pages
+except ImportError:  # 스크립트로 직접 실행한 경우 (python src/server.py)
+    import tracing
+    import upstream
+    from pagination import PAGE_CONCURRENCY, iter_pages
+
 load_dotenv()
 
 mcp = FastMCP("recruitment-mcp")
@@ -14,50 +21,64 @@ mcp = FastMCP("recruitment-mcp")
 BASE_URL = (os.getenv("BASE_URL") or "https://apis.data.go.kr/1051000/recruitment").rstrip("/")
 API_KEY = (os.getenv("DATA_GO_KR_KEY") or "").strip()
 
-def _client_candidates() -> Iterable[Tuple[str, httpx.Client]]:
-    """
-    TLS/SSL 환경에 따라 순차적으로 시도할 httpx.Client 후보들.
-    각 후보는 (모드이름, Client) 형태로 yield됩니다.
-    """
-    # 1) 기본값: TLS 자동 협상 + 시스템 프록시/환경 변수 신뢰
-    yield "default", httpx.Client(http2=False, timeout=20, trust_env=True)
+def _build_request(
+    path: str,
+    page_no: int,
+    num_rows: int,
+    filters: Optional[Dict[str, Any]],
+) -> Tuple[str, Dict[str, Any]]:
+    url = f"{BASE_URL}/{path.lstrip('/')}"
+    params: Dict[str, Any] = {
+        "serviceKey": API_KEY,  # 반드시 'Decoding(원문)' 키 사용 (% 없는 원문키)
+        "type": "json",
+        "pageNo": page_no,
+        "numOfRows": num_rows,
+    }
+    if filters:
+        params.update(filters)
+    return url, params
 
-    # 2) TLS 1.2 이상 + 낮은 보안 레벨(일부 구형 서버/프록시 대응)
+
+@tracing.traced("recruitment.decode")
+def _build_result(payload: Dict[str, Any]) -> Dict[str, Any]:
     try:
-        tls = ssl.create_default_context()
-        tls.minimum_version = ssl.TLSVersion.TLSv1_2
-        # 일부 공공/기관망 장비가 오래된 cipher만 허용 → OpenSSL3 기본 보안레벨과 충돌
-        try:
-            tls.set_ciphers("DEFAULT:@SECLEVEL=1")
-        except Exception:
-            pass
-        yield "tls12_seclevel1", httpx.Client(verify=tls, http2=False, timeout=20, trust_env=True)
+        return {
+            "status": "ok",
+            "ssl_mode": payload["ssl_mode"],
+            "request_url": payload["request_url"],
+            "status_code": payload["status_code"],
+            "cache": payload.get("cache"),
+            "cached_at": payload.get("cached_at"),
+            "degraded": payload.get("degraded"),
+            "data": json.loads(payload["text"]),
+        }
     except Exception:
-        pass
+        return {
+            "status": "ok",
+            "ssl_mode": payload["ssl_mode"],
+            "request_url": payload["request_url"],
+            "status_code": payload["status_code"],
+            "cache": payload.get("cache"),
+            "cached_at": payload.get("cached_at"),
+            "degraded": payload.get("degraded"),
+            "text": payload["text"],
+        }
 
-    # 3) 최후 수단: 인증서 검증 비활성화 (가능하면 피하고, 네트워크 진단용으로만 사용)
-    #    성공 시에도 ssl_mode로 'insecure'가 내려갑니다.
-    yield "insecure", httpx.Client(verify=False, http2=False, timeout=20, trust_env=True)
 
+def _is_ok_response(text: str) -> bool:
+    """정상 응답(resultCode 200)만 캐시에 저장"""
+    try:
+        return json.loads(text).get("resultCode") == 200
+    except Exception:
+        return False
 
-def _try_get(url: str, params: Dict[str, Any]):
-    """
-    위의 후보 클라이언트들을 순서대로 시도. 성공하면 (mode, response) 반환.
-    전부 실패하면 마지막 예외를 다시 던짐.
-    """
-    last_err: Optional[Exception] = None
-    for mode, client in _client_candidates():
-        try:
-            with client as c:
-                resp = c.get(url, params=params)
-                return mode, resp
-        except Exception as e:
-            last_err = e
-            continue
-    # 전부 실패
-    if last_err:
-        raise last_err
-    raise RuntimeError("No HTTP client candidates available")
+
+def _missing_key_error(path: str) -> Dict[str, Any]:
+    return {
+        "status": "error",
+        "message": "DATA_GO_KR_KEY is missing in .env",
+        "request_url": f"{BASE_URL}/{path.lstrip('/')}",
+    }
 
 
 def call_api(
@@ -65,45 +86,44 @@ def call_api(
     page_no: int = 1,
     num_rows: int = 10,
     filters: Optional[Dict[str, Any]] = None,
+    stale_while_revalidate: bool = False,
 ):
     if not API_KEY:
+        return _missing_key_error(path)
+
+    url, params = _build_request(path, page_no, num_rows, filters)
+    try:
+        payload = upstream.fetch(
+            url, params, source="recruitment", cacheable=_is_ok_response,
+            stale_while_revalidate=stale_while_revalidate
+        )
+        return _build_result(payload)
+    except Exception as e:
         return {
             "status": "error",
-            "message": "DATA_GO_KR_KEY is missing in .env",
-            "request_url": f"{BASE_URL}/{path.lstrip('/')}",
+            "message": str(e),
+            "request_url": url,
         }
 
-    url = f"{BASE_URL}/{path.lstrip('/')}"
-    params: Dict[str, Any] = {
-        "serviceKey": API_KEY,  # 반드시 'Decoding(원문)' 키 사용 (% 없는 원문키)
-        "type": "json",
-        "pageNo": page_no,
-        "numOfRows": num_rows,
-    }
-    if filters:
-        params.update(filters)
 
+async def call_api_async(
+    path: str,
+    page_no: int = 1,
+    num_rows: int = 10,
+    filters: Optional[Dict[str, Any]] = None,
+    stale_while_revalidate: bool = False,
+):
+    """call_api의 비동기 버전 (httpx.AsyncClient 사용, 이벤트 루프를 막지 않음)"""
+    if not API_KEY:
+        return _missing_key_error(path)
+
+    url, params = _build_request(path, page_no, num_rows, filters)
     try:
-        mode, resp = _try_get(url, params)
-        req_url = str(resp.request.url)
-        status_code = resp.status_code
-        resp.raise_for_status()
-        try:
-            return {
-                "status": "ok",
-                "ssl_mode": mode,
-                "request_url": req_url,
-                "status_code": status_code,
-                "data": resp.json(),
-            }
-        except Exception:
-            return {
-                "status": "ok",
-                "ssl_mode": mode,
-                "request_url": req_url,
-                "status_code": status_code,
-                "text": resp.text,
-            }
+        payload = await upstream.afetch(
+            url, params, source="recruitment", cacheable=_is_ok_response,
+            stale_while_revalidate=stale_while_revalidate
+        )
+        return _build_result(payload)
     except Exception as e:
         return {
             "status": "error",
@@ -125,7 +145,9 @@ def listRecruitments(
     - pageNo, numOfRows: 페이지/행 수
     - filters: {"hireTypeLst":"R1050,R1060,R1070", ...} 등 추가 파라미터
     """
-    return call_api(path=path, page_no=pageNo, num_rows=numOfRows, filters=filters)
+    # 목록은 만료 캐시를 먼저 내주고 백그라운드에서 갱신 (stale-while-revalidate)
+    return call_api(path=path, page_no=pageNo, num_rows=numOfRows, filters=filters,
+                    stale_while_revalidate=True)
 
 
 @mcp.tool()
@@ -139,6 +161,61 @@ def getRecruitmentDetail(path: str, **params):
     return call_api(path=path, page_no=page_no, num_rows=num_rows, filters=params)
 
 
+async def list_recruitments_async(
+    path: str = "list",
+    pageNo: int = 1,
+    numOfRows: int = 10,
+    filters: Optional[Dict[str, Any]] = None,
+):
+    """listRecruitments의 비동기 버전"""
+    return await call_api_async(path=path, page_no=pageNo, num_rows=numOfRows, filters=filters,
+                                stale_while_revalidate=True)
+
+
+async def get_recruitment_detail_async(path: str, **params):
+    """getRecruitmentDetail의 비동기 버전"""
+    page_no = int(params.pop("pageNo", 1)) if "pageNo" in params else 1
+    num_rows = int(params.pop("numOfRows", 10)) if "numOfRows" in params else 10
+    return await call_api_async(path=path, page_no=page_no, num_rows=num_rows, filters=params)
+
+
+def _page_rows(result: Dict[str, Any]):
+    """페이지 결과 → 공고 목록 (오류 응답이면 예외)"""
+    if result.get("status") != "ok" or "data" not in result:
+        raise RuntimeError(result.get("message") or "채용공고 목록 조회 실패")
+    data = result["data"]
+    if data.get("resultCode") not in (None, 200):
+        raise RuntimeError(data.get("resultMsg") or f"resultCode {data.get('resultCode')}")
+    return data.get("result") or []
+
+
+async def iter_recruitments(
+    filters: Optional[Dict[str, Any]] = None,
+    page_size: int = 100,
+    concurrency: int = PAGE_CONCURRENCY,
+    max_pages: Optional[int] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    조건에 맞는 채용공고 전체를 하나씩 반환 (1페이지의 totalCount로 나머지 페이지를 동시에 요청).
+    페이지 순서가 아닌 도착 순서로 나옵니다.
+    """
+    async def fetch_page(page_no: int) -> Dict[str, Any]:
+        return await call_api_async(path="list", page_no=page_no, num_rows=page_size, filters=filters)
+
+    async for job in iter_pages(
+        fetch_page, _page_rows, lambda first: int(first["data"].get("totalCount") or 0),
+        page_size, concurrency, max_pages
+    ):
+        yield job
+
+
+# 오케스트레이터가 사용하는 비동기 도구 목록 (도구명 → 코루틴 함수)
+ASYNC_TOOLS = {
+    "listRecruitments": list_recruitments_async,
+    "getRecruitmentDetail": get_recruitment_detail_async,
+}
+
+
 @mcp.tool()
 def ping():
     """헬스체크"""
@@ -0,0 +1,93 @@
+# singleflight.py — 동일 업스트림 요청 합치기 (진행 중인 요청이 있으면 그 결과를 함께 기다림)
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+# 요청 키에서 제외할 인증 파라미터 (키가 달라도 같은 요청으로 취급)
+SECRET_PARAMS = ("serviceKey", "apiKeyNm")
+
+
+def request_key(url: str, params: Optional[Dict[str, Any]]) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+    """(엔드포인트, 인증키를 뺀 정렬된 파라미터) 형태의 정규화된 키"""
+    items = tuple(sorted(
+        (str(k), str(v))
+        for k, v in (params or {}).items()
+        if k not in SECRET_PARAMS and v is not None
+    ))
+    return url, items
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """스레드용: 같은 키로 동시에 들어온 호출은 첫 호출(leader)의 결과를 공유"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.leaders += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """asyncio용: 같은 키의 코루틴은 하나의 Task만 실행하고 나머지는 그 Task를 기다림"""
+
+    def __init__(self):
+        self._tasks: Dict[Tuple[int, Hashable], asyncio.Task] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        loop_key = (id(asyncio.get_running_loop()), key)
+        task = self._tasks.get(loop_key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.leaders += 1
+            task = asyncio.ensure_future(fn())
+            self._tasks[loop_key] = task
+            task.add_done_callback(lambda _t: self._tasks.pop(loop_key, None))
+        # 한 호출자가 취소되어도 공유 Task는 계속 진행되도록 shield
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        return len(self._tasks)
@@ -0,0 +1,300 @@
+# tracing.py — 요청 단위 구간(span) 추적 (contextvars 기반, OpenTelemetry OTLP/JSON 형식으로 파일·수집기 내보내기)
+import contextvars
+import functools
+import inspect
+import json
+import os
+import queue
+import random
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import httpx
+
+# 내보내기 설정 (.env). 둘 다 없으면 디버그 헤더가 있는 요청만 추적
+TRACE_EXPORT_FILE = os.getenv("TRACE_EXPORT_FILE") or ""          # 추적 1건당 OTLP/JSON 한 줄
+TRACE_EXPORT_OTLP_URL = os.getenv("TRACE_EXPORT_OTLP_URL") or ""  # 예: http://localhost:4318/v1/traces
+try:
+    TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE") or 1.0)
+except ValueError:
+    TRACE_SAMPLE_RATE = 1.0
+SERVICE_NAME = os.getenv("TRACE_SERVICE_NAME") or "ieum-api"
+
+# OTLP span kind
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+KIND_CLIENT = 3
+
+
+class Span:
+    __slots__ = ("trace", "name", "kind", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, trace: "Trace", name: str, parent_id: str, kind: int, attributes: Dict[str, Any]):
+        self.trace = trace
+        self.name = name
+        self.kind = kind
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes = attributes
+        self.error = ""
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException):
+        self.error = f"{type(error).__name__}: {error}"
+
+    def end(self):
+        if not self.end_ns:
+            self.end_ns = time.time_ns()
+            self.trace._add(self)
+
+
+class _NoopSpan:
+    """추적 중이 아닐 때 반환되는 span (모든 동작 무시)"""
+    __slots__ = ()
+    name = ""
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def record_error(self, error: BaseException):
+        pass
+
+    def end(self):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    """한 요청의 span 모음. finish() 뒤에 끝난 span(백그라운드 작업 등)은 버림"""
+
+    def __init__(self):
+        self.trace_id = secrets.token_hex(16)
+        self.spans: List[Span] = []
+        self.finished = False
+        self._lock = threading.Lock()
+
+    def _add(self, span: Span):
+        with self._lock:
+            if not self.finished:
+                self.spans.append(span)
+
+    def finish(self):
+        with self._lock:
+            self.finished = True
+
+    def breakdown(self) -> Dict[str, Any]:
+        """디버그 응답용 구간별 시간 (시작 순, 루트 기준 ms)"""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.start_ns)
+        if not spans:
+            return {"trace_id": self.trace_id, "total_ms": 0, "spans": []}
+        origin = spans[0].start_ns
+        names = {span.span_id: span.name for span in spans}
+        return {
+            "trace_id": self.trace_id,
+            "total_ms": round((max(s.end_ns for s in spans) - origin) / 1e6, 2),
+            "spans": [
+                {
+                    "name": span.name,
+                    "parent": names.get(span.parent_id),
+                    "start_ms": round((span.start_ns - origin) / 1e6, 2),
+                    "duration_ms": round((span.end_ns - span.start_ns) / 1e6, 2),
+                    **({"attributes": span.attributes} if span.attributes else {}),
+                    **({"error": span.error} if span.error else {}),
+                }
+                for span in spans
+            ],
+        }
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """OTLP/JSON (ExportTraceServiceRequest) 형식"""
+        with self._lock:
+            spans = list(self.spans)
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [_attribute("service.name", SERVICE_NAME)]},
+                "scopeSpans": [{
+                    "scope": {"name": "ieum.tracing"},
+                    "spans": [
+                        {
+                            "traceId": self.trace_id,
+                            "spanId": span.span_id,
+                            **({"parentSpanId": span.parent_id} if span.parent_id else {}),
+                            "name": span.name,
+                            "kind": span.kind,
+                            "startTimeUnixNano": str(span.start_ns),
+                            "endTimeUnixNano": str(span.end_ns),
+                            "attributes": [_attribute(k, v) for k, v in span.attributes.items()],
+                            "status": {"code": 2, "message": span.error} if span.error else {},
+                        }
+                        for span in spans
+                    ],
+                }],
+            }]
+        }
+
+
+def _attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+_current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+
+
+def current_span():
+    return _current.get() or NOOP_SPAN
+
+
+def exporting() -> bool:
+    return bool(TRACE_EXPORT_FILE or TRACE_EXPORT_OTLP_URL)
+
+
+def should_trace(debug: bool = False) -> bool:
+    """디버그 요청이거나, 내보내기가 설정되어 있고 표본에 뽑힌 경우"""
+    return debug or (exporting() and random.random() < TRACE_SAMPLE_RATE)
+
+
+def start_span(name: str, kind: int = KIND_INTERNAL, **attributes):
+    """현재 span의 자식 span을 시작 (현재 span으로 바꾸지는 않음, 끝낼 때 end())"""
+    parent = _current.get()
+    if parent is None:
+        return NOOP_SPAN
+    return Span(parent.trace, name, parent.span_id, kind, attributes)
+
+
+@contextmanager
+def span(name: str, kind: int = KIND_INTERNAL, **attributes) -> Iterator[Any]:
+    """블록 구간을 현재 span의 자식으로 기록. 추적 중이 아니면 아무것도 하지 않음"""
+    parent = _current.get()
+    if parent is None:
+        yield NOOP_SPAN
+        return
+    child = Span(parent.trace, name, parent.span_id, kind, attributes)
+    token = _current.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.record_error(e)
+        raise
+    finally:
+        _current.reset(token)
+        child.end()
+
+
+@contextmanager
+def trace(name: str, kind: int = KIND_SERVER, **attributes) -> Iterator[Span]:
+    """새 추적의 루트 span. 블록이 끝나면 추적을 닫고 내보내기가 설정되어 있으면 전송"""
+    root = Span(Trace(), name, "", kind, attributes)
+    token = _current.set(root)
+    try:
+        yield root
+    except BaseException as e:
+        root.record_error(e)
+        raise
+    finally:
+        _current.reset(token)
+        root.end()
+        root.trace.finish()
+        if exporting():
+            _exporter().submit(root.trace)
+
+
+def traced(name: Optional[str] = None, kind: int = KIND_INTERNAL):
+    """함수 호출 구간을 span으로 기록하는 데코레이터 (동기/async 함수 모두)"""
+
+    def decorate(fn: Callable) -> Callable:
+        span_name = name or fn.__qualname__
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                if _current.get() is None:
+                    return await fn(*args, **kwargs)
+                with span(span_name, kind):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _current.get() is None:
+                return fn(*args, **kwargs)
+            with span(span_name, kind):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorate
+
+
+def server_timing(breakdown: Dict[str, Any], limit: int = 20) -> str:
+    """Server-Timing 헤더 값 (브라우저 개발자 도구 표시용, 오래 걸린 순 limit개)"""
+    spans = sorted(breakdown["spans"], key=lambda s: -s["duration_ms"])[:limit]
+    entries = []
+    for i, item in enumerate(spans):
+        token = "".join(c if c.isalnum() or c in "-_." else "_" for c in item["name"]) or "span"
+        entries.append(f'{token}-{i};dur={item["duration_ms"]};desc="{item["name"]}"')
+    return ", ".join(entries)
+
+
+class _Exporter:
+    """백그라운드 스레드에서 파일에 한 줄씩 쓰거나 OTLP/HTTP 수집기로 전송 (요청 경로를 막지 않음)"""
+
+    def __init__(self, path: str, url: str):
+        self.path = path
+        self.url = url
+        self.exported = 0
+        self.dropped = 0
+        self._queue: "queue.Queue[Trace]" = queue.Queue(maxsize=1000)
+        threading.Thread(target=self._run, name="trace-exporter", daemon=True).start()
+
+    def submit(self, trace_obj: Trace):
+        try:
+            self._queue.put_nowait(trace_obj)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        client = httpx.Client(timeout=5) if self.url else None
+        while True:
+            payload = self._queue.get().to_otlp()
+            try:
+                if self.path:
+                    directory = os.path.dirname(self.path)
+                    if directory:
+                        os.makedirs(directory, exist_ok=True)
+                    with open(self.path, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(payload, ensure_ascii=False) + "\n")
+                if client is not None:
+                    client.post(self.url, json=payload)
+                self.exported += 1
+            except Exception:
+                self.dropped += 1
+
+
+_exporter_instance: Optional[_Exporter] = None
+_exporter_lock = threading.Lock()
+
+
+def _exporter() -> _Exporter:
+    global _exporter_instance
+    if _exporter_instance is None:
+        with _exporter_lock:
+            if _exporter_instance is None:
+                _exporter_instance = _Exporter(TRACE_EXPORT_FILE, TRACE_EXPORT_OTLP_URL)
+    return _exporter_instance
@@ -0,0 +1,747 @@
+# upstream.py — 공공 API 공용 HTTP 계층 (호스트별 keep-alive 커넥션 풀 + 자동 TLS 폴백)
+import asyncio
+import atexit
+import os
+import ssl
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+from dotenv import load_dotenv
+
+try:
+    from . import cassette, circuit_breaker, metrics, rate_limit, tracing
+    from .hedging import Hedger
+    from .response_cache import ResponseCache, cache_key
+    from .singleflight import SECRET_PARAMS, AsyncSingleFlight, SingleFlight, request_key
+except ImportError:  # 스크립트로 직접 실행한 경우
+    import cassette
+    import circuit_breaker
+    import metrics
+    import rate_limit
+    import tracing
+    from hedging import Hedger
+    from response_cache import ResponseCache, cache_key
+    from singleflight import SECRET_PARAMS, AsyncSingleFlight, SingleFlight, request_key
+
+load_dotenv()
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name) or default)
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name) or default)
+    except ValueError:
+        return default
+
+
+# 풀 설정 (.env로 조정 가능)
+POOL_MAX_CONNECTIONS = _env_int("UPSTREAM_MAX_CONNECTIONS", 20)      # 호스트·모드별 최대 동시 연결 수
+POOL_MAX_KEEPALIVE = _env_int("UPSTREAM_MAX_KEEPALIVE", 10)          # 유휴 상태로 유지할 연결 수
+POOL_KEEPALIVE_EXPIRY = _env_float("UPSTREAM_KEEPALIVE_EXPIRY", 30)  # 유휴 연결 유지 시간(초)
+UPSTREAM_TIMEOUT = _env_float("UPSTREAM_TIMEOUT", 20)
+UPSTREAM_CONNECT_TIMEOUT = _env_float("UPSTREAM_CONNECT_TIMEOUT", UPSTREAM_TIMEOUT)
+
+# 시도 순서: default → TLS1.2+SECLEVEL1 → verify=False
+TLS_MODES = ("default", "tls12_seclevel1", "insecure")
+# 연결이 된 뒤의 타임아웃은 다른 TLS 모드로 다시 시도해도 같으므로 바로 실패.
+# ConnectTimeout은 제외 (오래된 암호화만 받는 서버는 default 핸드셰이크가 멈춰 타임아웃으로 끝나므로 다음 모드로 넘어가야 함)
+_NO_FALLBACK_TIMEOUTS = (httpx.ReadTimeout, httpx.WriteTimeout, httpx.PoolTimeout)
+# 기억해 둔 모드보다 안전한 모드를 다시 시도해 보는 주기(초)
+TLS_REPROBE_INTERVAL = _env_float("UPSTREAM_TLS_REPROBE_INTERVAL", 600)
+
+_clients: Dict[Tuple[str, str], httpx.Client] = {}
+_async_clients: Dict[Tuple[str, str], httpx.AsyncClient] = {}
+_clients_lock = threading.Lock()
+
+# 호스트별로 마지막에 성공한 TLS 모드 (다음 요청에서 가장 먼저 시도)
+_tls_memo: Dict[str, str] = {}
+_probe_urls: Dict[str, str] = {}
+_last_probe: Dict[str, float] = {}
+_probing: set = set()
+_memo_lock = threading.Lock()
+
+# 진행 중인 동일 요청 합치기 (MCP 도구: 스레드, FastAPI: asyncio)
+_flights = SingleFlight()
+_async_flights = AsyncSingleFlight()
+
+# 응답 캐시 (메모리 LRU + SQLite). UPSTREAM_CACHE=off 로 끌 수 있음
+CACHE_ENABLED = (os.getenv("UPSTREAM_CACHE") or "on").strip().lower() not in ("off", "0", "false", "no")
+CACHE_PATH = os.getenv("UPSTREAM_CACHE_PATH") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "upstream_cache.sqlite3"
+)
+CACHE_MEMORY_ITEMS = _env_int("UPSTREAM_CACHE_MEMORY_ITEMS", 512)
+CACHE_MAX_BYTES = _env_int("UPSTREAM_CACHE_MAX_MB", 200) * 1024 * 1024
+# 소스별 TTL(초). 지난 달 실거래가처럼 바뀌지 않는 데이터는 호출 측에서 immutable=True로 저장
+CACHE_TTLS: Dict[str, float] = {
+    "recruitment": _env_float("CACHE_TTL_RECRUITMENT", 1800),
+    "realestate": _env_float("CACHE_TTL_REALESTATE", 21600),
+    "youth_policy": _env_float("CACHE_TTL_YOUTH_POLICY", 3600),
+}
+
+# stale-while-revalidate: 만료 후 이 시간(초) 안에는 캐시를 즉시 내주고 백그라운드에서 갱신
+STALE_GRACES: Dict[str, float] = {
+    "recruitment": _env_float("STALE_GRACE_RECRUITMENT", 86400),
+    "youth_policy": _env_float("STALE_GRACE_YOUTH_POLICY", 86400),
+}
+_refreshing: set = set()
+_refresh_lock = threading.Lock()
+_background_tasks: set = set()
+_swr_counts = {"stale_served": 0, "revalidations": 0}
+# 꼬리 지연 헤징 (UPSTREAM_HEDGE=on). 엔드포인트별 관측 p95가 지나면 같은 요청을 한 번 더 보냄
+_hedger = Hedger()
+
+# 녹화/재생 (UPSTREAM_CASSETTE=record|replay). 재생 중에는 실제 업스트림에 요청하지 않음
+_cassette = cassette.from_env()
+
+# 업스트림 실패(회로 차단 포함) 시 만료된 캐시로 대신 응답한 횟수
+_degraded_counts = {"served": 0}
+
+# /metrics 지표 (upstream 레이블: source, 없으면 호스트)
+UPSTREAM_DURATION = metrics.histogram(
+    "upstream_request_duration_seconds", "업스트림 GET 소요 시간 (TLS 폴백 포함)", ("upstream", "outcome")
+)
+UPSTREAM_ERRORS = metrics.counter("upstream_errors_total", "업스트림 요청 실패 (예외 종류 또는 HTTP 상태)", ("upstream", "error"))
+UPSTREAM_TLS_ATTEMPTS = metrics.counter(
+    "upstream_tls_attempts_total", "TLS 모드별 연결 시도 결과", ("upstream", "mode", "outcome")
+)
+UPSTREAM_IN_FLIGHT = metrics.gauge("upstream_requests_in_flight", "진행 중인 업스트림 요청 수", ("upstream",))
+UPSTREAM_RESPONSE_BYTES = metrics.counter("upstream_response_bytes_total", "업스트림 응답 본문 바이트", ("upstream",))
+UPSTREAM_CACHE_RESULTS = metrics.counter(
+    "upstream_cache_requests_total", "응답 캐시 조회 결과 (hit/stale/miss/degraded)", ("upstream", "result")
+)
+UPSTREAM_CIRCUIT_STATE = metrics.gauge(
+    "upstream_circuit_state", "회로 차단기 상태 (0: closed, 1: half_open, 2: open)", ("upstream",)
+)
+_CIRCUIT_STATE_VALUES = {circuit_breaker.CLOSED: 0, circuit_breaker.HALF_OPEN: 1, circuit_breaker.OPEN: 2}
+
+_cache: Optional[ResponseCache] = (
+    ResponseCache(CACHE_PATH, memory_items=CACHE_MEMORY_ITEMS, max_bytes=CACHE_MAX_BYTES)
+    if CACHE_ENABLED else None
+)
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=POOL_MAX_CONNECTIONS,
+        max_keepalive_connections=POOL_MAX_KEEPALIVE,
+        keepalive_expiry=POOL_KEEPALIVE_EXPIRY,
+    )
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(UPSTREAM_TIMEOUT, connect=UPSTREAM_CONNECT_TIMEOUT)
+
+
+def _verify_for(mode: str):
+    """TLS 모드별 verify 인자. 해당 모드를 만들 수 없는 환경이면 None."""
+    # 1) 기본값: TLS 자동 협상 + 시스템 프록시/환경 변수 신뢰
+    if mode == "default":
+        return True
+
+    # 2) TLS 1.2 이상 + 낮은 보안 레벨(일부 구형 서버/프록시 대응)
+    if mode == "tls12_seclevel1":
+        try:
+            tls = ssl.create_default_context()
+            tls.minimum_version = ssl.TLSVersion.TLSv1_2
+            # 일부 공공/기관망 장비가 오래된 cipher만 허용 → OpenSSL3 기본 보안레벨과 충돌
+            try:
+                tls.set_ciphers("DEFAULT:@SECLEVEL=1")
+            except Exception:
+                pass
+            return tls
+        except Exception:
+            return None
+
+    # 3) 최후 수단: 인증서 검증 비활성화 (가능하면 피하고, 네트워크 진단용으로만 사용)
+    #    성공 시에도 ssl_mode로 'insecure'가 내려갑니다.
+    if mode == "insecure":
+        return False
+
+    return None
+
+
+def host_of(url: str) -> str:
+    """풀 구분 키로 쓰는 호스트(scheme://netloc)"""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def endpoint_of(url: str) -> str:
+    """응답 시간 관측 단위(scheme://netloc/path, 쿼리 제외)"""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}{parts.path}"
+
+
+def get_client(host: str, mode: str) -> Optional[httpx.Client]:
+    """(호스트, TLS 모드)별 장수명 Client를 반환. 처음 요청 시 생성."""
+    key = (host, mode)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            verify = _verify_for(mode)
+            if verify is None:
+                return None
+            client = httpx.Client(
+                verify=verify,
+                http2=False,
+                timeout=_timeout(),
+                limits=_limits(),
+                trust_env=True,
+            )
+            _clients[key] = client
+        return client
+
+
+def get_async_client(host: str, mode: str) -> Optional[httpx.AsyncClient]:
+    """get_client의 비동기 버전 (FastAPI 이벤트 루프에서 사용)"""
+    key = (host, mode)
+    client = _async_clients.get(key)
+    if client is not None:
+        return client
+
+    with _clients_lock:
+        client = _async_clients.get(key)
+        if client is None:
+            verify = _verify_for(mode)
+            if verify is None:
+                return None
+            client = httpx.AsyncClient(
+                verify=verify,
+                http2=False,
+                timeout=_timeout(),
+                limits=_limits(),
+                trust_env=True,
+            )
+            _async_clients[key] = client
+        return client
+
+
+def _mode_order(host: str) -> Tuple[str, ...]:
+    """기억된 모드를 맨 앞에 두고 나머지는 기본 순서대로"""
+    remembered = _tls_memo.get(host)
+    if not remembered:
+        return TLS_MODES
+    return (remembered,) + tuple(m for m in TLS_MODES if m != remembered)
+
+
+def client_candidates(url: str) -> Iterable[Tuple[str, httpx.Client]]:
+    """
+    TLS/SSL 환경에 따라 순차적으로 시도할 (모드이름, Client) 후보들.
+    해당 호스트에서 마지막으로 성공한 모드가 먼저 나옵니다.
+    Client는 호스트별로 공유되므로 호출 측에서 닫으면 안 됩니다.
+    """
+    host = host_of(url)
+    for mode in _mode_order(host):
+        client = get_client(host, mode)
+        if client is not None:
+            yield mode, client
+
+
+def _remember_mode(host: str, mode: str, url: str):
+    with _memo_lock:
+        _tls_memo[host] = mode
+        _probe_urls[host] = url
+        _last_probe.setdefault(host, time.monotonic())
+
+
+def _reprobe(host: str, remembered: str):
+    """기억된 모드보다 안전한 모드가 다시 통하는지 확인 (백그라운드 스레드)"""
+    try:
+        url = _probe_urls.get(host, host)
+        for mode in TLS_MODES[:TLS_MODES.index(remembered)]:
+            client = get_client(host, mode)
+            if client is None:
+                continue
+            try:
+                # 응답 코드와 무관하게 핸드셰이크만 성공하면 충분
+                client.head(url)
+            except Exception:
+                continue
+            with _memo_lock:
+                _tls_memo[host] = mode
+            break
+    finally:
+        with _memo_lock:
+            _last_probe[host] = time.monotonic()
+            _probing.discard(host)
+
+
+def _maybe_schedule_reprobe(host: str):
+    remembered = _tls_memo.get(host)
+    if not remembered or remembered == TLS_MODES[0] or TLS_REPROBE_INTERVAL <= 0:
+        return
+    with _memo_lock:
+        if host in _probing:
+            return
+        if time.monotonic() - _last_probe.get(host, 0.0) < TLS_REPROBE_INTERVAL:
+            return
+        _probing.add(host)
+    threading.Thread(target=_reprobe, args=(host, remembered), daemon=True).start()
+
+
+def _record_response(label: str, started: float, resp: httpx.Response):
+    status = resp.status_code
+    UPSTREAM_DURATION.observe(time.monotonic() - started, upstream=label, outcome="ok" if status < 400 else "http_error")
+    UPSTREAM_RESPONSE_BYTES.inc(len(resp.content), upstream=label)
+    if status >= 400:
+        UPSTREAM_ERRORS.inc(upstream=label, error=f"http_{status}")
+
+
+def _record_failure(label: str, started: float, error: Exception):
+    UPSTREAM_DURATION.observe(time.monotonic() - started, upstream=label, outcome="error")
+    UPSTREAM_ERRORS.inc(upstream=label, error=type(error).__name__)
+
+
+def try_get(url: str, params: Dict[str, Any], source: Optional[str] = None):
+    """
+    후보 클라이언트들을 순서대로 시도. 성공하면 (mode, response) 반환.
+    성공한 모드는 호스트별로 기억해 두고 다음 요청에서 먼저 사용합니다.
+    전부 실패하면 마지막 예외를 다시 던짐.
+    source는 지표 레이블 (없으면 호스트)
+    """
+    label = source or host_of(url)
+    UPSTREAM_IN_FLIGHT.inc(upstream=label)
+    started = time.monotonic()
+    try:
+        with tracing.span("upstream.get", tracing.KIND_CLIENT, upstream=label, endpoint=endpoint_of(url)) as span:
+            mode, resp = _try_get(url, params, label)
+            span.set_attribute("http.status_code", resp.status_code)
+            span.set_attribute("tls_mode", mode)
+    except Exception as e:
+        _record_failure(label, started, e)
+        raise
+    finally:
+        UPSTREAM_IN_FLIGHT.dec(upstream=label)
+    _record_response(label, started, resp)
+    return mode, resp
+
+
+def _replay(url: str, params: Dict[str, Any]) -> Tuple[str, httpx.Response]:
+    mode, resp, delay = _cassette.lookup(url, params)
+    if delay:
+        time.sleep(delay)
+    return mode, resp
+
+
+async def _areplay(url: str, params: Dict[str, Any]) -> Tuple[str, httpx.Response]:
+    mode, resp, delay = _cassette.lookup(url, params)
+    if delay:
+        await asyncio.sleep(delay)
+    return mode, resp
+
+
+def _record(url: str, params: Dict[str, Any], mode: str, resp: httpx.Response, started: float):
+    if _cassette is not None and _cassette.recording:
+        _cassette.record(url, params, mode, resp, time.monotonic() - started)
+
+
+def _try_get(url: str, params: Dict[str, Any], label: str):
+    if _cassette is not None and _cassette.replaying:
+        return _replay(url, params)
+    host = host_of(url)
+    _maybe_schedule_reprobe(host)
+
+    started = time.monotonic()
+    last_err: Optional[Exception] = None
+    for mode, client in client_candidates(url):
+        try:
+            with tracing.span("upstream.tls_attempt", tls_mode=mode):
+                resp = client.get(url, params=params)
+            UPSTREAM_TLS_ATTEMPTS.inc(upstream=label, mode=mode, outcome="ok")
+            _remember_mode(host, mode, url)
+            _record(url, params, mode, resp, started)
+            return mode, resp
+        except _NO_FALLBACK_TIMEOUTS:
+            UPSTREAM_TLS_ATTEMPTS.inc(upstream=label, mode=mode, outcome="timeout")
+            raise  # 응답이 없는 서버는 다른 TLS 모드로 다시 시도해도 같음
+        except Exception as e:
+            outcome = "timeout" if isinstance(e, httpx.ConnectTimeout) else "error"
+            UPSTREAM_TLS_ATTEMPTS.inc(upstream=label, mode=mode, outcome=outcome)
+            last_err = e
+            continue
+    # 전부 실패
+    if last_err:
+        raise last_err
+    raise RuntimeError("No HTTP client candidates available")
+
+
+async def async_try_get(url: str, params: Dict[str, Any], source: Optional[str] = None):
+    """try_get의 비동기 버전. TLS 모드 기억은 동기 경로와 공유합니다."""
+    label = source or host_of(url)
+    UPSTREAM_IN_FLIGHT.inc(upstream=label)
+    started = time.monotonic()
+    try:
+        with tracing.span("upstream.get", tracing.KIND_CLIENT, upstream=label, endpoint=endpoint_of(url)) as span:
+            mode, resp = await _async_try_get(url, params, label)
+            span.set_attribute("http.status_code", resp.status_code)
+            span.set_attribute("tls_mode", mode)
+    except Exception as e:
+        _record_failure(label, started, e)
+        raise
+    finally:
+        UPSTREAM_IN_FLIGHT.dec(upstream=label)
+    _record_response(label, started, resp)
+    return mode, resp
+
+
+async def _async_try_get(url: str, params: Dict[str, Any], label: str):
+    if _cassette is not None and _cassette.replaying:
+        return await _areplay(url, params)
+    host = host_of(url)
+    _maybe_schedule_reprobe(host)
+
+    started = time.monotonic()
+    last_err: Optional[Exception] = None
+    for mode in _mode_order(host):
+        client = get_async_client(host, mode)
+        if client is None:
+            continue
+        try:
+            with tracing.span("upstream.tls_attempt", tls_mode=mode):
+                resp = await client.get(url, params=params)
+            UPSTREAM_TLS_ATTEMPTS.inc(upstream=label, mode=mode, outcome="ok")
+            _remember_mode(host, mode, url)
+            _record(url, params, mode, resp, started)
+            return mode, resp
+        except _NO_FALLBACK_TIMEOUTS:
+            UPSTREAM_TLS_ATTEMPTS.inc(upstream=label, mode=mode, outcome="timeout")
+            raise
+        except Exception as e:
+            outcome = "timeout" if isinstance(e, httpx.ConnectTimeout) else "error"
+            UPSTREAM_TLS_ATTEMPTS.inc(upstream=label, mode=mode, outcome=outcome)
+            last_err = e
+            continue
+    if last_err:
+        raise last_err
+    raise RuntimeError("No HTTP client candidates available")
+
+
+def governor_for(url: str, params: Dict[str, Any], source: Optional[str] = None) -> rate_limit.Governor:
+    """요청의 업스트림(source, 없으면 호스트)과 인증키에 해당하는 요청 제한기"""
+    api_key = next((str(params[k]) for k in SECRET_PARAMS if params.get(k)), None)
+    return rate_limit.get_governor(source or host_of(url), api_key)
+
+
+def breaker_for(url: str, source: Optional[str] = None) -> circuit_breaker.CircuitBreaker:
+    """업스트림(source, 없으면 호스트)별 회로 차단기"""
+    return circuit_breaker.get_breaker(source or host_of(url))
+
+
+def _raise_for_server_error(resp: httpx.Response):
+    """5xx는 회로 차단기에 실패로 기록되도록 예외 (4xx는 요청 문제라 제외)"""
+    if resp.status_code >= 500:
+        resp.raise_for_status()
+
+
+def scrub_url(url: str) -> str:
+    """URL 쿼리의 인증키(serviceKey/apiKeyNm) 값을 가림"""
+    parts = urlsplit(url)
+    if not parts.query:
+        return url
+    query = [(k, "***" if k in SECRET_PARAMS else v) for k, v in parse_qsl(parts.query, keep_blank_values=True)]
+    return urlunsplit(parts._replace(query=urlencode(query, safe="*")))
+
+
+def _payload(mode: str, resp: httpx.Response) -> Dict[str, Any]:
+    """캐시/공유 가능한 응답 형태로 변환 (2xx가 아니면 예외)"""
+    resp.raise_for_status()
+    return {
+        "ssl_mode": mode,
+        "request_url": scrub_url(str(resp.request.url)),
+        "status_code": resp.status_code,
+        "text": resp.text,
+    }
+
+
+def _cache_lookup(source: Optional[str], key, stale_grace: float = 0.0):
+    """
+    (저장용 키, 캐시 응답, 백그라운드 갱신 필요 여부) 반환.
+    만료됐어도 stale_grace 안이면 cache="stale"로 내주고 갱신을 요청합니다.
+    """
+    if _cache is None or not source:
+        return None, None, False
+    ck = cache_key(key)
+    return _cache_result(source, ck, _cache.get(ck), stale_grace)
+
+
+async def _acache_lookup(source: Optional[str], key, stale_grace: float = 0.0):
+    """_cache_lookup의 비동기 버전 (메모리에 없을 때의 디스크 조회는 스레드에서)"""
+    if _cache is None or not source:
+        return None, None, False
+    ck = cache_key(key)
+    return _cache_result(source, ck, await _cache.aget(ck), stale_grace)
+
+
+def _cache_result(source: str, ck: str, entry, stale_grace: float):
+    now = time.time()
+    if entry is not None and entry.is_fresh(now):
+        UPSTREAM_CACHE_RESULTS.inc(upstream=source, result="hit")
+        return ck, {**entry.value, "cache": "hit", "cached_at": entry.stored_at}, False
+    if entry is not None and stale_grace > 0 and now < entry.expires_at + stale_grace:
+        UPSTREAM_CACHE_RESULTS.inc(upstream=source, result="stale")
+        return ck, {**entry.value, "cache": "stale", "cached_at": entry.stored_at}, True
+    UPSTREAM_CACHE_RESULTS.inc(upstream=source, result="miss")
+    return ck, None, False
+
+
+def _last_good(ck: Optional[str], source: Optional[str], error: Exception) -> Optional[Dict[str, Any]]:
+    """업스트림 실패 시 만료 여부와 관계없이 마지막으로 받은 정상 응답 (cache="stale", degraded=실패 사유)"""
+    if ck is None or _cache is None:
+        return None
+    return _degraded(_cache.get(ck), source, error)
+
+
+async def _alast_good(ck: Optional[str], source: Optional[str], error: Exception) -> Optional[Dict[str, Any]]:
+    if ck is None or _cache is None:
+        return None
+    return _degraded(await _cache.aget(ck), source, error)
+
+
+def _degraded(entry, source: Optional[str], error: Exception) -> Optional[Dict[str, Any]]:
+    if entry is None:
+        return None
+    with _refresh_lock:
+        _degraded_counts["served"] += 1
+    UPSTREAM_CACHE_RESULTS.inc(upstream=source, result="degraded")
+    return {**entry.value, "cache": "stale", "cached_at": entry.stored_at, "degraded": str(error)}
+
+
+def _claim_refresh(ck: str) -> bool:
+    """같은 키의 백그라운드 갱신은 하나만"""
+    with _refresh_lock:
+        _swr_counts["stale_served"] += 1
+        if ck in _refreshing:
+            return False
+        _refreshing.add(ck)
+        _swr_counts["revalidations"] += 1
+        return True
+
+
+def _release_refresh(ck: str):
+    with _refresh_lock:
+        _refreshing.discard(ck)
+
+
+def _cache_store(ck: Optional[str], source: str, payload: Dict[str, Any], immutable: bool,
+                 cacheable: Optional[Callable[[str], bool]], wait: bool = True):
+    """wait=False면 디스크 저장을 쓰기 스레드에 맡김 (이벤트 루프에서 호출할 때)"""
+    if ck is None or _cache is None:
+        return
+    if cacheable is not None and not cacheable(payload["text"]):
+        return
+    _cache.set(ck, payload, None if immutable else CACHE_TTLS.get(source, 600), source, wait=wait)
+
+
+@tracing.traced("upstream.fetch")
+def fetch(
+    url: str,
+    params: Dict[str, Any],
+    source: Optional[str] = None,
+    immutable: bool = False,
+    cacheable: Optional[Callable[[str], bool]] = None,
+    stale_while_revalidate: bool = False,
+) -> Dict[str, Any]:
+    """
+    캐시 → 요청 합치기 → try_get 순서로 응답을 가져옴.
+    - source: 캐시 TTL 구분 ("recruitment"/"realestate"/"youth_policy"), None이면 캐시 안 함
+    - immutable: 만료 없이 저장 (지난 달 실거래가 등)
+    - cacheable: 응답 본문을 보고 저장 여부 결정 (API 오류 응답 저장 방지)
+    - stale_while_revalidate: 유예 시간 안의 만료 캐시를 즉시 반환하고 백그라운드에서 갱신
+    업스트림이 실패하거나 회로가 열려 있으면 마지막 정상 응답을 cache="stale", degraded=사유로 반환
+    (저장된 응답이 없으면 예외).
+    반환: {"ssl_mode", "request_url", "status_code", "text", "cache"(hit/stale/miss)}
+    """
+    key = request_key(url, params)
+    grace = STALE_GRACES.get(source, 0.0) if stale_while_revalidate else 0.0
+    ck, cached, refresh = _cache_lookup(source, key, grace)
+
+    governor = governor_for(url, params, source)
+    breaker = breaker_for(url, source)
+
+    def load():
+        breaker.check()  # 회로가 열려 있으면 줄 서지 않고 바로 CircuitOpen
+        with governor.slot():  # 한도에 걸리면 기한까지 대기 (초과 시 RateLimitTimeout/QuotaExceeded)
+            with breaker.call():
+                # 헤지 요청은 요청 제한기에 여유가 있을 때만 (대기하지 않음)
+                mode, resp = _hedger.run(
+                    lambda: try_get(url, params, source), endpoint_of(url), governor.try_acquire, governor.release
+                )
+                _raise_for_server_error(resp)
+        payload = _payload(mode, resp)
+        _cache_store(ck, source, payload, immutable, cacheable)
+        return payload
+
+    if cached is not None:
+        if refresh and _claim_refresh(ck):
+            def revalidate():
+                try:
+                    _flights.do(key, load)
+                except Exception:
+                    pass  # 갱신 실패 시 다음 요청에서 다시 시도
+                finally:
+                    _release_refresh(ck)
+            threading.Thread(target=revalidate, daemon=True).start()
+        return cached
+
+    try:
+        return {**_flights.do(key, load), "cache": "miss"}
+    except Exception as e:
+        fallback = _last_good(ck, source, e)
+        if fallback is None:
+            raise
+        return fallback
+
+
+@tracing.traced("upstream.fetch")
+async def afetch(
+    url: str,
+    params: Dict[str, Any],
+    source: Optional[str] = None,
+    immutable: bool = False,
+    cacheable: Optional[Callable[[str], bool]] = None,
+    stale_while_revalidate: bool = False,
+) -> Dict[str, Any]:
+    """fetch의 비동기 버전"""
+    key = request_key(url, params)
+    grace = STALE_GRACES.get(source, 0.0) if stale_while_revalidate else 0.0
+    ck, cached, refresh = await _acache_lookup(source, key, grace)
+
+    governor = governor_for(url, params, source)
+    breaker = breaker_for(url, source)
+
+    async def load():
+        breaker.check()
+        async with governor.aslot():
+            with breaker.call():
+                mode, resp = await _hedger.arun(
+                    lambda: async_try_get(url, params, source), endpoint_of(url), governor.try_acquire, governor.release
+                )
+                _raise_for_server_error(resp)
+        payload = _payload(mode, resp)
+        _cache_store(ck, source, payload, immutable, cacheable, wait=False)
+        return payload
+
+    if cached is not None:
+        if refresh and _claim_refresh(ck):
+            async def revalidate():
+                try:
+                    await _async_flights.do(key, load)
+                except Exception:
+                    pass
+                finally:
+                    _release_refresh(ck)
+            task = asyncio.ensure_future(revalidate())
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
+        return cached
+
+    try:
+        return {**await _async_flights.do(key, load), "cache": "miss"}
+    except Exception as e:
+        fallback = await _alast_good(ck, source, e)
+        if fallback is None:
+            raise
+        return fallback
+
+
+def tls_modes() -> Dict[str, str]:
+    """호스트별로 현재 기억 중인 TLS 모드"""
+    return dict(_tls_memo)
+
+
+def pool_info() -> Dict[str, Any]:
+    """현재 열려 있는 풀 목록과 설정 (진단용)"""
+    return {
+        "clients": [f"{host} [{mode}]" for host, mode in _clients],
+        "async_clients": [f"{host} [{mode}]" for host, mode in _async_clients],
+        "tls_modes": tls_modes(),
+        "limits": {
+            "max_connections": POOL_MAX_CONNECTIONS,
+            "max_keepalive_connections": POOL_MAX_KEEPALIVE,
+            "keepalive_expiry": POOL_KEEPALIVE_EXPIRY,
+        },
+    }
+
+
+def stats() -> Dict[str, Any]:
+    """캐시 적중률 + 요청 합치기 카운터 (leaders: 실제 전송, coalesced: 합쳐진 요청)"""
+    return {
+        "cache": _cache.stats() if _cache is not None else {"enabled": False},
+        "stale_while_revalidate": {**_swr_counts, "refreshing": len(_refreshing)},
+        "rate_limits": rate_limit.status(),
+        "circuits": circuit_breaker.status(),
+        "hedging": _hedger.stats(),
+        "degraded": dict(_degraded_counts),
+        "cassette": _cassette.stats() if _cassette is not None else {"mode": cassette.OFF},
+        "coalescing": {
+            "sync": {
+                "leaders": _flights.leaders,
+                "coalesced": _flights.coalesced,
+                "in_flight": _flights.in_flight(),
+            },
+            "async": {
+                "leaders": _async_flights.leaders,
+                "coalesced": _async_flights.coalesced,
+                "in_flight": _async_flights.in_flight(),
+            },
+        },
+    }
+
+
+def refresh_gauges():
+    """스크레이프 시점에만 알 수 있는 값(회로 상태)을 게이지에 반영 (/metrics 응답 직전 호출)"""
+    for name, circuit in circuit_breaker.status().items():
+        UPSTREAM_CIRCUIT_STATE.set(_CIRCUIT_STATE_VALUES.get(circuit["state"], 0), upstream=name)
+
+
+def close_all():
+    """모든 풀 클라이언트 종료 (프로세스 종료 시 자동 호출)"""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception:
+            pass
+    _hedger.close()
+    if _cassette is not None:
+        _cassette.close()
+    if _cache is not None:
+        _cache.close()
+
+
+async def aclose_all():
+    """비동기 풀 클라이언트 종료 (FastAPI 종료 시 호출) + 동기 풀 정리"""
+    # 진행 중인 백그라운드 갱신 정리
+    pending = [t for t in _background_tasks if not t.done()]
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    with _clients_lock:
+        clients = list(_async_clients.values())
+        _async_clients.clear()
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception:
+            pass
+    close_all()
+
+
+atexit.register(close_all)
@@ -1,15 +1,26 @@
 # src/web_api_handler.py - 수정된 버전
-from typing import Dict, Any, Optional, List
+import asyncio
+import time
+from typing import Dict, Any, Optional, List, Tuple, AsyncIterator
 from datetime import datetime
 
 # 상대 import 방식으로 변경
 from .enhanced_orchestrator import EnhancedOrchestrator
 from .final_chatbot import PerfectChatbot
+from .recruitment_mirror import MIRROR_SYNC_INTERVAL
+from .molit_parser import to_record
+from .realestate_store import TradeColumns
+from . import tracing
+
+# 이 기간(일) 안에 신청/사업이 끝나는 정책은 마감 임박으로 표시
+CLOSING_SOON_DAYS = 7
+
 
 class WebAPIHandler:
     def __init__(self):
         self.orchestrator = EnhancedOrchestrator()
         self.chatbot = PerfectChatbot()
+        self._warming: set = set()  # 응답 기한 뒤에도 계속 진행 중인 통합 검색 영역
         
         # 🔧 학력 코드 매핑 테이블 (클래스 속성으로 이동)
         self.EDUCATION_CODE_MAPPING = {
@@ -34,6 +45,83 @@ class WebAPIHandler:
             "R1070": "기타"
         }
 
+    def close(self):
+        """업스트림 커넥션 풀 정리"""
+        self.orchestrator.close()
+
+    async def aclose(self):
+        """업스트림 커넥션 풀 정리 (비동기 풀 포함)"""
+        pending = [task for task in self._warming if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        await self.orchestrator.aclose()
+
+    @tracing.traced("handler.fetch_raw_jobs")
+    async def _fetch_raw_jobs(self, filters: Optional[Dict] = None, num_rows: int = 100):
+        """
+        지역 필터링 전 채용공고 목록과 신선도 정보.
+        로컬 미러가 준비되어 있으면 전국 전체 공고를, 아니면 업스트림 첫 페이지(num_rows건)를 사용
+        """
+        local_jobs = self.orchestrator.search_local_recruitments(filters)
+        if local_jobs is not None:
+            mirror = self.orchestrator.recruitment_mirror
+            synced_at = mirror.last_sync
+            stale = synced_at is None or time.time() - synced_at > 2 * max(MIRROR_SYNC_INTERVAL, 3600)
+            return local_jobs, {
+                "freshness": "stale" if stale else "fresh",
+                "cache": "mirror",
+                "cached_at": datetime.fromtimestamp(synced_at).isoformat() if synced_at else None
+            }
+        
+        job_result = await self.orchestrator.call_recruitment_tool_async(
+            'listRecruitments',
+            {
+                'pageNo': 1,
+                'numOfRows': num_rows,
+                'filters': {**filters} if filters else {}
+            }
+        )
+        jobs = []
+        if job_result["status"] == "success":
+            jobs = job_result["result"].get("data", {}).get("result", [])
+        return jobs, self._freshness(job_result)
+
+    @tracing.traced("handler.rank_jobs")
+    def _rank_jobs(self, jobs: List[Dict], region_code: str, freshness: Dict[str, Any]) -> List[Dict]:
+        """지역 관련성 정렬 (미러에서 온 공고는 미러가 유지하는 근무지역 색인 사용)"""
+        index = self.orchestrator.recruitment_mirror.region_index if freshness.get("cache") == "mirror" else None
+        return self.chatbot.filter_and_sort_jobs_by_region(jobs, region_code, index=index)
+
+    def _freshness(self, tool_result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        도구 응답의 캐시 상태 → search_metadata용 신선도 정보.
+        업스트림 장애로 마지막 정상 응답을 받았으면 degraded에 사유, 아예 실패했으면 unavailable
+        """
+        error = self._upstream_error(tool_result)
+        if error:
+            return {"freshness": "unavailable", "cache": None, "cached_at": None, "error": error}
+        result = tool_result.get("result") or {}
+        cached_at = result.get("cached_at")
+        freshness = {
+            "freshness": "stale" if result.get("cache") == "stale" else "fresh",
+            "cache": result.get("cache"),
+            "cached_at": datetime.fromtimestamp(cached_at).isoformat() if cached_at else None
+        }
+        if result.get("degraded"):
+            freshness["degraded"] = result["degraded"]
+        return freshness
+
+    def _upstream_error(self, tool_result: Dict[str, Any]) -> Optional[str]:
+        """도구 호출 또는 업스트림 요청이 실패했으면 오류 메시지"""
+        if tool_result.get("status") != "success":
+            return tool_result.get("message") or "도구 호출 실패"
+        result = tool_result.get("result") or {}
+        if result.get("status") == "error":
+            return result.get("message") or "업스트림 요청 실패"
+        return None
+
 # web_api_handler.py - 개선된 학력요건 처리
 
     def format_education_requirement(self, code_str):
@@ -132,138 +220,197 @@ class WebAPIHandler:
         
         return ', '.join(formatted_codes)
     
-    async def search_comprehensive(self, query: str, region_code: str = "44790") -> Dict[str, Any]:
-        """요약 페이지용 - 전체 데이터 통합"""
+    def _comprehensive_intent(self, query: str, region_code: str) -> Dict[str, Any]:
+        # 자연어 의도 분석
+        intent = self.chatbot.analyze_user_intent(query)
+        if region_code:
+            intent["region_mentioned"] = region_code
+        
+        # 모든 타입 검색 강제
+        intent["search_jobs"] = True
+        intent["search_realestate"] = True
+        intent["search_policies"] = True
+        return intent
+
+    def _comprehensive_response(
+        self, query: str, region_code: str, intent: Dict[str, Any],
+        raw_data: Dict[str, Any], latency_budget: Optional[float]
+    ) -> Dict[str, Any]:
+        # 요약 정보 생성
+        summary = self._generate_summary(raw_data, region_code)
+        
+        return {
+            "success": True,
+            "summary": summary,
+            "preview_data": {
+                "jobs": raw_data["jobs"][:3],
+                "realestate": raw_data["realestate"][:3],
+                "policies": raw_data["policies"][:3]
+            },
+            "region_info": {
+                "code": region_code,
+                "name": self.chatbot.get_region_name(region_code)
+            },
+            "search_metadata": {
+                "query": query,
+                "timestamp": datetime.now().isoformat(),
+                "intent_type": intent.get("type", "comprehensive"),
+                "freshness": raw_data["freshness"],
+                "partial": any(  # 일부 영역만 조회됨
+                    info["status"] in ("error", "pending") for info in raw_data["sections"].values()
+                ),
+                "errors": raw_data["errors"],
+                "sections": raw_data["sections"],
+                "latency_budget_ms": round(latency_budget * 1000) if latency_budget else None
+            }
+        }
+
+    @tracing.traced("handler.search_comprehensive")
+    async def search_comprehensive(
+        self, query: str, region_code: str = "44790", latency_budget: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        요약 페이지용 - 전체 데이터 통합.
+        latency_budget(초)을 주면 그 안에 끝난 영역만으로 응답 (영역별 상태는 search_metadata.sections)
+        """
         try:
-            # 자연어 의도 분석
-            intent = self.chatbot.analyze_user_intent(query)
-            if region_code:
-                intent["region_mentioned"] = region_code
-            
-            # 모든 타입 검색 강제
-            intent["search_jobs"] = True
-            intent["search_realestate"] = True
-            intent["search_policies"] = True
+            intent = self._comprehensive_intent(query, region_code)
             
             # 각 영역별 데이터 수집
-            raw_data = await self._get_raw_data(intent)
-            
-            # 요약 정보 생성
-            summary = self._generate_summary(raw_data, region_code)
+            raw_data = await self._get_raw_data(intent, latency_budget)
             
-            return {
-                "success": True,
-                "summary": summary,
-                "preview_data": {
-                    "jobs": raw_data["jobs"][:3],
-                    "realestate": raw_data["realestate"][:3],
-                    "policies": raw_data["policies"][:3]
-                },
-                "region_info": {
-                    "code": region_code,
-                    "name": self.chatbot.get_region_name(region_code)
-                },
-                "search_metadata": {
-                    "query": query,
-                    "timestamp": datetime.now().isoformat(),
-                    "intent_type": intent.get("type", "comprehensive")
-                }
-            }
+            return self._comprehensive_response(query, region_code, intent, raw_data, latency_budget)
         except Exception as e:
             return {"success": False, "error": str(e)}
+
+    async def stream_comprehensive(
+        self, query: str, region_code: str = "44790", latency_budget: Optional[float] = None
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        search_comprehensive의 스트리밍 버전. (이벤트 이름, 데이터)를 영역이 끝나는 순서대로 반환:
+        - "jobs"/"realestate"/"policies": {"section", "items"(preview_data와 같은 상위 3건), "metadata"(sections 항목)}
+        - 마지막 "summary": search_comprehensive와 같은 전체 응답
+        """
+        try:
+            intent = self._comprehensive_intent(query, region_code)
+            tasks, started = self._start_sections(intent)
+        except Exception as e:
+            yield "summary", {"success": False, "error": str(e)}
+            return
+
+        sections = {task: section for section, task in tasks.items()}
+        deadline = None if latency_budget is None else started + latency_budget
+        pending = set(tasks.values())
+        try:
+            while pending:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    break  # 응답 기한 초과
+                for task in done:
+                    section = sections[task]
+                    items, info, elapsed = task.result()
+                    if info.get("status") == "skipped":
+                        continue
+                    yield section, {
+                        "section": section,
+                        "items": items[:3],
+                        "metadata": self._section_metadata(items, info, elapsed)
+                    }
+            try:
+                raw_data = self._assemble_raw_data(intent, tasks, pending, started)
+                yield "summary", self._comprehensive_response(query, region_code, intent, raw_data, latency_budget)
+            except Exception as e:
+                yield "summary", {"success": False, "error": str(e)}
+        finally:
+            # 기한을 넘겼거나 클라이언트가 끊은 경우에도 남은 조회는 마저 진행
+            for task in tasks.values():
+                if not task.done():
+                    self._keep_warming(task)
     
+    @tracing.traced("handler.search_jobs_only")
     async def search_jobs_only(self, region_code: str, filters: Dict = None) -> Dict[str, Any]:
         """일자리 페이지용 - final_chatbot.py와 동일한 로직 사용"""
         try:
-            # 🎯 final_chatbot.py와 정확히 같은 방식으로 채용정보 검색
-            job_result = self.orchestrator.call_recruitment_tool(
-                'listRecruitments',
-                {
-                    'pageNo': 1,
-                    'numOfRows': 100,  # final_chatbot.py와 동일
-                    'filters': {**filters} if filters else {}
-                }
-            )
+            # 🎯 미러가 준비되어 있으면 전국 전체 공고에서, 아니면 final_chatbot.py와 같은 방식(100건)으로 검색
+            raw_jobs, freshness = await self._fetch_raw_jobs(filters, num_rows=100)
             
-            jobs = []
-            if job_result["status"] == "success":
-                raw_jobs = job_result["result"].get("data", {}).get("result", [])
-                
-                # 🎯 final_chatbot.py와 동일한 지역 필터링 및 정렬 적용
-                jobs = self.chatbot.filter_and_sort_jobs_by_region(raw_jobs, region_code)
+            # 🎯 final_chatbot.py와 동일한 지역 필터링 및 정렬 적용
+            jobs = self._rank_jobs(raw_jobs, region_code, freshness)
             
             # 🎯 final_chatbot.py의 format_job_results 함수와 동일한 포맷팅을 JSON으로 변환
-            formatted_jobs = []
-            region_name = self.chatbot.get_region_name(region_code)
+            with tracing.span("handler.format_jobs"):
+                formatted_jobs = []
+                region_name = self.chatbot.get_region_name(region_code)
             
-            for i, job in enumerate(jobs[:15], 1):  # 상위 15개 (final_chatbot.py 기본값)
-                title = job.get("recrutPbancTtl", "제목 없음")
-                company = job.get("instNm", "기관명 없음")
-                hire_type = job.get("hireTypeNmLst", "")
-                region = job.get("workRgnNmLst", "")
-                deadline = job.get("pbancEndYmd", "")
-                ncs_field = job.get("ncsCdNmLst", "")
-
-                # 🎯 학력요건 포맷팅 (개선된 로직 사용)
-                education_code = job.get("acbgCondLst", "")
-                formatted_education = self.format_education_requirement(education_code)
+                for i, job in enumerate(jobs[:15], 1):  # 상위 15개 (final_chatbot.py 기본값)
+                    title = job.get("recrutPbancTtl", "제목 없음")
+                    company = job.get("instNm", "기관명 없음")
+                    hire_type = job.get("hireTypeNmLst", "")
+                    region = job.get("workRgnNmLst", "")
+                    deadline = job.get("pbancEndYmd", "")
+                    ncs_field = job.get("ncsCdNmLst", "")
+
+                    # 🎯 학력요건 포맷팅 (개선된 로직 사용)
+                    education_code = job.get("acbgCondLst", "")
+                    formatted_education = self.format_education_requirement(education_code)
                 
-                # 🎯 고용형태 포맷팅 (개선된 로직 사용)
-                hire_type_code = job.get("hireTypeNmLst", "")
-                formatted_hire_type_detailed = self.format_hire_type(hire_type_code)
+                    # 🎯 고용형태 포맷팅 (개선된 로직 사용)
+                    hire_type_code = job.get("hireTypeNmLst", "")
+                    formatted_hire_type_detailed = self.format_hire_type(hire_type_code)
                 
-                # 🎯 기본 고용형태 (제목용, 간단하게)
-                basic_hire_type = hire_type.split(',')[0] if hire_type else ""
-                # 마감일 포맷팅 (final_chatbot.py와 동일)
-                formatted_deadline = ""
-                if deadline and len(deadline) == 8:
-                    formatted_deadline = f"{deadline[:4]}.{deadline[4:6]}.{deadline[6:]}"
+                    # 🎯 기본 고용형태 (제목용, 간단하게)
+                    basic_hire_type = hire_type.split(',')[0] if hire_type else ""
+                    # 마감일 포맷팅 (final_chatbot.py와 동일)
+                    formatted_deadline = ""
+                    if deadline and len(deadline) == 8:
+                        formatted_deadline = f"{deadline[:4]}.{deadline[4:6]}.{deadline[6:]}"
                 
-                # 지역 표시 포맷팅 (final_chatbot.py와 동일)
-                region_display = region
-                if region:
-                    region_count = region.count(',') + 1
-                    if region_count >= 10:
-                        region_display = f"전국 ({region_count}개 지역)"
-                    elif region_count > 3:
-                        region_display = f"{region.split(',')[0]} 외 {region_count-1}개 지역"
-                    else:
-                        region_display = region
+                    # 지역 표시 포맷팅 (final_chatbot.py와 동일)
+                    region_display = region
+                    if region:
+                        region_count = region.count(',') + 1
+                        if region_count >= 10:
+                            region_display = f"전국 ({region_count}개 지역)"
+                        elif region_count > 3:
+                            region_display = f"{region.split(',')[0]} 외 {region_count-1}개 지역"
+                        else:
+                            region_display = region
                 
-                # final_chatbot.py와 동일한 구조로 포맷팅
-                formatted_job = {
-                    **job,  # 원본 데이터 유지
+                    # final_chatbot.py와 동일한 구조로 포맷팅
+                    formatted_job = {
+                        **job,  # 원본 데이터 유지
 
-                    "display_title": f"{i}. {company} ({basic_hire_type})",
-                    "formatted_education": formatted_education,
+                        "display_title": f"{i}. {company} ({basic_hire_type})",
+                        "formatted_education": formatted_education,
                     
-                    # final_chatbot.py에서 표시하는 추가 정보들
-                    "display_number": i,
-                    "display_title": f"{i}. {company} ({hire_type})",
-                    "formatted_title": title,
-                    "formatted_company": company,
-                    "formatted_hire_type": hire_type,
-                    "formatted_region": region_display,
-                    "formatted_deadline": formatted_deadline if formatted_deadline else "미정",
-                    "formatted_ncs_field": ncs_field,
-                    "formatted_education": formatted_education,
-                    "formatted_hire_type_detailed": formatted_hire_type_detailed if formatted_hire_type_detailed != basic_hire_type else None,
-                    "education_code_original": education_code,  # 원본 코드 보존
-                    "hire_type_code_original": hire_type_code,   # 원본 코드 보존
+                        # final_chatbot.py에서 표시하는 추가 정보들
+                        "display_number": i,
+                        "display_title": f"{i}. {company} ({hire_type})",
+                        "formatted_title": title,
+                        "formatted_company": company,
+                        "formatted_hire_type": hire_type,
+                        "formatted_region": region_display,
+                        "formatted_deadline": formatted_deadline if formatted_deadline else "미정",
+                        "formatted_ncs_field": ncs_field,
+                        "formatted_education": formatted_education,
+                        "formatted_hire_type_detailed": formatted_hire_type_detailed if formatted_hire_type_detailed != basic_hire_type else None,
+                        "education_code_original": education_code,  # 원본 코드 보존
+                        "hire_type_code_original": hire_type_code,   # 원본 코드 보존
                         
-                    # 추가 필드들
-                    "acbg_cond": job.get("acbgCondLst", ""),
-                    "career_cond": job.get("creerCondLst", ""),
-                    "major_field": job.get("mjrfldNmLst", ""),
-                    "recruit_count": job.get("rcritNmprCo", ""),
-                    "work_type": job.get("workTypeNmLst", ""),
-                    "salary_type": job.get("salaryTypeNmLst", ""),
-                    "contact_info": job.get("cntctNo", ""),
-                    "recruit_start_date": job.get("pbancBgngYmd", ""),
-                    "application_method": job.get("aplyMthdNmLst", "")
-                }
+                        # 추가 필드들
+                        "acbg_cond": job.get("acbgCondLst", ""),
+                        "career_cond": job.get("creerCondLst", ""),
+                        "major_field": job.get("mjrfldNmLst", ""),
+                        "recruit_count": job.get("rcritNmprCo", ""),
+                        "work_type": job.get("workTypeNmLst", ""),
+                        "salary_type": job.get("salaryTypeNmLst", ""),
+                        "contact_info": job.get("cntctNo", ""),
+                        "recruit_start_date": job.get("pbancBgngYmd", ""),
+                        "application_method": job.get("aplyMthdNmLst", "")
+                    }
                 
-                formatted_jobs.append(formatted_job)
+                    formatted_jobs.append(formatted_job)
             
             # 통계 계산 (final_chatbot.py의 _calculate_job_stats와 동일)
             statistics = self._calculate_job_stats_detailed(jobs)
@@ -279,7 +426,11 @@ class WebAPIHandler:
                     "name": region_name
                 },
                 # final_chatbot.py 스타일 메시지 추가
-                "summary_message": f"📋 **{region_name} 지역의 채용정보를 찾을 수 없습니다.**" if not jobs else f"📋 **채용정보** (총 {len(jobs)}건, 지역 관련성 순)"
+                "summary_message": f"📋 **{region_name} 지역의 채용정보를 찾을 수 없습니다.**" if not jobs else f"📋 **채용정보** (총 {len(jobs)}건, 지역 관련성 순)",
+                "search_metadata": {
+                    "timestamp": datetime.now().isoformat(),
+                    **freshness
+                }
             }
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -338,21 +489,19 @@ class WebAPIHandler:
             "by_deadline": dict(sorted(deadlines.items()))
         }
     
+    @tracing.traced("handler.search_realestate_only")
     async def search_realestate_only(self, region_code: str, deal_ymd: str = "202506") -> Dict[str, Any]:
         """부동산 페이지용 - 실거래가 전문"""
         try:
-            # 아파트 실거래가 수집
-            apt_result = self.orchestrator.call_realestate_tool(
-                'getApartmentTrades',
-                {
-                    'lawdcd': region_code,
-                    'deal_ymd': deal_ymd,
-                    'pageNo': 1,
-                    'numOfRows': 30
-                }
+            # 아파트 실거래가 수집 (추세 계산을 위해 전월도 함께 동시 조회)
+            trade_range = await self.orchestrator.fetch_apartment_trade_range_async(
+                region_code, to_ymd=deal_ymd, months=2, num_rows=30
             )
+            if trade_range["status"] != "success":
+                return {"success": False, "error": trade_range["message"]}
             
             properties = []
+            apt_result = trade_range["results"][deal_ymd]
             if apt_result["status"] == "success":
                 apt_text = apt_result["result"].get("text", "")
                 properties = self.chatbot.parse_apartment_xml(apt_text)
@@ -360,7 +509,7 @@ class WebAPIHandler:
             return {
                 "success": True,
                 "properties": properties,
-                "price_analysis": self._analyze_price_trends(properties),
+                "price_analysis": self._analyze_price_trends(trade_range, deal_ymd),
                 "deal_period": deal_ymd,
                 "region_info": {
                     "code": region_code,
@@ -369,12 +518,35 @@ class WebAPIHandler:
             }
         except Exception as e:
             return {"success": False, "error": str(e)}
+
+    @tracing.traced("handler.fetch_apartment_trades")
+    async def _fetch_apartment_trades(self, region_code: str, deal_ymd: str, num_rows: int):
+        """
+        아파트 실거래 한 페이지 조회. (거래 목록, 그 목록의 컬럼, 도구 결과) 반환.
+        한 페이지는 그 달 거래의 일부일 수 있으므로 (지역, 월) 컬럼 저장소에는 넣지 않음
+        """
+        apt_result = await self.orchestrator.call_realestate_tool_async(
+            'getApartmentTrades',
+            {
+                'lawdcd': region_code,
+                'deal_ymd': deal_ymd,
+                'pageNo': 1,
+                'numOfRows': num_rows
+            }
+        )
+        properties = []
+        if apt_result["status"] == "success":
+            apt_text = apt_result["result"].get("text", "")
+            properties = self.chatbot.parse_apartment_xml(apt_text)
+        columns = TradeColumns.from_records(map(to_record, properties)) if properties else None
+        return properties, columns, apt_result
     
+    @tracing.traced("handler.search_policies_only")
     async def search_policies_only(self, region_code: str, keywords: str = None) -> Dict[str, Any]:
         """정책 페이지용 - final_chatbot.py와 동일한 로직 사용"""
         try:
             # 🎯 final_chatbot.py와 정확히 같은 방식으로 정책 검색
-            policy_result = self.orchestrator.call_youth_policy_tool(
+            policy_result = await self.orchestrator.call_youth_policy_tool_async(
                 'searchPoliciesByRegion',
                 {
                     'regionCode': region_code,
@@ -384,6 +556,7 @@ class WebAPIHandler:
             )
             
             policies = []
+            freshness = self._freshness(policy_result)
             if policy_result["status"] == "success":
                 all_policies = policy_result["result"].get("policies", [])
                 
@@ -424,20 +597,8 @@ class WebAPIHandler:
                 elif business_end and business_end.strip() and business_end != "00000000":
                     business_period = f"~ {format_date(business_end)}"
 
-                # 적용 범위 계산 (final_chatbot.py와 동일)
-                zip_codes = policy.get('zipCd', '')
-                if zip_codes:
-                    region_count = len(zip_codes.split(',')) if ',' in zip_codes else 1
-                    if region_count >= 50:
-                        scope_display = f"전국 ({region_count}개 지역)"
-                    elif region_count > 10:
-                        scope_display = f"광역 ({region_count}개 지역)"
-                    elif region_count > 1:
-                        scope_display = f"다지역 ({region_count}개 지역)"
-                    else:
-                        scope_display = "지역특화"
-                else:
-                    scope_display = "범위미상"
+                # 적용 범위 (final_chatbot.py와 동일, 정책 색인에서 미리 계산된 값)
+                scope_display = self.chatbot.policy_index.scope_display(policy)
 
                 # 신청 기간 포맷팅
                 apply_period = policy.get("aplyYmd", "")
@@ -479,6 +640,10 @@ class WebAPIHandler:
                 "region_info": {
                     "code": region_code,
                     "name": self.chatbot.get_region_name(region_code)
+                },
+                "search_metadata": {
+                    "timestamp": datetime.now().isoformat(),
+                    **freshness
                 }
             }
         except Exception as e:
@@ -486,43 +651,128 @@ class WebAPIHandler:
 
     # 나머지 헬퍼 메서드들은 기존과 동일하므로 생략...
     
-    async def _get_raw_data(self, intent: Dict[str, Any]) -> Dict[str, Any]:
-        """원시 데이터 수집"""
+    async def _get_raw_data(self, intent: Dict[str, Any], latency_budget: Optional[float] = None) -> Dict[str, Any]:
+        """
+        원시 데이터 수집 (채용/부동산/정책을 동시에 조회).
+        한 영역이 실패해도 나머지 영역 결과는 그대로 반환하고, 실패 사유는 errors에 담음.
+        latency_budget(초)이 지나도 끝나지 않은 영역은 빈 결과(status: pending)로 두고
+        백그라운드에서 계속 진행해 캐시를 채웁니다.
+        """
+        tasks, started = self._start_sections(intent)
+        try:
+            _, pending = await asyncio.wait(tasks.values(), timeout=latency_budget)
+        except asyncio.CancelledError:  # 클라이언트가 먼저 끊어도 조회는 마저 진행
+            for task in tasks.values():
+                self._keep_warming(task)
+            raise
+        for task in pending:
+            self._keep_warming(task)
+        return self._assemble_raw_data(intent, tasks, pending, started)
+
+    def _start_sections(self, intent: Dict[str, Any]) -> Tuple[Dict[str, "asyncio.Future"], float]:
+        """
+        영역별 조회 작업 시작. 각 작업의 결과: (항목 목록, 신선도/오류 정보, 시작부터 걸린 시간(초)).
+        작업 안에서 예외는 잡아서 freshness "unavailable"로 바꿈
+        """
         region_code = intent.get("region_mentioned", "44790")
-        results = {"jobs": [], "realestate": [], "policies": []}
         
         # 채용정보
-        if intent["search_jobs"]:
-            job_result = self.orchestrator.call_recruitment_tool(
-                'listRecruitments',
-                {'pageNo': 1, 'numOfRows': 20, 'filters': intent.get("filters", {})}
-            )
-            if job_result["status"] == "success":
-                jobs = job_result["result"].get("data", {}).get("result", [])
-                results["jobs"] = self.chatbot.filter_and_sort_jobs_by_region(jobs, region_code)
+        async def fetch_jobs() -> Tuple[List[Dict], Dict[str, Any]]:
+            if not intent["search_jobs"]:
+                return [], {"status": "skipped"}
+            jobs, job_freshness = await self._fetch_raw_jobs(intent.get("filters", {}), num_rows=20)
+            return self._rank_jobs(jobs, region_code, job_freshness), job_freshness
         
         # 부동산
-        if intent["search_realestate"]:
-            apt_result = self.orchestrator.call_realestate_tool(
-                'getApartmentTrades',
-                {'lawdcd': region_code, 'deal_ymd': "202506", 'pageNo': 1, 'numOfRows': 15}
-            )
-            if apt_result["status"] == "success":
-                apt_text = apt_result["result"].get("text", "")
-                results["realestate"] = self.chatbot.parse_apartment_xml(apt_text)
+        async def fetch_realestate() -> Tuple[List[Dict], Dict[str, Any]]:
+            if not intent["search_realestate"]:
+                return [], {"status": "skipped"}
+            properties, columns, apt_result = await self._fetch_apartment_trades(region_code, "202506", num_rows=15)
+            return properties, {**self._freshness(apt_result), "columns": columns}
         
         # 정책
-        if intent["search_policies"]:
-            policy_result = self.orchestrator.call_youth_policy_tool(
+        async def fetch_policies() -> Tuple[List[Dict], Dict[str, Any]]:
+            if not intent["search_policies"]:
+                return [], {"status": "skipped"}
+            policy_result = await self.orchestrator.call_youth_policy_tool_async(
                 'searchPoliciesByRegion',
                 {'regionCode': region_code, 'pageNum': 1, 'pageSize': 20}
             )
-            if policy_result["status"] == "success":
-                policies = policy_result["result"].get("policies", [])
-                active_policies = self.chatbot.filter_active_policies(policies)
-                results["policies"] = self.chatbot.filter_and_sort_policies_by_region(active_policies, region_code)
-        
-        return results
+            policy_freshness = self._freshness(policy_result)
+            if policy_freshness.get("error") or policy_result["status"] != "success":
+                return [], policy_freshness
+            policies = policy_result["result"].get("policies", [])
+            active_policies = self.chatbot.filter_active_policies(policies)
+            return self.chatbot.filter_and_sort_policies_by_region(active_policies, region_code), policy_freshness
+        
+        started = time.monotonic()
+
+        async def settle(fetch) -> Tuple[List[Dict], Dict[str, Any], float]:
+            try:
+                items, info = await fetch()
+            except Exception as e:
+                items, info = [], {"freshness": "unavailable", "error": str(e)}
+            return items, info, time.monotonic() - started
+
+        tasks = {
+            "jobs": asyncio.ensure_future(settle(fetch_jobs)),
+            "realestate": asyncio.ensure_future(settle(fetch_realestate)),
+            "policies": asyncio.ensure_future(settle(fetch_policies)),
+        }
+        return tasks, started
+
+    def _section_metadata(self, items: List[Dict], info: Dict[str, Any], elapsed: float) -> Dict[str, Any]:
+        """search_metadata.sections 항목 (끝난 영역)"""
+        metadata = {
+            "status": "error" if info.get("error") else "ok",
+            "elapsed_ms": round(elapsed * 1000),
+            "count": len(items),
+            "freshness": info["freshness"],
+        }
+        if info.get("error"):
+            metadata["error"] = info["error"]
+        elif info.get("degraded"):
+            metadata["degraded"] = info["degraded"]
+        return metadata
+
+    def _assemble_raw_data(
+        self, intent: Dict[str, Any], tasks: Dict[str, "asyncio.Future"], pending, started: float
+    ) -> Dict[str, Any]:
+        """끝난 작업 결과를 모으고, pending 작업은 빈 결과와 status "pending"으로 표시"""
+        data: Dict[str, List[Dict]] = {"jobs": [], "realestate": [], "policies": []}
+        realestate_columns: Optional[TradeColumns] = None
+        freshness: Dict[str, str] = {}
+        errors: Dict[str, str] = {}
+        sections: Dict[str, Dict[str, Any]] = {}
+        for section, task in tasks.items():
+            if task in pending:
+                freshness[section] = "pending"
+                sections[section] = {"status": "pending", "elapsed_ms": round((time.monotonic() - started) * 1000)}
+                continue
+            items, info, elapsed = task.result()
+            if info.get("status") == "skipped":
+                sections[section] = {"status": "skipped"}
+                continue
+            data[section] = items
+            if section == "realestate":
+                realestate_columns = info.get("columns")  # 응답에 담긴 거래와 같은 행
+            freshness[section] = info["freshness"]
+            sections[section] = self._section_metadata(items, info, elapsed)
+            if info.get("error"):
+                errors[section] = info["error"]
+
+        return {
+            **data,
+            "realestate_columns": realestate_columns,
+            "freshness": freshness,
+            "errors": errors,
+            "sections": sections
+        }
+
+    def _keep_warming(self, task: "asyncio.Future"):
+        """응답 기한을 넘긴 영역 조회는 버리지 않고 끝까지 진행 (결과는 업스트림 캐시/저장소에 남음)"""
+        self._warming.add(task)
+        task.add_done_callback(self._warming.discard)
     
     def _generate_summary(self, raw_data: Dict[str, Any], region_code: str) -> Dict[str, Any]:
         """요약 페이지용 통계 생성"""
@@ -531,24 +781,18 @@ class WebAPIHandler:
             "total_jobs": len(raw_data["jobs"]),
             "total_properties": len(raw_data["realestate"]),
             "total_policies": len(raw_data["policies"]),
-            "avg_property_price": self._calculate_avg_price(raw_data["realestate"]),
+            "avg_property_price": self._calculate_avg_price(raw_data.get("realestate_columns")),
             "top_job_categories": self._get_top_job_categories(raw_data["jobs"]),
             "urgent_policies": len([p for p in raw_data["policies"][:5] if self._is_urgent_policy(p)])
         }
     
-    def _calculate_avg_price(self, properties: List[Dict]) -> str:
+    def _calculate_avg_price(self, columns: Optional[TradeColumns]) -> str:
         """평균 매매가 계산"""
-        if not properties:
+        if columns is None:
             return "데이터 없음"
         
-        prices = []
-        for prop in properties:
-            price_str = prop.get("dealAmount", "").replace(",", "")
-            if price_str.isdigit():
-                prices.append(int(price_str))
-        
-        if prices:
-            avg = sum(prices) // len(prices)
+        if len(columns):
+            avg = int(columns.price.sum()) // len(columns)
             if avg >= 10000:
                 return f"{avg//10000}억 {(avg%10000):,}만원"
             else:
@@ -565,27 +809,23 @@ class WebAPIHandler:
         sorted_categories = sorted(categories.items(), key=lambda x: x[1], reverse=True)
         return [cat[0] for cat in sorted_categories[:3]]
     
-    def _analyze_price_trends(self, properties: List[Dict]) -> Dict[str, Any]:
-        """가격 트렌드 분석"""
-        if not properties:
+    def _analyze_price_trends(self, trade_range: Dict[str, Any], deal_ymd: str) -> Dict[str, Any]:
+        """가격 트렌드 분석 (기간 조회로 합쳐진 월별 시계열 사용)"""
+        current = next((m for m in trade_range["series"] if m["deal_ymd"] == deal_ymd), None)
+        if current is None:
             return {"trend": "데이터 부족", "price_range": "확인 불가"}
         
-        prices = []
-        for prop in properties:
-            price_str = prop.get("dealAmount", "").replace(",", "")
-            if price_str.isdigit():
-                prices.append(int(price_str))
-        
-        if prices:
-            min_price = min(prices)
-            max_price = max(prices)
-            return {
-                "trend": "안정세",
-                "price_range": f"{min_price:,}만원 ~ {max_price:,}만원",
-                "sample_count": len(prices)
-            }
-        
-        return {"trend": "데이터 부족", "price_range": "확인 불가"}
+        return {
+            "trend": trade_range["trend"],
+            "change_pct": trade_range["change_pct"],
+            "price_range": f"{int(current['min_price']):,}만원 ~ {int(current['max_price']):,}만원",
+            "sample_count": current["sample_count"],
+            "median_price": current["median_price"],
+            "p25_price": current["p25_price"],
+            "p75_price": current["p75_price"],
+            "median_price_per_m2": current["median_price_per_m2"],
+            "monthly": trade_range["series"]
+        }
     
     def _group_policies_by_category(self, policies: List[Dict]) -> Dict[str, int]:
         """정책 카테고리별 그룹핑"""
@@ -598,4 +838,6 @@ class WebAPIHandler:
     def _is_urgent_policy(self, policy: Dict) -> bool:
         """긴급 정책 여부 판단 (마감 임박)"""
         apply_period = policy.get("aplyYmd", "")
-        return "마감" in apply_period or "긴급" in policy.get("plcyNm", "")
\ No newline at end of file
+        if "마감" in apply_period or "긴급" in policy.get("plcyNm", ""):
+            return True
+        return self.chatbot.policy_index.closes_within(policy, CLOSING_SOON_DAYS)
\ No newline at end of file
@@ -1,12 +1,19 @@
 # youth_policy_server.py — 청소년정책 MCP 서버
+import json
 import os
-import ssl
-from typing import Any, Dict, Optional, Tuple, Iterable
+from typing import Any, AsyncIterator, Dict, Optional
 
-import httpx
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
+try:
+    from . import tracing, upstream
+    from .pagination import PAGE_CONCURRENCY, iter_pages
+except ImportError:  # 스크립트로 직접 실행한 경우 (python src/youth_policy_server.py)
+    import tracing
+    import upstream
+    from pagination import PAGE_CONCURRENCY, iter_pages
+
 load_dotenv()
 
 mcp = FastMCP("youth-policy-mcp")
@@ -15,41 +22,87 @@ mcp = FastMCP("youth-policy-mcp")
 BASE_URL = (os.getenv("YOUTH_BASE_URL") or "https://www.youthcenter.go.kr/go/ythip/getPlcy").rstrip("/")
 API_KEY = (os.getenv("YOUTH_API_KEY") or "55930c52-9e2e-42ba-9aec-f562fc10cd09").strip()
 
-def _client_candidates() -> Iterable[Tuple[str, httpx.Client]]:
-    """TLS/SSL 환경에 따라 순차적으로 시도할 httpx.Client 후보들."""
-    # 1) 기본값
-    yield "default", httpx.Client(http2=False, timeout=20, trust_env=True)
+def _build_params(
+    page_num: int,
+    page_size: int,
+    page_type: str,
+    return_type: str,
+    filters: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
+    params: Dict[str, Any] = {
+        "apiKeyNm": API_KEY,
+        "pageNum": page_num,
+        "pageSize": page_size,
+        "pageType": page_type,
+        "rtnType": return_type,
+    }
+    
+    if filters:
+        params.update(filters)
+    return params
+
 
-    # 2) TLS 1.2 이상 + 낮은 보안 레벨
+@tracing.traced("youth_policy.decode")
+def _build_result(payload: Dict[str, Any]) -> Dict[str, Any]:
+    mode = payload["ssl_mode"]
+    req_url = payload["request_url"]
+    status_code = payload["status_code"]
+    
     try:
-        tls = ssl.create_default_context()
-        tls.minimum_version = ssl.TLSVersion.TLSv1_2
-        try:
-            tls.set_ciphers("DEFAULT:@SECLEVEL=1")
-        except Exception:
-            pass
-        yield "tls12_seclevel1", httpx.Client(verify=tls, http2=False, timeout=20, trust_env=True)
-    except Exception:
-        pass
+        json_data = json.loads(payload["text"])
+        
+        # 응답 데이터 정규화 (항상 policies와 total_count 추가)
+        result_section = json_data.get("result", {})
+        policies = result_section.get("youthPolicyList", [])
+        pagging_info = result_section.get("pagging", {})
+        total_count = pagging_info.get("totCount", 0)
+        
+        # API 응답 구조에 맞게 데이터 정규화
+        response = {
+            "status": "ok",
+            "ssl_mode": mode,
+            "request_url": req_url,
+            "status_code": status_code,
+            "cache": payload.get("cache"),
+            "cached_at": payload.get("cached_at"),
+            "degraded": payload.get("degraded"),
+            "data": json_data,
+            "policies": policies,
+            "total_count": total_count,
+            "page_info": pagging_info
+        }
+        
+        # API 오류 체크
+        if json_data.get("resultCode") != 200:
+            response["api_error"] = json_data.get('resultMessage', 'Unknown API error')
+        
+        return response
+        
+    except Exception as parse_error:
+        return {
+            "status": "error",
+            "ssl_mode": mode,
+            "request_url": req_url,
+            "status_code": status_code,
+            "text": payload["text"],
+            "parse_error": str(parse_error)
+        }
+
 
-    # 3) 최후 수단: 인증서 검증 비활성화
-    yield "insecure", httpx.Client(verify=False, http2=False, timeout=20, trust_env=True)
+def _is_ok_response(text: str) -> bool:
+    """정상 응답(resultCode 200)만 캐시에 저장"""
+    try:
+        return json.loads(text).get("resultCode") == 200
+    except Exception:
+        return False
 
 
-def _try_get(url: str, params: Dict[str, Any]):
-    """위의 후보 클라이언트들을 순서대로 시도. 성공하면 (mode, response) 반환."""
-    last_err: Optional[Exception] = None
-    for mode, client in _client_candidates():
-        try:
-            with client as c:
-                resp = c.get(url, params=params)
-                return mode, resp
-        except Exception as e:
-            last_err = e
-            continue
-    if last_err:
-        raise last_err
-    raise RuntimeError("No HTTP client candidates available")
+def _missing_key_error() -> Dict[str, Any]:
+    return {
+        "status": "error",
+        "message": "YOUTH_API_KEY is missing in .env",
+        "request_url": BASE_URL,
+    }
 
 
 def call_youth_api(
@@ -58,68 +111,46 @@ def call_youth_api(
     page_type: str = "1",  # 1:목록, 2:상세
     return_type: str = "json",
     filters: Optional[Dict[str, Any]] = None,
+    stale_while_revalidate: bool = False,
 ):
     """청소년정책 API 호출"""
     if not API_KEY:
+        return _missing_key_error()
+
+    params = _build_params(page_num, page_size, page_type, return_type, filters)
+    try:
+        payload = upstream.fetch(
+            BASE_URL, params, source="youth_policy", cacheable=_is_ok_response,
+            stale_while_revalidate=stale_while_revalidate
+        )
+        return _build_result(payload)
+    except Exception as e:
         return {
             "status": "error",
-            "message": "YOUTH_API_KEY is missing in .env",
+            "message": str(e),
             "request_url": BASE_URL,
         }
 
-    params: Dict[str, Any] = {
-        "apiKeyNm": API_KEY,
-        "pageNum": page_num,
-        "pageSize": page_size,
-        "pageType": page_type,
-        "rtnType": return_type,
-    }
-    
-    if filters:
-        params.update(filters)
 
+async def call_youth_api_async(
+    page_num: int = 1,
+    page_size: int = 10,
+    page_type: str = "1",
+    return_type: str = "json",
+    filters: Optional[Dict[str, Any]] = None,
+    stale_while_revalidate: bool = False,
+):
+    """call_youth_api의 비동기 버전 (httpx.AsyncClient 사용)"""
+    if not API_KEY:
+        return _missing_key_error()
+
+    params = _build_params(page_num, page_size, page_type, return_type, filters)
     try:
-        mode, resp = _try_get(BASE_URL, params)
-        req_url = str(resp.request.url)
-        status_code = resp.status_code
-        resp.raise_for_status()
-        
-        try:
-            json_data = resp.json()
-            
-            # 응답 데이터 정규화 (항상 policies와 total_count 추가)
-            result_section = json_data.get("result", {})
-            policies = result_section.get("youthPolicyList", [])
-            pagging_info = result_section.get("pagging", {})
-            total_count = pagging_info.get("totCount", 0)
-            
-            # API 응답 구조에 맞게 데이터 정규화
-            response = {
-                "status": "ok",
-                "ssl_mode": mode,
-                "request_url": req_url,
-                "status_code": status_code,
-                "data": json_data,
-                "policies": policies,
-                "total_count": total_count,
-                "page_info": pagging_info
-            }
-            
-            # API 오류 체크
-            if json_data.get("resultCode") != 200:
-                response["api_error"] = json_data.get('resultMessage', 'Unknown API error')
-            
-            return response
-            
-        except Exception as parse_error:
-            return {
-                "status": "error",
-                "ssl_mode": mode,
-                "request_url": req_url,
-                "status_code": status_code,
-                "text": resp.text,
-                "parse_error": str(parse_error)
-            }
+        payload = await upstream.afetch(
+            BASE_URL, params, source="youth_policy", cacheable=_is_ok_response,
+            stale_while_revalidate=stale_while_revalidate
+        )
+        return _build_result(payload)
     except Exception as e:
         return {
             "status": "error",
@@ -128,6 +159,101 @@ def call_youth_api(
         }
 
 
+def _extra_filters(filters: Dict[str, Any], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    # 추가 kwargs 필터
+    for key, value in kwargs.items():
+        if value is not None:
+            filters[key] = value
+    return filters
+
+
+# === 도구별 호출 인자 구성 (동기/비동기 도구가 공유) ===
+
+def _search_request(
+    pageNum: int = 1,
+    pageSize: int = 10,
+    policyKeyword: Optional[str] = None,
+    policyName: Optional[str] = None,
+    regionCode: Optional[str] = None,
+    largeCategoryName: Optional[str] = None,
+    middleCategoryName: Optional[str] = None,
+    policyExplanation: Optional[str] = None,
+    **kwargs
+) -> Dict[str, Any]:
+    filters = {}
+    
+    if policyKeyword:
+        filters["plcyKywdNm"] = policyKeyword
+    if policyName:
+        filters["plcyNm"] = policyName
+    if regionCode:
+        filters["zipCd"] = regionCode
+    if largeCategoryName:
+        filters["lclsfNm"] = largeCategoryName
+    if middleCategoryName:
+        filters["mclsfNm"] = middleCategoryName
+    if policyExplanation:
+        filters["plcyExplnCn"] = policyExplanation
+    
+    return {
+        "page_num": pageNum,
+        "page_size": pageSize,
+        "page_type": "1",  # 목록
+        "return_type": "json",
+        "filters": _extra_filters(filters, kwargs),
+    }
+
+
+def _detail_request(policyNumber: str, **kwargs) -> Dict[str, Any]:
+    filters = {"plcyNo": policyNumber}
+    return {
+        "page_num": 1,
+        "page_size": 1,
+        "page_type": "2",  # 상세
+        "return_type": "json",
+        "filters": _extra_filters(filters, kwargs),
+    }
+
+
+def _region_request(
+    regionCode: str,
+    pageNum: int = 1,
+    pageSize: int = 20,
+    categories: Optional[str] = None,
+    **kwargs
+) -> Dict[str, Any]:
+    filters = {"zipCd": regionCode}
+    
+    if categories:
+        filters["lclsfNm"] = categories
+    
+    return {
+        "page_num": pageNum,
+        "page_size": pageSize,
+        "filters": _extra_filters(filters, kwargs),
+        "stale_while_revalidate": True,  # 지역 목록은 만료 캐시를 먼저 내주고 갱신
+    }
+
+
+def _keywords_request(
+    keywords: str,
+    pageNum: int = 1,
+    pageSize: int = 20,
+    regionCode: Optional[str] = None,
+    **kwargs
+) -> Dict[str, Any]:
+    filters = {"plcyKywdNm": keywords}
+    
+    if regionCode:
+        filters["zipCd"] = regionCode
+    
+    return {
+        "page_num": pageNum,
+        "page_size": pageSize,
+        "filters": _extra_filters(filters, kwargs),
+    }
+
+
 @mcp.tool()
 def searchYouthPolicies(
     pageNum: int = 1,
@@ -150,33 +276,17 @@ def searchYouthPolicies(
     - middleCategoryName: 정책중분류명 (콤마로 구분)
     - policyExplanation: 정책설명
     """
-    filters = {}
-    
-    if policyKeyword:
-        filters["plcyKywdNm"] = policyKeyword
-    if policyName:
-        filters["plcyNm"] = policyName
-    if regionCode:
-        filters["zipCd"] = regionCode
-    if largeCategoryName:
-        filters["lclsfNm"] = largeCategoryName
-    if middleCategoryName:
-        filters["mclsfNm"] = middleCategoryName
-    if policyExplanation:
-        filters["plcyExplnCn"] = policyExplanation
-    
-    # 추가 kwargs 필터
-    for key, value in kwargs.items():
-        if value is not None:
-            filters[key] = value
-    
-    return call_youth_api(
-        page_num=pageNum,
-        page_size=pageSize,
-        page_type="1",  # 목록
-        return_type="json",
-        filters=filters
-    )
+    return call_youth_api(**_search_request(
+        pageNum=pageNum,
+        pageSize=pageSize,
+        policyKeyword=policyKeyword,
+        policyName=policyName,
+        regionCode=regionCode,
+        largeCategoryName=largeCategoryName,
+        middleCategoryName=middleCategoryName,
+        policyExplanation=policyExplanation,
+        **kwargs
+    ))
 
 
 @mcp.tool()
@@ -188,20 +298,7 @@ def getYouthPolicyDetail(
     청소년정책 상세 조회
     - policyNumber: 정책번호 (필수)
     """
-    filters = {"plcyNo": policyNumber}
-    
-    # 추가 kwargs 필터
-    for key, value in kwargs.items():
-        if value is not None:
-            filters[key] = value
-    
-    return call_youth_api(
-        page_num=1,
-        page_size=1,
-        page_type="2",  # 상세
-        return_type="json",
-        filters=filters
-    )
+    return call_youth_api(**_detail_request(policyNumber, **kwargs))
 
 
 @mcp.tool()
@@ -217,21 +314,7 @@ def searchPoliciesByRegion(
     - regionCode: 법정시군구코드 5자리 (예: 11110 - 종로구)
     - categories: 관심 분야 (예: "일자리,주거,교육")
     """
-    filters = {"zipCd": regionCode}
-    
-    if categories:
-        filters["lclsfNm"] = categories
-    
-    # 추가 kwargs 필터
-    for key, value in kwargs.items():
-        if value is not None:
-            filters[key] = value
-    
-    return call_youth_api(
-        page_num=pageNum,
-        page_size=pageSize,
-        filters=filters
-    )
+    return call_youth_api(**_region_request(regionCode, pageNum, pageSize, categories, **kwargs))
 
 
 @mcp.tool()
@@ -247,21 +330,67 @@ def searchPoliciesByKeywords(
     - keywords: 검색 키워드들 (콤마로 구분, 예: "취업,창업,주거지원")
     - regionCode: 선택적 지역 필터
     """
-    filters = {"plcyKywdNm": keywords}
-    
-    if regionCode:
-        filters["zipCd"] = regionCode
-    
-    # 추가 kwargs 필터
-    for key, value in kwargs.items():
-        if value is not None:
-            filters[key] = value
-    
-    return call_youth_api(
-        page_num=pageNum,
-        page_size=pageSize,
-        filters=filters
-    )
+    return call_youth_api(**_keywords_request(keywords, pageNum, pageSize, regionCode, **kwargs))
+
+
+# === 비동기 도구 (FastAPI 경로에서 사용) ===
+
+async def search_youth_policies_async(**arguments):
+    """searchYouthPolicies의 비동기 버전"""
+    return await call_youth_api_async(**_search_request(**arguments))
+
+
+async def get_youth_policy_detail_async(**arguments):
+    """getYouthPolicyDetail의 비동기 버전"""
+    return await call_youth_api_async(**_detail_request(**arguments))
+
+
+async def search_policies_by_region_async(**arguments):
+    """searchPoliciesByRegion의 비동기 버전"""
+    return await call_youth_api_async(**_region_request(**arguments))
+
+
+async def search_policies_by_keywords_async(**arguments):
+    """searchPoliciesByKeywords의 비동기 버전"""
+    return await call_youth_api_async(**_keywords_request(**arguments))
+
+
+def _page_policies(result: Dict[str, Any]):
+    """페이지 결과 → 정책 목록 (오류 응답이면 예외)"""
+    if result.get("status") != "ok":
+        raise RuntimeError(result.get("message") or result.get("parse_error") or "청년정책 조회 실패")
+    if "api_error" in result:
+        raise RuntimeError(result["api_error"])
+    return result.get("policies") or []
+
+
+async def iter_youth_policies(
+    filters: Optional[Dict[str, Any]] = None,
+    page_size: int = 100,
+    concurrency: int = PAGE_CONCURRENCY,
+    max_pages: Optional[int] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    조건(zipCd, plcyKywdNm 등 API 파라미터)에 맞는 정책 전체를 하나씩 반환.
+    1페이지의 totCount로 나머지 페이지를 동시에 요청하고 도착 순서로 내보냅니다.
+    """
+    async def fetch_page(page_num: int) -> Dict[str, Any]:
+        return await call_youth_api_async(page_num=page_num, page_size=page_size, filters=filters)
+
+    async for policy in iter_pages(
+        fetch_page, _page_policies, lambda first: int(first.get("total_count") or 0),
+        page_size, concurrency, max_pages
+    ):
+        yield policy
+
+
+# 오케스트레이터가 사용하는 비동기 도구 목록 (도구명 → 코루틴 함수)
+ASYNC_TOOLS = {
+    "searchYouthPolicies": search_youth_policies_async,
+    "getYouthPolicyDetail": get_youth_policy_detail_async,
+    "searchPoliciesByRegion": search_policies_by_region_async,
+    "searchPoliciesByKeywords": search_policies_by_keywords_async,
+}
 
 
 @mcp.tool()